@@ -7,13 +7,27 @@ class PageSectionInline(admin.TabularInline):
     model = models.PageSection
     extra = 1
 
+    def get_queryset(self, request):  # noqa: ANN001, ANN201
+        # Each row's label is ``PageSection.__str__``, which reads ``page.slug``.
+        return super().get_queryset(request).select_related("page")
+
 
 @admin.register(models.Page)
 class PageAdmin(admin.ModelAdmin):
-    list_display = ("slug", "updated_at")
+    list_display = ("slug", "version", "updated_at")
+    readonly_fields = ("version",)
     inlines = [PageSectionInline]
 
 
+@admin.register(models.PageRevision)
+class PageRevisionAdmin(admin.ModelAdmin):
+    list_display = ("page", "version", "restored_version", "author", "created_at")
+    # The automatic select_related skips nullable keys such as ``author``.
+    list_select_related = ("page", "author")
+    list_filter = ("page",)
+    readonly_fields = ("page", "version", "changes", "restored_version", "author", "created_at")
+
+
 @admin.register(models.Hero)
 class HeroAdmin(admin.ModelAdmin):
     list_display = ("title", "updated_at")
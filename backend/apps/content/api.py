@@ -1,10 +1,25 @@
+from typing import Tuple
+
 from django.conf import settings
-from django.http import Http404
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
 from rest_framework import mixins, viewsets
 from rest_framework.response import Response
 
+from . import cache
+from .cache import cached_response
+from .conditional import ConditionalGetMixin, conditional_get
+from .fastpath import FastReadMixin
 from .models import BlogPost, Ebook, Page, Service
-from .serializers import BlogPostSerializer, EbookSerializer, PageSerializer, ServiceSerializer
+from .pagination import KeysetPagination, MockKeysetPagination
+from .serializers import (
+    BlogPostListSerializer,
+    BlogPostSerializer,
+    EbookSerializer,
+    PageSerializer,
+    ServiceSerializer,
+)
+from .snapshots import get_page_payload
 
 if settings.ENABLE_MOCKS:
     from .mocks import (
@@ -12,37 +27,55 @@ if settings.ENABLE_MOCKS:
         get_mock_blog_posts,
         get_mock_ebook,
         get_mock_ebooks,
-        get_mock_page,
         get_mock_service,
         get_mock_services,
     )
 
 
-class PageViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class PageViewSet(ConditionalGetMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = Page.objects.select_related("hero").prefetch_related("sections")
     serializer_class = PageSerializer
     lookup_field = "slug"
 
+    def get_validator_parts(self, lookup):  # noqa: ANN001
+        # The page, its hero and its sections all feed the payload; one grouped
+        # query covers them without loading or serializing anything.
+        row = (
+            Page.objects.filter(slug=lookup)
+            .annotate(section_count=Count("sections"), sections_updated=Max("sections__updated_at"))
+            .values_list("updated_at", "hero_id", "hero__updated_at", "section_count", "sections_updated")
+            .first()
+        )
+        if row is None:
+            return None
+        return row, max(value for value in (row[0], row[2], row[4]) if value is not None)
+
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
-        if settings.ENABLE_MOCKS:
-            slug = kwargs.get(self.lookup_field)
-            page = get_mock_page(slug) if slug else None
-            if not page:
-                raise Http404
-            return Response(page)
-        return super().retrieve(request, *args, **kwargs)
+        # Served from the precomputed snapshot (or the mocks), bypassing the serializer.
+        payload = get_page_payload(kwargs[self.lookup_field])
+        if payload is None:
+            raise Http404
+        return HttpResponse(payload, content_type="application/json")
 
 
-class ServiceViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class ServiceViewSet(FastReadMixin, ConditionalGetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     lookup_field = "slug"
+    cache_namespace = cache.SERVICE
 
+    @conditional_get
+    @cached_response
     def list(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
             return Response(get_mock_services())
+        if settings.CONTENT_FAST_READS:
+            return self.fast_list(request)
         return super().list(request, *args, **kwargs)
 
+    @conditional_get
+    @cached_response
     def retrieve(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
             slug = kwargs.get(self.lookup_field)
@@ -53,16 +86,23 @@ class ServiceViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.
         return super().retrieve(request, *args, **kwargs)
 
 
-class EbookViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class EbookViewSet(FastReadMixin, ConditionalGetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = Ebook.objects.all()
     serializer_class = EbookSerializer
     lookup_field = "slug"
+    cache_namespace = cache.EBOOK
 
+    @conditional_get
+    @cached_response
     def list(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
             return Response(get_mock_ebooks())
+        if settings.CONTENT_FAST_READS:
+            return self.fast_list(request)
         return super().list(request, *args, **kwargs)
 
+    @conditional_get
+    @cached_response
     def retrieve(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
             slug = kwargs.get(self.lookup_field)
@@ -73,16 +113,57 @@ class EbookViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.Ge
         return super().retrieve(request, *args, **kwargs)
 
 
-class BlogPostViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class BlogPostViewSet(FastReadMixin, ConditionalGetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = BlogPost.objects.filter(is_published=True)
     serializer_class = BlogPostSerializer
+    pagination_class = KeysetPagination
     lookup_field = "slug"
-
+    cache_namespace = cache.BLOG_POST
+    fast_extra_columns = ("id", "published_at")
+
+    def get_list_fields(self) -> Tuple[str, ...]:
+        raw = self.request.query_params.get("fields")
+        if raw:
+            requested = tuple(name for name in raw.split(",") if name in BlogPostSerializer.Meta.fields)
+            if requested:
+                return requested
+        return BlogPostListSerializer.default_fields
+
+    def get_fast_fields(self) -> Tuple[str, ...]:
+        return self.get_list_fields()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # Skip unrequested columns; ``content`` dominates row size.
+            queryset = queryset.only("id", "published_at", *self.get_list_fields())
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return BlogPostListSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "list":
+            context["fields"] = self.get_list_fields()
+        return context
+
+    @conditional_get
+    @cached_response
     def list(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
-            return Response(get_mock_blog_posts())
+            paginator = MockKeysetPagination()
+            fields = self.get_list_fields()
+            posts = paginator.paginate_items(get_mock_blog_posts(), request)
+            return paginator.get_paginated_response([{name: post[name] for name in fields} for post in posts])
+        if settings.CONTENT_FAST_READS:
+            return self.fast_list(request)
         return super().list(request, *args, **kwargs)
 
+    @conditional_get
+    @cached_response
     def retrieve(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         if settings.ENABLE_MOCKS:
             slug = kwargs.get(self.lookup_field)
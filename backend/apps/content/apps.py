@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     name = "apps.content"
     verbose_name = "Marketing Content"
+
+    def ready(self) -> None:
+        from . import signals
+
+        signals.connect()
@@ -0,0 +1,79 @@
+"""ETag / Last-Modified support for the content API.
+
+Validators are computed from ``updated_at`` columns with a single aggregate
+query, so a matching ``If-None-Match`` or ``If-Modified-Since`` is answered with
+a 304 before anything is serialized.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+Validators = Tuple[str, Optional[datetime]]
+
+
+class ConditionalGetMixin:
+    """Derives validators from ``get_queryset()``; override ``get_validator_parts`` for nested resources."""
+
+    def get_validator_parts(self, lookup: Optional[str]) -> Optional[Tuple[Any, Optional[datetime]]]:
+        queryset = self.get_queryset()
+        if lookup is None:
+            summary = queryset.order_by().aggregate(count=Count("id"), latest=Max("updated_at"))
+            return (summary["count"], summary["latest"]), summary["latest"]
+        row = queryset.filter(**{self.lookup_field: lookup}).values_list("id", "updated_at").first()
+        if row is None:
+            return None
+        return row, row[1]
+
+    def get_validators(self, request, lookup: Optional[str]) -> Optional[Validators]:  # noqa: ANN001
+        if settings.ENABLE_MOCKS:
+            return None
+        parts = self.get_validator_parts(lookup)
+        if parts is None:
+            return None
+        state, last_modified = parts
+        # Representation inputs beyond the rows themselves: the renderer, the host
+        # used for absolute file URLs and the query string (filters, pagination).
+        fingerprint = "|".join(
+            [
+                self.basename,
+                self.action,
+                str(lookup),
+                repr(state),
+                request.accepted_renderer.format,
+                request.get_host(),
+                request.META.get("QUERY_STRING", ""),
+            ]
+        )
+        return quote_etag(hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()), last_modified
+
+
+def conditional_get(view_method: Callable[..., Response]) -> Callable[..., Response]:
+    """Answer conditional requests with 304 and stamp validators on full responses."""
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003
+        validators = self.get_validators(request, kwargs.get(self.lookup_field))
+        if validators is None:
+            return view_method(self, request, *args, **kwargs)
+        etag, last_modified = validators
+        # ``cached_response`` keys on it, so a cached body always matches its ETag.
+        self.content_etag = etag
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        response = not_modified or view_method(self, request, *args, **kwargs)
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    return wrapper
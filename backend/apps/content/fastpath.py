@@ -0,0 +1,119 @@
+"""Opt-in fast read path for content list endpoints.
+
+With ``CONTENT_FAST_READS`` enabled, list queries project only the serializer's
+columns with ``.values()``, rows are turned into output dicts through a field
+map compiled once per serializer, and responses are encoded with orjson. The
+bytes are identical to the ``ModelSerializer`` + ``JSONRenderer`` path.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from apps.core.metrics import span
+
+Converter = Callable[[Any, Any], Any]
+
+
+def _datetime(value, request):  # noqa: ANN001, ANN202
+    # Mirrors ``serializers.DateTimeField`` with the default ISO 8601 format.
+    if not value:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+def _file(storage) -> Converter:  # noqa: ANN001
+    # Mirrors ``serializers.FileField`` with ``UPLOADED_FILES_USE_URL``.
+    def convert(value, request):  # noqa: ANN001, ANN202
+        if not value:
+            return None
+        url = storage.url(value)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return convert
+
+
+class FieldMap:
+    """Precompiled ``values()`` row -> output dict conversion for one serializer."""
+
+    def __init__(self, model: type, fields: Sequence[str], extra_columns: Sequence[str] = ()) -> None:
+        self.fields: List[Tuple[str, Optional[Converter]]] = []
+        for name in fields:
+            field = model._meta.get_field(name)
+            converter: Optional[Converter] = None
+            if isinstance(field, models.DateTimeField):
+                converter = _datetime
+            elif isinstance(field, models.FileField):
+                converter = _file(field.storage)
+            self.fields.append((name, converter))
+        self.columns = tuple(dict.fromkeys([*fields, *extra_columns]))
+
+    def convert(self, row: Dict[str, Any], request) -> Dict[str, Any]:  # noqa: ANN001
+        return {
+            name: converter(row[name], request) if converter else row[name]
+            for name, converter in self.fields
+        }
+
+    def convert_all(self, rows: Iterable[Dict[str, Any]], request) -> List[Dict[str, Any]]:  # noqa: ANN001
+        convert = self.convert
+        with span("serialize"):
+            return [convert(row, request) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def field_map_for(model: type, fields: Tuple[str, ...], extra_columns: Tuple[str, ...] = ()) -> FieldMap:
+    return FieldMap(model, fields, extra_columns)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson-backed drop-in for DRF's compact, UTF-8 ``JSONRenderer`` output."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):  # noqa: ANN001
+        if data is None:
+            return b""
+        with span("serialize"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):  # noqa: ANN001, ANN202
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            # Types only DRF's encoder knows (lazy strings, Decimals, ...).
+            return super().render(data, accepted_media_type, renderer_context)
+        # DRF always escapes U+2028/U+2029 so the output stays a JavaScript subset.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastReadMixin:
+    """Adds ``fast_list`` and the orjson renderer to content viewsets when ``CONTENT_FAST_READS`` is on."""
+
+    # Columns the paginator needs besides the serialized fields.
+    fast_extra_columns: Tuple[str, ...] = ()
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if settings.CONTENT_FAST_READS:
+            renderers = [FastJSONRenderer()] + [r for r in renderers if not isinstance(r, JSONRenderer)]
+        return renderers
+
+    def get_fast_fields(self) -> Tuple[str, ...]:
+        return tuple(self.get_serializer_class().Meta.fields)
+
+    def fast_list(self, request) -> Response:  # noqa: ANN001
+        queryset = self.filter_queryset(self.get_queryset())
+        field_map = field_map_for(queryset.model, self.get_fast_fields(), self.fast_extra_columns)
+        rows = queryset.values(*field_map.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(field_map.convert_all(page, request))
+        return Response(field_map.convert_all(rows, request))
@@ -0,0 +1,107 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.content.fastpath import FastJSONRenderer, field_map_for
+from apps.content.models import BlogPost, Ebook, Service
+from apps.content.serializers import BlogPostListSerializer, EbookSerializer, ServiceSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ModelSerializer + JSONRenderer list path with the fast read path on a "
+        "seeded dataset (rolled back afterwards) and check both produce identical bytes."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--rows", type=int, default=2000, help="Rows seeded per model.")
+        parser.add_argument("--iterations", type=int, default=20, help="Timed runs per path.")
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        request = RequestFactory().get("/api/", HTTP_HOST="api.example.com")
+        mismatches = []
+        try:
+            with transaction.atomic():
+                self._seed(options["rows"])
+                for label, queryset, serializer_class, fields, context in self._cases():
+                    slow = lambda: JSONRenderer().render(  # noqa: E731
+                        serializer_class(queryset.all(), many=True, context={"request": request, **context}).data
+                    )
+                    field_map = field_map_for(queryset.model, fields)
+                    fast = lambda: FastJSONRenderer().render(  # noqa: E731
+                        field_map.convert_all(queryset.values(*field_map.columns), request)
+                    )
+                    if slow() != fast():
+                        mismatches.append(label)
+                    slow_ms = self._time(slow, options["iterations"])
+                    fast_ms = self._time(fast, options["iterations"])
+                    self.stdout.write(
+                        f"{label:<12} serializer {slow_ms:8.2f} ms   fast path {fast_ms:8.2f} ms   "
+                        f"speed-up {slow_ms / fast_ms:5.1f}x"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+        if mismatches:
+            raise CommandError(f"Fast path output differs for: {', '.join(mismatches)}")
+
+    def _time(self, func, iterations: int) -> float:  # noqa: ANN001
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    def _cases(self):  # noqa: ANN202
+        blog_fields = BlogPostListSerializer.default_fields
+        return [
+            ("services", Service.objects.all(), ServiceSerializer, ServiceSerializer.Meta.fields, {}),
+            ("ebooks", Ebook.objects.all(), EbookSerializer, EbookSerializer.Meta.fields, {}),
+            (
+                "blog-posts",
+                BlogPost.objects.filter(is_published=True).only("id", *blog_fields),
+                BlogPostListSerializer,
+                blog_fields,
+                {"fields": blog_fields},
+            ),
+        ]
+
+    def _seed(self, rows: int) -> None:
+        now = timezone.now()
+        text = "Grow pipeline with RevOps — ünïcode included. " * 8
+        Service.objects.bulk_create(
+            (
+                Service(name=f"Service {i}", slug=f"bench-service-{i}", description=text, long_description=text * 4)
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        Ebook.objects.bulk_create(
+            (
+                Ebook(title=f"Ebook {i}", slug=f"bench-ebook-{i}", summary=text, file=f"ebooks/bench-{i}.pdf")
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        BlogPost.objects.bulk_create(
+            (
+                BlogPost(
+                    title=f"Post {i}",
+                    slug=f"bench-post-{i}",
+                    excerpt=text,
+                    content=text * 40,
+                    published_at=now - timedelta(minutes=i, microseconds=i),
+                    is_published=True,
+                )
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
@@ -0,0 +1,124 @@
+import json
+import resource
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.content import cache, revalidation, synthetic
+from apps.content.models import BlogPost, Ebook, Hero, Page, PageSection, Service
+from apps.content.snapshots import refresh_snapshot
+
+# Seconds to let the revalidation thread deliver before the process exits.
+REVALIDATION_WAIT = 300
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate deterministic synthetic services, eBooks, blog posts, pages and page sections "
+        "for scale testing. Rows are bulk-inserted in batches with flat memory; rows whose slug "
+        "(or page and order) already exists are skipped, so rerunning with the same seed is safe. "
+        "With --mock-file the same corpus is written as JSON for MOCK_CONTENT_FILE instead."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--services", type=int, default=200)
+        parser.add_argument("--ebooks", type=int, default=200)
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument("--sections", type=int, default=50, help="Sections per page.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--mock-file", help="Write the corpus to this JSON file instead of the database.")
+        parser.add_argument("--reindex", action="store_true", help="Re-embed RAG chunks for the new content afterwards.")
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        counts = {key: options[key] for key in ("services", "ebooks", "posts", "sections")}
+        if options["mock_file"]:
+            self._write_mock(options["mock_file"], counts, options["seed"])
+        else:
+            self._write_database(counts, options["seed"], options["batch_size"], options["reindex"])
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        self.stdout.write(f"Peak memory: {peak:.0f} MB")
+
+    def _write_database(self, counts: Dict[str, int], seed: int, batch_size: int, reindex: bool) -> None:
+        self._report("services", self._insert(Service, synthetic.services(counts["services"], seed), batch_size))
+        self._report("ebooks", self._insert(Ebook, synthetic.ebooks(counts["ebooks"], seed), batch_size))
+        self._report("posts", self._insert(BlogPost, synthetic.blog_posts(counts["posts"], seed), batch_size))
+        started, generated, inserted = time.perf_counter(), 0, 0
+        paths = set().union(*(revalidation.listing_paths(model) for model in (Service, Ebook, BlogPost)))
+        for record in synthetic.pages(seed):
+            page = self._page(record)
+            rows = ({**section, "page_id": page.pk} for section in synthetic.page_sections(page.slug, counts["sections"], seed))
+            page_generated, page_inserted, _ = self._insert(PageSection, rows, batch_size)
+            generated, inserted = generated + page_generated, inserted + page_inserted
+            refresh_snapshot(page.pk)
+            paths |= revalidation.page_paths(page.slug)
+        self._report("sections", (generated, inserted, time.perf_counter() - started))
+        # bulk_create skips the save signals that normally drop cached list responses.
+        for namespace in (cache.SERVICE, cache.EBOOK, cache.BLOG_POST):
+            cache.invalidate(namespace)
+        # Only new rows are inserted, so no detail page the frontend has rendered changed.
+        revalidation.schedule(paths)
+        if not revalidation.wait(timeout=REVALIDATION_WAIT):
+            self.stderr.write(f"Frontend revalidation still running after {REVALIDATION_WAIT}s; the rest is dropped")
+        if reindex:
+            from apps.rag.indexing import reindex as reindex_chunks
+
+            started = time.perf_counter()
+            result = reindex_chunks(batch_size=batch_size)
+            self.stdout.write(f"Reindexed RAG chunks in {time.perf_counter() - started:.1f}s: {result}")
+
+    def _insert(self, model: type, rows: Iterable[Dict[str, Any]], batch_size: int) -> tuple:
+        """Returns rows generated, rows actually inserted and elapsed seconds."""
+        started, generated = time.perf_counter(), 0
+        # ignore_conflicts does not say which rows it skipped, so the table is counted instead.
+        before = model.objects.count()
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            with transaction.atomic():
+                model.objects.bulk_create([model(**row) for row in batch], ignore_conflicts=True)
+            generated += len(batch)
+        return generated, model.objects.count() - before, time.perf_counter() - started
+
+    def _page(self, record: Dict[str, Any]) -> Page:
+        fields = {key: value for key, value in record.items() if key not in ("slug", "hero")}
+        with transaction.atomic():
+            page, _ = Page.objects.get_or_create(slug=record["slug"], defaults=fields)
+            if page.hero_id is None:
+                page.hero = Hero.objects.create(**record["hero"])
+                page.save(update_fields=["hero", "updated_at"])
+        return page
+
+    def _report(self, label: str, result: tuple) -> None:
+        generated, inserted, elapsed = result
+        rate = generated / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{label:<9} {inserted:>9} inserted, {generated - inserted:>9} already present "
+            f"in {elapsed:6.1f}s ({rate:,.0f} rows/s)"
+        )
+
+    def _write_mock(self, path: str, counts: Dict[str, int], seed: int) -> None:
+        started = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as out:
+            out.write("{")
+            for position, (key, entries) in enumerate(synthetic.mock_dataset(counts, seed)):
+                out.write(f'{"," if position else ""}\n{json.dumps(key)}: ')
+                if key == "pages":
+                    _stream(out, (f"{json.dumps(slug)}: {json.dumps(page)}" for slug, page in entries), "{", "}")
+                else:
+                    _stream(out, (json.dumps(entry) for entry in entries), "[", "]")
+            out.write("\n}\n")
+        self.stdout.write(f"Mock dataset written to {path} in {time.perf_counter() - started:.1f}s")
+
+
+def _stream(out: TextIO, encoded: Iterator[str], open_: str, close: str) -> None:
+    out.write(open_)
+    for position, item in enumerate(encoded):
+        out.write(f'{"," if position else ""}\n  {item}')
+    out.write(close)
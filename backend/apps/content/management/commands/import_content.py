@@ -0,0 +1,67 @@
+import resource
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.content import revalidation, transfer
+
+# Seconds to let the revalidation thread deliver before the process exits.
+REVALIDATION_WAIT = 300
+
+
+class Command(BaseCommand):
+    help = (
+        "Load content from a JSONL file written by export_content (or '-' for stdin). Records "
+        "are validated one line at a time and upserted in batches by slug, or by page and order "
+        "for page sections, each batch in its own transaction. Bad lines are reported with their "
+        "line number and skipped; the command fails at the end if any were, after committing "
+        "the rest."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("path", help="JSONL file, optionally '.gz'; '-' for stdin.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-errors", type=int, default=100, help="Stop after this many bad lines.")
+        parser.add_argument("--reindex", action="store_true", help="Re-embed RAG chunks for the imported content afterwards.")
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        errors = []
+
+        def on_error(line_number: int, message: str) -> None:
+            errors.append(line_number)
+            self.stderr.write(f"line {line_number}: {message}")
+            if len(errors) >= options["max_errors"]:
+                raise CommandError(f"Stopped after {len(errors)} bad lines; batches before line {line_number} are committed")
+
+        importer = transfer.Importer(options["batch_size"], on_error)
+        started = time.perf_counter()
+        with transfer.open_stream(options["path"], "r") as stream:
+            for line_number, line in enumerate(stream, 1):
+                if line.strip():
+                    importer.add(line_number, line)
+        importer.finish()
+        elapsed = time.perf_counter() - started
+        if not revalidation.wait(timeout=REVALIDATION_WAIT):
+            self.stderr.write(f"Frontend revalidation still running after {REVALIDATION_WAIT}s; the rest is dropped")
+
+        total = 0
+        for label, stats in importer.stats.items():
+            total += stats.records
+            self.stdout.write(f"{label:<20} {stats.imported:>9} imported {stats.errors:>6} skipped")
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(f"{total} records in {elapsed:.1f}s ({rate:,.0f} records/s)")
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        self.stdout.write(f"Peak memory: {peak:.0f} MB")
+
+        if options["reindex"]:
+            from apps.rag.indexing import reindex as reindex_chunks
+
+            started = time.perf_counter()
+            result = reindex_chunks(batch_size=options["batch_size"])
+            self.stdout.write(f"Reindexed RAG chunks in {time.perf_counter() - started:.1f}s: {result}")
+        if errors:
+            raise CommandError(f"{len(errors)} bad lines skipped")
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ebook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=150)),
+                ('slug', models.SlugField(unique=True)),
+                ('summary', models.TextField()),
+                ('file', models.FileField(upload_to='ebooks/')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Hero',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=200)),
+                ('subtitle', models.TextField(blank=True)),
+                ('cta_label', models.CharField(blank=True, max_length=100)),
+                ('cta_url', models.URLField(blank=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Service',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=120)),
+                ('slug', models.SlugField(unique=True)),
+                ('description', models.TextField()),
+                ('long_description', models.TextField(blank=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(unique=True)),
+                ('excerpt', models.TextField()),
+                ('content', models.TextField()),
+                ('published_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('is_published', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['-published_at'],
+                'indexes': [models.Index(condition=models.Q(('is_published', True)), fields=['-published_at', 'id'], name='content_blog_published_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Page',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('slug', models.CharField(choices=[('home', 'Home'), ('services', 'Services'), ('ebooks', 'Ebooks'), ('blog', 'Blog')], max_length=50, unique=True)),
+                ('seo_title', models.CharField(blank=True, max_length=180)),
+                ('seo_description', models.CharField(blank=True, max_length=300)),
+                ('schema_markup', models.JSONField(blank=True, default=dict)),
+                ('hero', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='content.hero')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PageSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('heading', models.CharField(max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('page', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='content.page')),
+            ],
+            options={
+                'ordering': ['order'],
+                'constraints': [models.UniqueConstraint(fields=('page', 'order'), name='content_section_page_order_uniq')],
+            },
+        ),
+    ]
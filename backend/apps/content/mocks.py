@@ -1,8 +1,12 @@
 """Mocked marketing content for development and demos."""
 from __future__ import annotations
 
+import json
+from pathlib import Path
 from typing import Dict, List, Optional
 
+from django.conf import settings
+
 MOCK_PAGE_SECTIONS: Dict[str, List[Dict[str, object]]] = {
     'home': [
         {
@@ -118,6 +122,16 @@ MOCK_BLOG_POSTS: List[Dict[str, object]] = [
     },
 ]
 
+if settings.MOCK_CONTENT_FILE:
+    # A corpus written by ``generate_content --mock-file`` replaces the samples above.
+    _dataset = json.loads(Path(settings.MOCK_CONTENT_FILE).read_text())
+    MOCK_PAGES = _dataset['pages']
+    MOCK_PAGE_SECTIONS = {slug: page['sections'] for slug, page in MOCK_PAGES.items()}
+    MOCK_SERVICES = _dataset['services']
+    MOCK_EBOOKS = _dataset['ebooks']
+    MOCK_BLOG_POSTS = _dataset['blog_posts']
+    del _dataset
+
 MOCK_BLOG_MAP = {post['slug']: post for post in MOCK_BLOG_POSTS}
 MOCK_SERVICE_MAP = {service['slug']: service for service in MOCK_SERVICES}
 MOCK_EBOOK_MAP = {ebook['slug']: ebook for ebook in MOCK_EBOOKS}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
@@ -52,6 +53,14 @@ class BlogPost(TimeStampedModel):
 
     class Meta:
         ordering = ["-published_at"]
+        indexes = [
+            # Serves the published feed and its keyset pagination on (-published_at, id).
+            models.Index(
+                fields=["-published_at", "id"],
+                name="content_blog_published_idx",
+                condition=models.Q(is_published=True),
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -75,19 +84,66 @@ class Page(TimeStampedModel):
     seo_title = models.CharField(max_length=180, blank=True)
     seo_description = models.CharField(max_length=300, blank=True)
     schema_markup = models.JSONField(blank=True, default=dict)
+    # Bumped by every publish; publishes compare-and-swap on it instead of locking.
+    version = models.PositiveIntegerField(default=1)
 
     def __str__(self) -> str:
         return self.get_slug_display()
 
 
 class PageSection(TimeStampedModel):
-    page = models.ForeignKey(Page, related_name="sections", on_delete=models.CASCADE)
+    # Indexed by the (page, order) unique constraint below.
+    page = models.ForeignKey(Page, related_name="sections", on_delete=models.CASCADE, db_index=False)
     heading = models.CharField(max_length=200)
     body = models.TextField(blank=True)
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["order"]
+        constraints = [
+            models.UniqueConstraint(fields=["page", "order"], name="content_section_page_order_uniq"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.page.slug} - {self.heading}"
+
+
+class PageSnapshot(models.Model):
+    """Rendered ``/api/pages/<slug>/`` payload, rebuilt whenever the page or its parts change."""
+
+    page = models.OneToOneField(Page, related_name="snapshot", on_delete=models.CASCADE)
+    # Copied from the page so reads are a single lookup on this table.
+    slug = models.CharField(max_length=50, unique=True)
+    version = models.PositiveIntegerField(default=1)
+    payload = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.slug} v{self.version}"
+
+
+class PageRevision(models.Model):
+    """The section changes made by one publish, enough to undo it.
+
+    ``changes`` lists one entry per touched section: ``{"order", "op", "before",
+    "after"}`` where ``op`` is ``create``, ``update`` or ``delete`` and the
+    before/after dicts hold only the fields that changed.
+    """
+
+    page = models.ForeignKey(Page, related_name="revisions", on_delete=models.CASCADE)
+    # The page version this publish produced.
+    version = models.PositiveIntegerField()
+    changes = models.JSONField(default=list)
+    # Set when this revision restored the page to an earlier version.
+    restored_version = models.PositiveIntegerField(null=True, blank=True)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        ordering = ["page", "-version"]
+        constraints = [
+            models.UniqueConstraint(fields=["page", "version"], name="content_revision_page_version_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.page.slug} v{self.version}"
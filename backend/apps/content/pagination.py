@@ -0,0 +1,118 @@
+"""Keyset pagination for time-ordered content feeds."""
+from __future__ import annotations
+
+import binascii
+import functools
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Position = Tuple[str, Any]
+
+
+class KeysetPagination(BasePagination):
+    """Pages over ``(-ordering_field, tiebreak_field)`` using an opaque cursor.
+
+    Each page is a ``WHERE (ordering_field, tiebreak_field) < cursor`` range scan
+    on the index rather than an ``OFFSET``, so deep pages cost the same as the
+    first one.
+    """
+
+    ordering_field = "published_at"
+    tiebreak_field = "id"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    tiebreak_type: type = int
+
+    def get_page_size(self, request) -> int:  # noqa: ANN001
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, settings.BLOG_PAGE_SIZE))
+        except ValueError:
+            size = settings.BLOG_PAGE_SIZE
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, position: Position) -> str:
+        return urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request) -> Optional[Position]:  # noqa: ANN001
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            value, tiebreak = json.loads(urlsafe_b64decode(raw.encode("ascii")))
+            timestamp = parse_datetime(value) if isinstance(value, str) else None
+        except (ValueError, TypeError, binascii.Error):
+            raise NotFound("Invalid cursor")
+        # Anything else would reach the ORM (or the comparisons in mock mode) and fail there.
+        if timestamp is None or timezone.is_naive(timestamp) or type(tiebreak) is not self.tiebreak_type:
+            raise NotFound("Invalid cursor")
+        return value, tiebreak
+
+    def _page(self, rows: List[Any], page_size: int, position_of: Callable[[Any], Position]) -> List[Any]:
+        self.next_position = position_of(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def paginate_queryset(self, queryset, request, view=None):  # noqa: ANN001
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(f"-{self.ordering_field}", self.tiebreak_field)
+        position = self.decode_cursor(request)
+        if position:
+            value = parse_datetime(position[0])
+            queryset = queryset.filter(
+                Q(**{f"{self.ordering_field}__lt": value})
+                | Q(**{self.ordering_field: value, f"{self.tiebreak_field}__gt": position[1]})
+            )
+        rows = list(queryset[: page_size + 1])
+        return self._page(rows, page_size, self._row_position)
+
+    def _row_position(self, row: Any) -> Position:
+        # Rows are model instances, or dicts when the queryset uses ``.values()``.
+        get = row.get if isinstance(row, dict) else functools.partial(getattr, row)
+        return get(self.ordering_field).isoformat(), get(self.tiebreak_field)
+
+    def paginate_items(self, items: Sequence[Dict[str, Any]], request) -> List[Dict[str, Any]]:  # noqa: ANN001
+        """Same paging over in-memory dicts (mock mode), whose ISO timestamps sort as strings."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordered = sorted(items, key=lambda item: item[self.tiebreak_field])
+        ordered.sort(key=lambda item: item[self.ordering_field], reverse=True)
+        position = self.decode_cursor(request)
+        if position:
+            value, tiebreak = position
+            ordered = [
+                item
+                for item in ordered
+                if item[self.ordering_field] < value
+                or (item[self.ordering_field] == value and item[self.tiebreak_field] > tiebreak)
+            ]
+        return self._page(
+            ordered[: page_size + 1],
+            page_size,
+            lambda item: (item[self.ordering_field], item[self.tiebreak_field]),
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):  # noqa: ANN001
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class MockKeysetPagination(KeysetPagination):
+    # Mock posts have no primary key; slugs are unique and stable.
+    tiebreak_field = "slug"
+    tiebreak_type = str
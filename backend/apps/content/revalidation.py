@@ -0,0 +1,212 @@
+"""On-demand ISR revalidation of the frontend after content changes.
+
+Saves and deletes map to the frontend paths that render the changed object and
+are handed to a per-process ``RevalidationDispatcher`` once the transaction
+commits. The dispatcher waits ``REVALIDATION_DEBOUNCE_SECONDS`` after the first
+request for a path, so a burst of edits turns into one ``POST /api/revalidate``
+per unique path, and sends from a background thread, retrying failed calls
+with exponential backoff. Nothing is sent unless ``REVALIDATION_URL`` is set.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import requests
+from django.conf import settings
+from django.db import transaction
+
+from .models import BlogPost, Ebook, Hero, Page, PageSection, Service
+
+logger = logging.getLogger(__name__)
+
+PAGE_PATHS = {
+    Page.HOME: "/",
+    Page.SERVICES: "/services",
+    Page.EBOOKS: "/ebooks",
+    Page.BLOG: "/blog",
+}
+
+
+# Lists of these models render on their index page and, for the latest ones, on the home page.
+LISTING_PATHS = {
+    Service: "/services",
+    Ebook: "/ebooks",
+    BlogPost: "/blog",
+}
+
+
+def listing_paths(model: type) -> Set[str]:
+    """Paths listing ``model``'s rows; a change to any row can show up on them."""
+    path = LISTING_PATHS.get(model)
+    return {"/", path} if path else set()
+
+
+def page_paths(slug: str) -> Set[str]:
+    path = PAGE_PATHS.get(slug)
+    return {path} if path else set()
+
+
+def paths_for(instance: Any) -> Set[str]:
+    """Frontend paths whose render includes ``instance``."""
+    if isinstance(instance, Page):
+        return page_paths(instance.slug)
+    if isinstance(instance, PageSection):
+        slug = Page.objects.filter(pk=instance.page_id).values_list("slug", flat=True).first()
+        return page_paths(slug) if slug else set()
+    if isinstance(instance, Hero):
+        # A deleted hero has already been detached from its pages; see ``signals.remember_hero_pages``.
+        page_ids = getattr(instance, "_snapshot_page_ids", None)
+        pages = Page.objects.filter(hero_id=instance.pk) if page_ids is None else Page.objects.filter(pk__in=page_ids)
+        slugs = pages.values_list("slug", flat=True)
+        return set().union(*(page_paths(slug) for slug in slugs))
+    path = LISTING_PATHS.get(type(instance))
+    if path:
+        return listing_paths(type(instance)) | {f"{path}/{instance.slug}"}
+    return set()
+
+
+class RevalidationDispatcher:
+    """Coalesces revalidation requests per path and delivers them in the background."""
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        debounce: float,
+        max_attempts: int,
+        backoff: float,
+        timeout: float,
+    ) -> None:
+        self.url = url
+        self.token = token
+        self.debounce = debounce
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        # path -> (monotonic time it is due, attempts so far)
+        self._pending: Dict[str, Tuple[float, int]] = {}
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.sent = self.failed = 0
+
+    def request(self, paths: Iterable[str]) -> None:
+        """Revalidate ``paths`` once the debounce window of each has passed."""
+        due = time.monotonic() + self.debounce
+        with self._condition:
+            for path in paths:
+                # A path already waiting keeps its deadline, so a steady stream
+                # of edits cannot postpone it indefinitely.
+                self._pending.setdefault(path, (due, 0))
+            self._ensure_worker()
+            self._condition.notify()
+
+    def wait(self, timeout: float) -> bool:
+        """Block until nothing is pending or in flight; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def _ensure_worker(self) -> None:
+        # Forked workers inherit the dispatcher but not its thread.
+        if self._worker is None or not self._worker.is_alive() or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name="revalidation", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> Dict[str, int]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                batch = {path: attempts for path, (due, attempts) in self._pending.items() if due <= now}
+                if batch:
+                    for path in batch:
+                        del self._pending[path]
+                    self._in_flight += len(batch)
+                    return batch
+                next_due = min((due for due, _ in self._pending.values()), default=None)
+                self._condition.wait(None if next_due is None else next_due - now)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            for path, attempts in batch.items():
+                try:
+                    self._deliver(path, attempts)
+                finally:
+                    with self._condition:
+                        self._in_flight -= 1
+                        self._condition.notify_all()
+
+    def _deliver(self, path: str, attempts: int) -> None:
+        try:
+            response = self.session.post(
+                self.url,
+                json={"path": path},
+                headers={"x-secret-token": self.token},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            if response.ok:
+                self.sent += 1
+                logger.info("Revalidated %s", path)
+                return
+            error = f"HTTP {response.status_code}"
+            if response.status_code < 500 and response.status_code != 429:
+                # A bad token or path will not fix itself.
+                self.failed += 1
+                logger.error("Revalidation of %s rejected: %s", path, error)
+                return
+        attempts += 1
+        if attempts >= self.max_attempts:
+            self.failed += 1
+            logger.error("Giving up revalidating %s after %s attempts: %s", path, attempts, error)
+            return
+        delay = self.backoff * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+        logger.warning("Revalidation of %s failed (%s); retrying in %.1fs", path, error, delay)
+        with self._condition:
+            # A fresh request for the path made meanwhile already covers this retry.
+            self._pending.setdefault(path, (time.monotonic() + delay, attempts))
+            self._condition.notify()
+
+
+@lru_cache(maxsize=1)
+def get_dispatcher() -> RevalidationDispatcher:
+    return RevalidationDispatcher(
+        url=settings.REVALIDATION_URL,
+        token=settings.REVALIDATION_TOKEN,
+        debounce=settings.REVALIDATION_DEBOUNCE_SECONDS,
+        max_attempts=settings.REVALIDATION_MAX_ATTEMPTS,
+        backoff=settings.REVALIDATION_BACKOFF_SECONDS,
+        timeout=settings.REVALIDATION_TIMEOUT,
+    )
+
+
+def schedule(paths: Iterable[str]) -> None:
+    """Revalidate ``paths`` after the current transaction commits."""
+    paths = set(paths)
+    if not paths or not settings.REVALIDATION_URL or settings.ENABLE_MOCKS:
+        return
+    transaction.on_commit(partial(get_dispatcher().request, paths))
+
+
+def wait(timeout: float) -> bool:
+    """Block until scheduled paths are delivered; the dispatcher's thread dies with a command's process."""
+    if not settings.REVALIDATION_URL or settings.ENABLE_MOCKS:
+        return True
+    return get_dispatcher().wait(timeout)
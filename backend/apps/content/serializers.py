@@ -1,21 +1,34 @@
 from rest_framework import serializers
 
+from apps.core.metrics import TimedSerializerMixin
+
 from .models import BlogPost, Ebook, Hero, Page, PageSection, Service
 
 
-class HeroSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """Keeps only the fields named in the ``fields`` serializer context entry."""
+
+    def __init__(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class HeroSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Hero
         fields = ("title", "subtitle", "cta_label", "cta_url")
 
 
-class PageSectionSerializer(serializers.ModelSerializer):
+class PageSectionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = PageSection
         fields = ("heading", "body", "order")
 
 
-class PageSerializer(serializers.ModelSerializer):
+class PageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     hero = HeroSerializer()
     sections = PageSectionSerializer(many=True)
 
@@ -31,19 +44,19 @@ class PageSerializer(serializers.ModelSerializer):
         )
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = ("name", "slug", "description", "long_description")
 
 
-class EbookSerializer(serializers.ModelSerializer):
+class EbookSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Ebook
         fields = ("title", "slug", "summary", "file")
 
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogPost
         fields = (
@@ -53,3 +66,9 @@ class BlogPostSerializer(serializers.ModelSerializer):
             "content",
             "published_at",
         )
+
+
+class BlogPostListSerializer(SparseFieldsetMixin, BlogPostSerializer):
+    """Feed representation; ``content`` is only included when asked for with ``?fields=``."""
+
+    default_fields = ("title", "slug", "excerpt", "published_at")
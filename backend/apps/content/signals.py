@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from . import cache, revalidation
+from .models import BlogPost, Ebook, Hero, Page, PageSection, Service
+from .snapshots import refresh_snapshot
+
+CACHE_NAMESPACES = {
+    Service: cache.SERVICE,
+    Ebook: cache.EBOOK,
+    BlogPost: cache.BLOG_POST,
+}
+
+
+def invalidate_response_cache(sender, **kwargs):  # noqa: ANN001, ANN003
+    cache.invalidate(CACHE_NAMESPACES[sender])
+
+
+def _deleting_page(origin) -> bool:  # noqa: ANN001
+    model = getattr(origin, "model", type(origin))
+    return model is Page
+
+
+def refresh_page_snapshot(sender, instance, **kwargs):  # noqa: ANN001, ANN003
+    # Runs inside the saving transaction, so readers never see parts and
+    # snapshot out of step.
+    if sender is Page:
+        if "created" in kwargs:
+            refresh_snapshot(instance.pk)
+        return
+    if sender is PageSection:
+        # Sections removed by a page's cascade delete take the snapshot with them.
+        if not _deleting_page(kwargs.get("origin")):
+            refresh_snapshot(instance.page_id)
+        return
+    # A deleted hero has already been detached (SET NULL) by now, so use the
+    # pages recorded in ``remember_hero_pages``.
+    page_ids = getattr(instance, "_snapshot_page_ids", None)
+    if page_ids is None:
+        page_ids = Page.objects.filter(hero_id=instance.pk).values_list("pk", flat=True)
+    for page_id in page_ids:
+        refresh_snapshot(page_id)
+
+
+def remember_hero_pages(sender, instance, **kwargs):  # noqa: ANN001, ANN003
+    instance._snapshot_page_ids = list(Page.objects.filter(hero_id=instance.pk).values_list("pk", flat=True))
+
+
+def request_revalidation(sender, instance, **kwargs):  # noqa: ANN001, ANN003
+    revalidation.schedule(revalidation.paths_for(instance))
+
+
+def connect() -> None:
+    for model in CACHE_NAMESPACES:
+        post_save.connect(invalidate_response_cache, sender=model, dispatch_uid=f"content-cache-save-{model.__name__}")
+        post_delete.connect(invalidate_response_cache, sender=model, dispatch_uid=f"content-cache-delete-{model.__name__}")
+    for model in (Page, PageSection, Hero):
+        post_save.connect(refresh_page_snapshot, sender=model, dispatch_uid=f"page-snapshot-save-{model.__name__}")
+        post_delete.connect(refresh_page_snapshot, sender=model, dispatch_uid=f"page-snapshot-delete-{model.__name__}")
+    for model in (Page, PageSection, Hero, *CACHE_NAMESPACES):
+        post_save.connect(request_revalidation, sender=model, dispatch_uid=f"revalidate-save-{model.__name__}")
+        post_delete.connect(request_revalidation, sender=model, dispatch_uid=f"revalidate-delete-{model.__name__}")
+    pre_delete.connect(remember_hero_pages, sender=Hero, dispatch_uid="page-snapshot-hero-pages")
@@ -0,0 +1,79 @@
+"""Denormalized page payloads.
+
+``PageSerializer`` output is rendered once per change and stored in
+``PageSnapshot``; ``/api/pages/<slug>/`` then serves the stored bytes with a
+single indexed lookup and no ORM graph or serializer work.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework.renderers import JSONRenderer
+
+from .models import Page, PageSnapshot
+from .serializers import PageSerializer
+
+
+def render_page(page: Page) -> bytes:
+    return JSONRenderer().render(PageSerializer(page).data)
+
+
+def refresh_snapshot(page_id: int) -> Optional[PageSnapshot]:
+    """Re-render one page's snapshot inside the caller's transaction.
+
+    The snapshot row is locked before the page is read, so concurrent edits of
+    one page render one after the other and the last to commit has seen the
+    others' writes.
+    """
+    with transaction.atomic():
+        snapshot = _lock(page_id)
+        page = _read(page_id)
+        if page is None:
+            PageSnapshot.objects.filter(page_id=page_id).delete()
+            return None
+        if snapshot is None:
+            try:
+                with transaction.atomic():
+                    return PageSnapshot.objects.create(page=page, slug=page.slug, payload=render_page(page))
+            except IntegrityError:
+                # A concurrent first read created it; render again once its lock is ours.
+                snapshot = _lock(page_id)
+                page = _read(page_id)
+        snapshot.slug = page.slug
+        snapshot.payload = render_page(page)
+        snapshot.version += 1
+        snapshot.save()
+        return snapshot
+
+
+def _lock(page_id: int) -> Optional[PageSnapshot]:
+    return PageSnapshot.objects.select_for_update().filter(page_id=page_id).first()
+
+
+def _read(page_id: int) -> Optional[Page]:
+    return Page.objects.select_related("hero").prefetch_related("sections").filter(pk=page_id).first()
+
+
+@lru_cache(maxsize=None)
+def _mock_payload(slug: str) -> Optional[bytes]:
+    from .mocks import get_mock_page
+
+    page = get_mock_page(slug)
+    return JSONRenderer().render(page) if page else None
+
+
+def get_page_payload(slug: str) -> Optional[bytes]:
+    """Rendered page JSON, building the snapshot on first read if it is missing."""
+    if settings.ENABLE_MOCKS:
+        return _mock_payload(slug)
+    payload = PageSnapshot.objects.filter(slug=slug).values_list("payload", flat=True).first()
+    if payload is not None:
+        return bytes(payload)
+    page_id = Page.objects.filter(slug=slug).values_list("pk", flat=True).first()
+    if page_id is None:
+        return None
+    snapshot = refresh_snapshot(page_id)
+    return bytes(snapshot.payload) if snapshot else None
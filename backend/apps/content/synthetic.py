@@ -0,0 +1,191 @@
+"""Deterministic synthetic content for scale testing.
+
+Every record is built from its own ``random.Random`` seeded with the run seed,
+the kind and the record number, so record ``n`` is the same whatever the batch
+size, the counts of other kinds, or whether it is written to the database or
+to a mock dataset file. Text lengths follow what editors actually write: short
+titles, paragraph-sized excerpts and summaries, and multi-section HTML bodies.
+Generators yield one record at a time, so callers decide how much is held in
+memory.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.utils.text import slugify
+
+from .models import Page
+
+WORDS = (
+    "account accounts activation adoption agile alignment analytics audience automation benchmark brand budget "
+    "buyer campaign channel churn cohort compliance consent content conversion cost creative crm customer "
+    "dashboard data demand design digital discovery email engagement enterprise event experiment expansion "
+    "feedback forecast funnel gdpr growth handoff insight integration journey launch lead lifecycle loyalty "
+    "market marketing measure message metric mobile model momentum motion nurture onboarding operations "
+    "opportunity organic outreach paid partner performance persona pipeline platform playbook pricing product "
+    "program prospect qualified quarter reach referral renewal report retention revenue roadmap sales scale "
+    "score search segment signal social sprint stack strategy success support team template territory test "
+    "trial upsell value velocity webinar workflow zoho"
+).split()
+CONNECTORS = ("and", "with", "for", "across", "without", "into", "from", "that", "while", "so")
+SENTENCE_POOL = 8192
+WORDS_PER_SENTENCE = 14
+# Posts are dated backwards from here, about 90 minutes apart, newest first.
+EPOCH = datetime(2025, 6, 1, 9, 0, tzinfo=timezone.utc)
+
+
+class _Random(random.Random):
+    """``random.Random`` that remembers the run seed for the shared sentence pool."""
+
+    def __init__(self, seed_value: int, key: str) -> None:
+        super().__init__(key)
+        self.seed_value = seed_value
+
+
+def _rng(seed: int, kind: str, n: int) -> _Random:
+    return _Random(seed, f"{seed}:{kind}:{n}")
+
+
+def _words(rng: random.Random, low: int, high: int) -> List[str]:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    # Sprinkle connectors so the text does not read as a keyword list.
+    for index in range(2, len(words), rng.randint(4, 7)):
+        words[index] = rng.choice(CONNECTORS)
+    return words
+
+
+def _title(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(_words(rng, low, high)).capitalize()
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(_words(rng, 8, 20)).capitalize() + "."
+
+
+@lru_cache(maxsize=4)
+def _sentences(seed: int) -> Tuple[str, ...]:
+    # Drawing whole sentences from a pool keeps long bodies cheap to generate.
+    rng = _rng(seed, "sentences", 0)
+    return tuple(_sentence(rng) for _ in range(SENTENCE_POOL))
+
+
+def _text(rng: random.Random, low: int, high: int) -> str:
+    """Plain sentences totalling roughly ``low`` to ``high`` words."""
+    pool = _sentences(rng.seed_value)
+    count = max(1, round(rng.randint(low, high) / WORDS_PER_SENTENCE))
+    return " ".join(rng.choices(pool, k=count))
+
+
+def _html(rng: random.Random, low: int, high: int) -> str:
+    """Paragraphs, subheadings and lists totalling roughly ``low`` to ``high`` words."""
+    target = rng.randint(low, high)
+    blocks, count = [], 0
+    while count < target:
+        roll = rng.random()
+        if roll < 0.15 and blocks:
+            blocks.append(f"<h2>{_title(rng, 3, 7)}</h2>")
+            continue
+        if roll < 0.3 and blocks:
+            items = [" ".join(_words(rng, 4, 12)).capitalize() for _ in range(rng.randint(3, 6))]
+            blocks.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+            count += sum(item.count(" ") + 1 for item in items)
+            continue
+        paragraph = _text(rng, 40, 110)
+        if roll < 0.45:
+            words = paragraph.split(" ")
+            start = rng.randrange(len(words) - 3)
+            words[start:start + 3] = [f"<strong>{' '.join(words[start:start + 3])}</strong>"]
+            paragraph = " ".join(words)
+        elif roll < 0.55:
+            paragraph += f' <a href="/blog/{slugify(_title(rng, 2, 4))}">Read more</a>'
+        blocks.append(f"<p>{paragraph}</p>")
+        count += paragraph.count(" ") + 1
+    return "".join(blocks)
+
+
+def _slug(title: str, n: int, max_length: int = 50) -> str:
+    suffix = f"-{n}"
+    return slugify(title)[: max_length - len(suffix)].rstrip("-") + suffix
+
+
+def services(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    for n in range(count):
+        rng = _rng(seed, "service", n)
+        name = _title(rng, 2, 4)
+        yield {
+            "name": name,
+            "slug": _slug(name, n),
+            "description": _text(rng, 15, 30),
+            "long_description": _html(rng, 120, 300),
+        }
+
+
+def ebooks(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    for n in range(count):
+        rng = _rng(seed, "ebook", n)
+        title = _title(rng, 4, 9)
+        slug = _slug(title, n)
+        yield {"title": title, "slug": slug, "summary": _text(rng, 30, 60), "file": f"ebooks/{slug}.pdf"}
+
+
+def blog_posts(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Posts newest first; about one in ten is an unpublished draft."""
+    for n in range(count):
+        rng = _rng(seed, "post", n)
+        title = _title(rng, 5, 11)
+        # 90 minute slots with jitter inside the slot keep the order strict.
+        published_at = EPOCH - timedelta(minutes=90 * n + rng.randint(0, 59))
+        yield {
+            "title": title,
+            "slug": _slug(title, n),
+            "excerpt": _text(rng, 25, 45),
+            "content": _html(rng, 600, 1800),
+            "published_at": published_at,
+            "is_published": rng.random() >= 0.1,
+        }
+
+
+def pages(seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """One record per ``Page.PAGE_CHOICES`` slug, with its hero."""
+    for n, (slug, label) in enumerate(Page.PAGE_CHOICES):
+        rng = _rng(seed, "page", n)
+        yield {
+            "slug": slug,
+            "hero": {
+                "title": _title(rng, 4, 8),
+                "subtitle": _text(rng, 15, 30),
+                "cta_label": _title(rng, 2, 3),
+                "cta_url": f"https://example.com/{slug}",
+            },
+            "seo_title": f"{label} | {_title(rng, 3, 6)}",
+            "seo_description": _text(rng, 20, 35)[:300],
+            "schema_markup": {"@context": "https://schema.org", "@type": "WebPage", "name": label},
+        }
+
+
+def page_sections(page_slug: str, count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    for order in range(count):
+        rng = _rng(seed, f"section:{page_slug}", order)
+        yield {"heading": _title(rng, 3, 8), "body": _html(rng, 40, 250), "order": order}
+
+
+def mock_dataset(counts: Dict[str, int], seed: int = 0) -> Iterator[Tuple[str, Iterator[Any]]]:
+    """The same corpus as ``apps.content.mocks`` globals, one top-level entry at a time.
+
+    Mock mode serves every post, so only published posts are included, and
+    eBook files become absolute URLs like the built-in mocks'.
+    """
+    yield "pages", (
+        (page["slug"], {**page, "sections": list(page_sections(page["slug"], counts["sections"], seed))})
+        for page in pages(seed)
+    )
+    yield "services", services(counts["services"], seed)
+    yield "ebooks", ({**ebook, "file": f"https://example.com/{ebook['file']}"} for ebook in ebooks(counts["ebooks"], seed))
+    yield "blog_posts", (
+        {key: value.isoformat() if key == "published_at" else value for key, value in post.items() if key != "is_published"}
+        for post in blog_posts(counts["posts"], seed)
+        if post["is_published"]
+    )
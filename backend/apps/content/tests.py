@@ -0,0 +1,283 @@
+import json
+import threading
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import revalidation, snapshots, transfer
+from .models import BlogPost, Ebook, Page, PageSection, PageSnapshot, Service
+
+BLOG_INDEX = "content_blog_published_idx"
+SECTION_INDEX = "content_section_page_order_uniq"
+
+
+class QueryPlanTests(TestCase):
+    """EXPLAIN shows the API's hot queries using the indexes shipped for them."""
+
+    @classmethod
+    def setUpTestData(cls):  # noqa: ANN206
+        now = timezone.now()
+        BlogPost.objects.bulk_create(
+            (
+                BlogPost(
+                    title=f"Plan check {i}",
+                    slug=f"plan-check-{i}",
+                    excerpt="Excerpt",
+                    content="<p>Body</p>",
+                    published_at=now - timedelta(hours=i),
+                    is_published=i % 10 != 0,
+                )
+                for i in range(20000)
+            ),
+            batch_size=1000,
+        )
+        cls.page = Page.objects.create(slug=Page.HOME)
+        PageSection.objects.bulk_create(
+            (PageSection(page=cls.page, heading=f"Section {i}", order=i) for i in range(200)),
+            batch_size=1000,
+        )
+        if connection.vendor == "postgresql":
+            # Fresh tables have no statistics; the planner needs them to prefer the index.
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {BlogPost._meta.db_table}, {PageSection._meta.db_table}")
+
+    def assertUsesIndex(self, queryset, index: str) -> None:  # noqa: ANN001, N802
+        names = [index]
+        if connection.vendor == "sqlite" and index == SECTION_INDEX:
+            # SQLite builds unique constraints inline, so EXPLAIN shows its autoindex.
+            names.append(f"sqlite_autoindex_{PageSection._meta.db_table}")
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in names), f"{index} not used:\n{plan}")
+
+    def test_published_blog_feed(self) -> None:
+        self.assertUsesIndex(BlogPost.objects.filter(is_published=True).order_by("-published_at", "id")[:21], BLOG_INDEX)
+
+    def test_page_sections_by_order(self) -> None:
+        self.assertUsesIndex(PageSection.objects.filter(page=self.page).order_by("order"), SECTION_INDEX)
+
+    def test_publish_lookup_by_order(self) -> None:
+        self.assertUsesIndex(PageSection.objects.filter(page=self.page, order=3), SECTION_INDEX)
+
+
+class FastPathParityTests(TestCase):
+    """``CONTENT_FAST_READS`` responses are byte-for-byte the serializer path's."""
+
+    @classmethod
+    def setUpTestData(cls):  # noqa: ANN206
+        now = timezone.now().replace(microsecond=123456)
+        text = "RevOps \u2014 \u00fcn\u00efcode, emoji \U0001f680 and a line\u2028separator"
+        Service.objects.bulk_create(
+            Service(name=f"Service {i}", slug=f"parity-service-{i}", description=text, long_description="")
+            for i in range(3)
+        )
+        Ebook.objects.bulk_create(
+            Ebook(title=f"Ebook {i}", slug=f"parity-ebook-{i}", summary=text, file=f"ebooks/parity {i}.pdf" if i else "")
+            for i in range(3)
+        )
+        BlogPost.objects.bulk_create(
+            BlogPost(
+                title=f"Post {i}",
+                slug=f"parity-post-{i}",
+                excerpt=text,
+                content=text,
+                published_at=now - timedelta(days=i, microseconds=i),
+                is_published=True,
+            )
+            for i in range(3)
+        )
+
+    def fetch(self, path: str, fast: bool) -> bytes:
+        cache.clear()
+        with override_settings(CONTENT_FAST_READS=fast):
+            response = self.client.get(path, secure=True, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_list_bytes_match(self) -> None:
+        paths = ("/api/services/", "/api/ebooks/", "/api/blog-posts/", "/api/blog-posts/?fields=slug,published_at")
+        for time_zone in ("UTC", "Europe/Madrid"):
+            for path in paths:
+                with self.subTest(path=path, time_zone=time_zone), override_settings(TIME_ZONE=time_zone):
+                    self.assertEqual(self.fetch(path, fast=True), self.fetch(path, fast=False))
+
+    def test_fixture_covers_null_files_and_datetimes(self) -> None:
+        files = sorted(ebook["file"] or "" for ebook in json.loads(self.fetch("/api/ebooks/", fast=True)))
+        self.assertEqual(files[0], "")
+        self.assertTrue(files[1].startswith("https://"))
+        posts = json.loads(self.fetch("/api/blog-posts/", fast=True))["results"]
+        self.assertTrue(posts[0]["published_at"].endswith(".123456Z"))
+
+
+class SnapshotTests(TestCase):
+    def setUp(self) -> None:
+        self.page = Page.objects.create(slug=Page.HOME, seo_title="Home")
+        for order in range(2):
+            PageSection.objects.create(page=self.page, heading=f"Section {order}", body="Original", order=order)
+
+    def assertSnapshotCurrent(self) -> None:  # noqa: N802
+        page = Page.objects.select_related("hero").prefetch_related("sections").get(pk=self.page.pk)
+        self.assertEqual(bytes(PageSnapshot.objects.get(page=page).payload), snapshots.render_page(page))
+
+    def test_interleaved_section_edits_render_both(self) -> None:
+        real_lock = snapshots._lock
+        edits = []
+
+        def lock_after_other_edit(page_id):  # noqa: ANN001, ANN202
+            # The other edit held the snapshot row and commits before this one gets it.
+            if not edits:
+                edits.append(page_id)
+                PageSection.objects.filter(page_id=page_id, order=1).update(body="Theirs")
+                snapshots.refresh_snapshot(page_id)
+            return real_lock(page_id)
+
+        with mock.patch.object(snapshots, "_lock", lock_after_other_edit):
+            section = PageSection.objects.get(page=self.page, order=0)
+            section.body = "Ours"
+            section.save()
+        payload = json.loads(bytes(PageSnapshot.objects.get(page=self.page).payload))
+        self.assertEqual([section["body"] for section in payload["sections"]], ["Ours", "Theirs"])
+        self.assertSnapshotCurrent()
+
+    def test_concurrent_first_read_does_not_fail(self) -> None:
+        PageSnapshot.objects.filter(page=self.page).delete()
+        real_lock = snapshots._lock
+        misses = []
+
+        def racing_lock(page_id):  # noqa: ANN001, ANN202
+            # Another request inserts the snapshot between this one's lookup and insert.
+            if not misses:
+                misses.append(page_id)
+                PageSnapshot.objects.create(page_id=page_id, slug=self.page.slug, payload=b"{}")
+                return None
+            return real_lock(page_id)
+
+        with mock.patch.object(snapshots, "_lock", racing_lock):
+            snapshot = snapshots.refresh_snapshot(self.page.pk)
+        self.assertEqual(PageSnapshot.objects.filter(page=self.page).count(), 1)
+        self.assertEqual(snapshot.version, 2)
+        self.assertSnapshotCurrent()
+
+
+REVALIDATION_TOKEN = "test-revalidation"
+
+
+class _StubRevalidateEndpoint(BaseHTTPRequestHandler):
+    """Stands in for the frontend's ``/api/revalidate`` route."""
+
+    received: Counter
+    failures: Counter
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        path = body.get("path", "/")
+        self.received[path] += 1
+        if self.headers.get("x-secret-token") != REVALIDATION_TOKEN:
+            status = 401
+        elif self.failures[path] > 0:
+            self.failures[path] -= 1
+            status = 503
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({"revalidated": status == 200, "path": path}).encode())
+
+    def log_message(self, *args) -> None:  # noqa: ANN002
+        pass
+
+
+class RevalidationTests(TestCase):
+    """Content edits revalidate each affected frontend path once, against a local stub endpoint."""
+
+    def setUp(self) -> None:
+        self.handler = type("Handler", (_StubRevalidateEndpoint,), {"received": Counter(), "failures": Counter()})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        settings = override_settings(
+            REVALIDATION_URL=f"http://127.0.0.1:{server.server_address[1]}/api/revalidate",
+            REVALIDATION_TOKEN=REVALIDATION_TOKEN,
+            REVALIDATION_DEBOUNCE_SECONDS=0.2,
+            REVALIDATION_BACKOFF_SECONDS=0.05,
+            ENABLE_MOCKS=False,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        revalidation.get_dispatcher.cache_clear()
+        self.addCleanup(revalidation.get_dispatcher.cache_clear)
+        self.dispatcher = revalidation.get_dispatcher()
+
+    def test_burst_of_edits_revalidates_each_path_once(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            page = Page.objects.create(slug=Page.SERVICES)
+            section = PageSection.objects.create(page=page, heading="Revalidation check", order=0)
+            service = Service.objects.create(name="Revalidation check", slug="revalidation-check")
+            for edit in range(50):
+                section.body = f"Edit {edit}"
+                section.save()
+                service.description = f"Edit {edit}"
+                service.save()
+        self.assertTrue(self.dispatcher.wait(timeout=10))
+        self.assertEqual(self.handler.received, Counter({"/": 1, "/services": 1, "/services/revalidation-check": 1}))
+
+    def test_failed_path_is_retried_until_it_succeeds(self) -> None:
+        self.handler.failures["/retry-probe"] = 2
+        with self.assertLogs(revalidation.logger, "WARNING") as logs:
+            self.dispatcher.request(["/retry-probe"])
+            self.assertTrue(self.dispatcher.wait(timeout=10))
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(self.handler.received, Counter({"/retry-probe": 3}))
+
+
+class ImportTests(TestCase):
+    def import_lines(self, *records) -> list:  # noqa: ANN002
+        errors = []
+        importer = transfer.Importer(batch_size=2, on_error=lambda line, message: errors.append(line))
+        for number, record in enumerate(records, 1):
+            importer.add(number, record if isinstance(record, str) else json.dumps(record))
+        importer.finish()
+        return errors
+
+    def test_bad_records_are_skipped_and_the_rest_imported(self) -> None:
+        post = {"slug": "imported", "title": "Imported", "excerpt": "E", "content": "C", "published_at": "2025-01-01T00:00:00Z"}
+        errors = self.import_lines(
+            {"model": "content.page", "fields": {"slug": "home", "hero": None}},
+            "not json",
+            {"model": ["content.blogpost"], "fields": {}},
+            {"model": "content.blogpost", "fields": {**post, "published_at": [1]}},
+            {"model": "content.blogpost", "fields": {**post, "title": ["Imported"]}},
+            {"model": "content.page", "fields": {"slug": "blog", "hero": 5}},
+            {"model": "content.pagesection", "fields": {"page": ["home"], "order": 0, "heading": "H", "body": "B"}},
+            {"model": "content.pagesection", "fields": {"page": "home", "order": 1.5, "heading": "H", "body": "B"}},
+            {"model": "content.pagesection", "fields": {"page": "home", "order": 0, "heading": "H", "body": "B"}},
+            {"model": "content.blogpost", "fields": post},
+        )
+        self.assertEqual(errors, [2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(list(BlogPost.objects.values_list("slug", flat=True)), ["imported"])
+        self.assertEqual(list(PageSection.objects.values_list("page__slug", "order")), [("home", 0)])
+
+    def test_reimport_updates_by_natural_key(self) -> None:
+        service = {"slug": "svc", "name": "Service", "description": "Old"}
+        self.import_lines({"model": "content.service", "fields": service})
+        self.import_lines({"model": "content.service", "fields": {**service, "description": "New"}})
+        self.assertEqual(list(Service.objects.values_list("slug", "description")), [("svc", "New")])
+
+    def test_finish_revalidates_written_rows(self) -> None:
+        post = {"slug": "fresh", "title": "Fresh", "excerpt": "E", "content": "C", "published_at": "2025-01-01T00:00:00Z"}
+        with mock.patch.object(transfer.revalidation, "schedule") as schedule:
+            self.import_lines(
+                {"model": "content.page", "fields": {"slug": Page.EBOOKS, "hero": None}},
+                {"model": "content.pagesection", "fields": {"page": Page.EBOOKS, "order": 0, "heading": "H", "body": "B"}},
+                {"model": "content.service", "fields": {"slug": "svc", "name": "Service", "description": "D"}},
+                {"model": "content.blogpost", "fields": post},
+            )
+        # The page itself was saved with its signals; the bulk-written rows are finish()'s to schedule.
+        self.assertEqual(schedule.call_args.args[0], {"/", "/services", "/services/svc", "/blog", "/blog/fresh", "/ebooks"})
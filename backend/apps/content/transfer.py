@@ -0,0 +1,285 @@
+"""Streaming JSONL export and batched upsert import of content.
+
+Each line is ``{"model": "content.<name>", "fields": {...}}``. Rows are matched
+on natural keys instead of primary keys so a file moves between environments:
+``slug`` for services, eBooks, posts and pages, and ``(page, order)`` for page
+sections, whose ``page`` is the page slug. A page carries its hero nested in
+the record. Pages are exported before sections, which is the order an import
+needs to resolve them.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, models, transaction
+
+from . import cache, revalidation
+from .models import BlogPost, Ebook, Hero, Page, PageSection, Service
+from .snapshots import refresh_snapshot
+
+HERO_FIELDS = ("title", "subtitle", "cta_label", "cta_url")
+
+
+@dataclass(frozen=True)
+class Spec:
+    model: type
+    key: Tuple[str, ...]
+    fields: Tuple[str, ...]
+    cache_namespace: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.model._meta.label_lower
+
+    @property
+    def update_fields(self) -> List[str]:
+        # created_at keeps the value of the first import; updated_at marks this one.
+        return [name for name in self.fields if name not in self.key and name != "created_at"] + ["updated_at"]
+
+
+SPECS: Tuple[Spec, ...] = (
+    Spec(Service, ("slug",), ("slug", "name", "description", "long_description", "created_at"), cache.SERVICE),
+    Spec(Ebook, ("slug",), ("slug", "title", "summary", "file", "created_at"), cache.EBOOK),
+    Spec(
+        BlogPost,
+        ("slug",),
+        ("slug", "title", "excerpt", "content", "published_at", "is_published", "created_at"),
+        cache.BLOG_POST,
+    ),
+    Spec(Page, ("slug",), ("slug", "seo_title", "seo_description", "schema_markup", "created_at")),
+    Spec(PageSection, ("page", "order"), ("page", "order", "heading", "body", "created_at")),
+)
+SPECS_BY_LABEL = {spec.label: spec for spec in SPECS}
+
+
+class RecordError(ValueError):
+    """A line that cannot be imported; the import reports it and moves on."""
+
+
+def open_stream(path: str, mode: str) -> IO[str]:
+    """Text stream for ``path``; ``.gz`` files are (de)compressed and ``-`` reads stdin."""
+    if path == "-" and mode == "r":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    if path.endswith(".gz"):
+        # Level 1: on a 20k-post export the default 9 is six times slower for a file only 15% smaller.
+        return gzip.open(path, mode + "t", compresslevel=1, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _default(value: Any) -> Any:
+    # Full isoformat; DjangoJSONEncoder would cut microseconds to milliseconds.
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=_default, ensure_ascii=False)
+
+
+def export_records(spec: Spec, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """The model's rows as records, streamed from the database ``chunk_size`` at a time."""
+    if spec.model is Page:
+        for page in Page.objects.select_related("hero").order_by("pk").iterator(chunk_size=chunk_size):
+            fields = {name: getattr(page, name) for name in spec.fields}
+            fields["hero"] = {name: getattr(page.hero, name) for name in HERO_FIELDS} if page.hero else None
+            yield {"model": spec.label, "fields": fields}
+        return
+    columns = ["page__slug" if name == "page" else name for name in spec.fields]
+    for row in spec.model.objects.order_by("pk").values_list(*columns).iterator(chunk_size=chunk_size):
+        yield {"model": spec.label, "fields": dict(zip(spec.fields, row))}
+
+
+# Fields whose JSON form is always a string (dates are ISO 8601, files their storage name).
+_STRING_FIELDS = (models.CharField, models.TextField, models.FileField, models.DateTimeField)
+
+
+def _clean_fields(model: type, names: Tuple[str, ...], values: Dict[str, Any]) -> Dict[str, Any]:
+    """Field-level validation (types, lengths, choices, slug format); uniqueness is the upsert's job.
+
+    A missing field falls back to its model default, or is an error when the
+    field has neither a default nor ``blank=True``.
+    """
+    unknown = set(values) - set(names)
+    if unknown:
+        raise RecordError(f"unexpected fields: {', '.join(sorted(unknown))}")
+    cleaned = {}
+    for name in names:
+        field = model._meta.get_field(name)
+        if name not in values:
+            if not (field.has_default() or field.blank):
+                raise RecordError(f"{name}: missing")
+            continue
+        value = values[name]
+        if isinstance(field, _STRING_FIELDS) and not isinstance(value, str) and not (value is None and field.null):
+            # CharField.to_python() would happily turn a list or an object into its repr.
+            raise RecordError(f"{name}: expected a string, got {value!r}")
+        if isinstance(field, models.IntegerField) and type(value) is not int:
+            # int() would accept true and truncate 1.5.
+            raise RecordError(f"{name}: expected an integer, got {value!r}")
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as exc:
+            raise RecordError(f"{name}: {' '.join(exc.messages)}") from exc
+        except (TypeError, ValueError) as exc:
+            # Some to_python() implementations let wrong JSON types through, e.g. a list for a date.
+            raise RecordError(f"{name}: invalid value {value!r}") from exc
+    return cleaned
+
+
+@dataclass
+class ImportStats:
+    records: int = 0
+    imported: int = 0
+    errors: int = 0
+
+
+class Importer:
+    """Validates records line by line and upserts them ``batch_size`` at a time per model.
+
+    Each batch is its own transaction, so an interrupted import keeps what it
+    wrote and can simply be rerun. When the database rejects a batch its rows
+    are retried one at a time and only the failing ones are reported. Bulk
+    upserts skip save signals, so ``finish()`` refreshes the snapshots of the
+    pages whose sections changed, drops the cached list responses and
+    schedules revalidation of the frontend paths showing the written rows.
+    """
+
+    def __init__(self, batch_size: int, on_error: Callable[[int, str], None]) -> None:
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.stats: Dict[str, ImportStats] = {spec.label: ImportStats() for spec in SPECS}
+        # Keyed by natural key, so a key repeated within a batch keeps its last record.
+        self._pending: Dict[str, Dict[Tuple[Any, ...], Tuple[int, Dict[str, Any]]]] = {spec.label: {} for spec in SPECS}
+        self._page_ids: Dict[str, int] = dict(Page.objects.values_list("slug", "pk"))
+        self._touched_pages: Set[int] = set()
+        self._touched_namespaces: Set[str] = set()
+        self._paths: Set[str] = set()
+
+    def add(self, line_number: int, line: str) -> None:
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            self.on_error(line_number, f"invalid JSON: {exc}")
+            return
+        label = record.get("model") if isinstance(record, dict) else None
+        spec = SPECS_BY_LABEL.get(label) if isinstance(label, str) else None
+        if spec is None or not isinstance(record.get("fields"), dict):
+            self.on_error(line_number, 'expected {"model": "content.<name>", "fields": {...}}')
+            return
+        stats = self.stats[spec.label]
+        stats.records += 1
+        try:
+            if spec.model is Page:
+                self._import_page(spec, record["fields"])
+                stats.imported += 1
+                return
+            fields = self._prepare(spec, record["fields"])
+        except (RecordError, TypeError, ValueError, DatabaseError) as exc:
+            self.on_error(line_number, str(exc))
+            stats.errors += 1
+            return
+        pending = self._pending[spec.label]
+        pending[tuple(fields[name] for name in spec.key)] = (line_number, fields)
+        if len(pending) >= self.batch_size:
+            self._flush(spec)
+
+    def finish(self) -> None:
+        for spec in SPECS:
+            self._flush(spec)
+        for page_id in sorted(self._touched_pages):
+            refresh_snapshot(page_id)
+        for namespace in sorted(self._touched_namespaces):
+            cache.invalidate(namespace)
+        slugs = {page_id: slug for slug, page_id in self._page_ids.items()}
+        for page_id in self._touched_pages:
+            self._paths |= revalidation.page_paths(slugs.get(page_id, ""))
+        revalidation.schedule(self._paths)
+
+    def _prepare(self, spec: Spec, values: Dict[str, Any]) -> Dict[str, Any]:
+        if spec.model is not PageSection:
+            return _clean_fields(spec.model, spec.fields, values)
+        values = dict(values)
+        page_slug = values.pop("page", None)
+        if not isinstance(page_slug, str):
+            raise RecordError(f"page: expected a page slug, got {page_slug!r}")
+        page_id = self._page_ids.get(page_slug)
+        if page_id is None:
+            raise RecordError(f"page: {page_slug!r} does not exist")
+        return {"page": page_id, **_clean_fields(PageSection, spec.fields[1:], values)}
+
+    def _import_page(self, spec: Spec, values: Dict[str, Any]) -> None:
+        # One row per page slug, so pages are saved one at a time and keep their signals.
+        values = dict(values)
+        hero_values = values.pop("hero", None)
+        if hero_values is not None and not isinstance(hero_values, dict):
+            raise RecordError(f"hero: expected an object or null, got {hero_values!r}")
+        fields = _clean_fields(Page, spec.fields, values)
+        hero = _clean_fields(Hero, HERO_FIELDS, hero_values) if hero_values else None
+        slug = fields.pop("slug")
+        with transaction.atomic():
+            page = Page.objects.select_related("hero").filter(slug=slug).first()
+            if page is None:
+                page = Page(slug=slug)
+            else:
+                fields.pop("created_at", None)
+            for name, value in fields.items():
+                setattr(page, name, value)
+            # A page exported without a hero leaves the existing hero alone.
+            if hero is not None:
+                page.hero = page.hero or Hero()
+                for name, value in hero.items():
+                    setattr(page.hero, name, value)
+                page.hero.save()
+            page.save()
+        self._page_ids[page.slug] = page.pk
+
+    def _flush(self, spec: Spec) -> None:
+        pending = self._pending[spec.label]
+        if not pending:
+            return
+        rows = list(pending.values())
+        pending.clear()
+        stats = self.stats[spec.label]
+        try:
+            with transaction.atomic():
+                self._upsert(spec, [fields for _, fields in rows])
+            stats.imported += len(rows)
+        except DatabaseError:
+            written = []
+            for line_number, fields in rows:
+                try:
+                    with transaction.atomic():
+                        self._upsert(spec, [fields])
+                except DatabaseError as exc:
+                    self.on_error(line_number, f"database: {exc}")
+                    stats.errors += 1
+                else:
+                    written.append((line_number, fields))
+            stats.imported += len(written)
+            rows = written
+        if rows and spec.cache_namespace:
+            self._touched_namespaces.add(spec.cache_namespace)
+            for _, fields in rows:
+                self._paths |= revalidation.paths_for(spec.model(**fields))
+        if spec.model is PageSection:
+            self._touched_pages.update(fields["page"] for _, fields in rows)
+
+    def _upsert(self, spec: Spec, rows: List[Dict[str, Any]]) -> None:
+        if spec.model is PageSection:
+            objects = [PageSection(page_id=fields["page"], **{k: v for k, v in fields.items() if k != "page"}) for fields in rows]
+        else:
+            objects = [spec.model(**fields) for fields in rows]
+        spec.model.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=list(spec.key),
+            update_fields=spec.update_fields,
+        )
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from . import models
+
+
+@admin.register(models.LeadOutbox)
+class LeadOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("created_at", "updated_at", "delivered_at")
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected leads")
+    def requeue(self, request, queryset):  # noqa: ANN001
+        queryset.exclude(status=models.LeadOutbox.DELIVERED).update(
+            status=models.LeadOutbox.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
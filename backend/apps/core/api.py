@@ -1,10 +1,40 @@
-from rest_framework.response import Response
-from rest_framework.views import APIView
+import hmac
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.views.generic import View
 
-class HealthView(APIView):
-    authentication_classes: list = []
-    permission_classes: list = []
+from . import metrics
+from .outbox import abacklog
+from .zoho import get_client
+
+
+class HealthView(View):
+    async def get(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+        return JsonResponse({"status": "ok"})
+
+
+class ZohoHealthView(View):
+    """Breaker, rate limiter and outbox state for uptime checks and dashboards."""
+
+    async def get(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+        client = get_client()
+        health = await sync_to_async(client.health)()
+        health["outbox"] = await abacklog()
+        health["status"] = "degraded" if health["breaker"]["state"] != client.breaker.CLOSED else "ok"
+        return JsonResponse(health)
+
+
+class MetricsView(View):
+    """Request metrics of every worker in Prometheus' text format."""
 
     def get(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
-        return Response({"status": "ok"})
+        if settings.METRICS_TOKEN:
+            supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+                return HttpResponse(status=401)
+        return HttpResponse(
+            metrics.render(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = "apps.core"
     verbose_name = "Core"
+
+    def ready(self) -> None:
+        from .metrics import install_query_timer
+
+        connection_created.connect(install_query_timer, dispatch_uid="core.metrics.query_timer")
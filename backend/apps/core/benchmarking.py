@@ -0,0 +1,151 @@
+"""Dataset and request scenarios shared by ``benchmark_endpoints`` and the query budget tests."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from apps.content.models import BlogPost, Ebook, Page, PageSection, Service
+from apps.content.snapshots import refresh_snapshot
+
+DATASET_DEFAULTS = {"services": 20, "ebooks": 20, "posts": 200, "sections": 12}
+
+
+def add_dataset_arguments(parser) -> None:  # noqa: ANN001
+    parser.add_argument("--services", type=int, default=DATASET_DEFAULTS["services"])
+    parser.add_argument("--ebooks", type=int, default=DATASET_DEFAULTS["ebooks"])
+    parser.add_argument("--posts", type=int, default=DATASET_DEFAULTS["posts"])
+    parser.add_argument("--sections", type=int, default=DATASET_DEFAULTS["sections"], help="Sections per page.")
+
+
+def seed(services: int, ebooks: int, posts: int, sections: int) -> str:
+    """Create the synthetic dataset and a token user; returns the token key."""
+    now = timezone.now()
+    for slug, _ in Page.PAGE_CHOICES:
+        page = Page.objects.create(slug=slug, seo_title=f"{slug.title()} page")
+        PageSection.objects.bulk_create(
+            PageSection(page=page, order=order, heading=f"Section {order}", body=f"Synthetic copy for {slug} {order}.")
+            for order in range(sections)
+        )
+        refresh_snapshot(page.pk)
+    Service.objects.bulk_create(
+        Service(name=f"Service {n}", slug=f"service-{n}", description=f"Service {n} summary.", long_description="Details.")
+        for n in range(services)
+    )
+    Ebook.objects.bulk_create(
+        Ebook(title=f"Ebook {n}", slug=f"ebook-{n}", summary=f"Ebook {n} summary.", file=f"ebooks/ebook-{n}.pdf")
+        for n in range(ebooks)
+    )
+    BlogPost.objects.bulk_create(
+        BlogPost(
+            title=f"Post {n}",
+            slug=f"post-{n}",
+            excerpt=f"Excerpt {n}.",
+            content=f"Body of post {n}. " * 50,
+            published_at=now - timezone.timedelta(hours=n),
+            is_published=True,
+        )
+        for n in range(posts)
+    )
+    from apps.rag.indexing import reindex
+
+    reindex()
+    user = get_user_model().objects.create_user("benchmark", password=None)
+    return Token.objects.create(user=user).key
+
+
+def route_names(patterns=None, skip=("admin",)) -> set:  # noqa: ANN001
+    """URL names of the project's routes, leaving out the ``skip`` namespaces."""
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in skip:
+                names |= route_names(pattern.url_patterns, skip)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def uncovered_routes(scenarios: List[Dict[str, Any]]) -> set:
+    covered = {resolve(scenario["path"].split("?")[0]).url_name for scenario in scenarios}
+    return route_names() - covered
+
+
+def scenarios() -> List[Dict[str, Any]]:
+    """One entry per route; ``{n}`` in paths and bodies is replaced by the request number.
+
+    ``ok`` lists the expected statuses (default 200). Queries per request are
+    averaged over responses whose status is in ``measure`` (default ``ok``).
+    """
+    post = BlogPost.objects.filter(is_published=True).values_list("slug", flat=True).first() or "missing"
+    service = Service.objects.values_list("slug", flat=True).first() or "missing"
+    ebook = Ebook.objects.values_list("slug", flat=True).first() or "missing"
+    lead = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada{n}@example.com", "consent": True}
+    return [
+        {"name": "api-root", "path": "/api/"},
+        {"name": "page-detail", "path": "/api/pages/home/"},
+        {"name": "service-list", "path": "/api/services/"},
+        {"name": "service-detail", "path": f"/api/services/{service}/"},
+        {"name": "ebook-list", "path": "/api/ebooks/"},
+        {"name": "ebook-detail", "path": f"/api/ebooks/{ebook}/"},
+        {"name": "blog-post-list", "path": "/api/blog-posts/"},
+        {"name": "blog-post-detail", "path": f"/api/blog-posts/{post}/"},
+        {"name": "health", "path": "/api/health/"},
+        {"name": "zoho-health", "path": "/api/health/zoho/"},
+        {"name": "metrics", "path": "/api/metrics/"},
+        {
+            "name": "contact-form",
+            "method": "POST",
+            "path": "/api/forms/contact/",
+            "json": {**lead, "message": "Benchmark {n}"},
+            "ok": (202,),
+        },
+        {
+            "name": "ebook-form",
+            "method": "POST",
+            "path": "/api/forms/ebook/",
+            "json": {**lead, "ebook_slug": ebook},
+            "ok": (202,),
+        },
+        # Distinct prompts keep every preview out of the draft cache.
+        {"name": "rag-preview", "method": "POST", "path": "/api/rag/preview/", "json": {"page_slug": "home", "prompt": "Benchmark {n}"}},
+        {
+            "name": "rag-preview-stream",
+            "method": "POST",
+            "path": "/api/rag/preview/stream/",
+            "json": {"page_slug": "home", "prompt": "Benchmark {n}"},
+        },
+        # Concurrent publishes to one page are expected to lose some compare-and-swaps.
+        # How many lose varies from run to run, so queries are counted over the
+        # publishes that went through ("measure") and conflicts are left out.
+        {
+            "name": "rag-publish",
+            "method": "POST",
+            "path": "/api/rag/publish/",
+            "json": {"page_slug": "blog", "sections": [{"order": 0, "body": "Benchmark {n}"}]},
+            "ok": (202, 409),
+            "measure": (202,),
+        },
+        {"name": "rag-revisions", "path": "/api/rag/revisions/?page_slug=blog"},
+        {
+            "name": "rag-rollback",
+            "method": "POST",
+            "path": "/api/rag/rollback/",
+            "json": {"page_slug": "blog", "version": 1},
+            "ok": (202, 409),
+            "measure": (202,),
+        },
+    ]
+
+
+def fill(value: Any, n: int) -> Any:
+    if isinstance(value, str):
+        return value.replace("{n}", str(n))
+    if isinstance(value, dict):
+        return {key: fill(item, n) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, n) for item in value]
+    return value
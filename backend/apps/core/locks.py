@@ -0,0 +1,31 @@
+"""Cross-process locks built on Django's cache framework."""
+from __future__ import annotations
+
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.core.cache import cache
+
+
+@contextmanager
+def cache_lock(key: str, timeout: float = 30, wait: float = 10, poll_interval: float = 0.05) -> Iterator[bool]:
+    """Hold ``key`` in the default cache for the duration of the block.
+
+    ``cache.add`` is atomic on every shared backend, so only one thread or worker
+    holds the lock at a time. Yields ``True`` when the lock was acquired and
+    ``False`` when ``wait`` seconds passed without getting it; ``timeout`` bounds
+    how long a crashed holder can keep others out.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    acquired = cache.add(key, token, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
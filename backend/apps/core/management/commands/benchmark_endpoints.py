@@ -0,0 +1,226 @@
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import tempfile
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+
+from apps.core import benchmarking
+
+# Queries issued while handling the current request; set per request by the driver
+# and inherited by the threads Django runs sync code on.
+_queries: ContextVar[Optional[List[int]]] = ContextVar("benchmark_queries", default=None)
+
+
+def _count_query(execute, sql, params, many, context):  # noqa: ANN001, ANN202
+    counter = _queries.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def _instrument(sender, connection, **kwargs) -> None:  # noqa: ANN001, ANN003
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with synthetic content and drive every API route "
+        "through the ASGI app at each concurrency level, reporting p50/p95/p99 latency, "
+        "throughput and queries per request. With --baseline, fail when results regress "
+        "past the stored baseline JSON."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--concurrency", default="1,10", help="Comma-separated concurrency levels.")
+        parser.add_argument("--requests", type=int, default=100, help="Requests per route and concurrency level.")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per route and level; each reported figure is the median across runs.",
+        )
+        parser.add_argument("--routes", default="", help="Comma-separated route names to run (default: all).")
+        benchmarking.add_dataset_arguments(parser)
+        parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+        parser.add_argument("--save-baseline", help="Write the results to this path as the new baseline.")
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=1.0,
+            help="Allowed relative growth of p95 latency and drop in throughput.",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed growth of mean queries per request, in queries.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        levels = [int(level) for level in options["concurrency"].split(",")]
+        selected = {name for name in options["routes"].split(",") if name}
+        workdir = tempfile.TemporaryDirectory(prefix="benchmark-endpoints-")
+        database = connections["default"].settings_dict
+        if database["ENGINE"].endswith("sqlite3"):
+            # A shared in-memory SQLite database fails concurrent writers instead
+            # of making them wait, so use a file, and take the write lock up front
+            # so concurrent publishes queue rather than deadlock.
+            database.setdefault("TEST", {})["NAME"] = str(Path(workdir.name) / "benchmark.sqlite3")
+            database.setdefault("OPTIONS", {}).update(transaction_mode="IMMEDIATE", timeout=30)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        connection_created.connect(_instrument, dispatch_uid="benchmark-endpoints")
+        try:
+            # Drafts stream without the fake provider's pause so the route's own cost is measured;
+            # the forwarded proto satisfies SECURE_SSL_REDIRECT. Request metrics stay out of
+            # the host's METRICS_DIR.
+            with override_settings(
+                RAG_FAKE_TOKEN_DELAY=0,
+                DEBUG=False,
+                METRICS_DIR=str(Path(workdir.name) / "metrics"),
+                METRICS_TOKEN="",
+            ):
+                from apps.rag import providers
+
+                providers.get_provider.cache_clear()
+                token = benchmarking.seed(**{key: options[key] for key in benchmarking.DATASET_DEFAULTS})
+                scenarios = benchmarking.scenarios()
+                self._check_coverage(scenarios)
+                if selected:
+                    scenarios = [scenario for scenario in scenarios if scenario["name"] in selected]
+                results = asyncio.run(self._run_all(scenarios, levels, options["requests"], options["repeat"], token))
+                providers.get_provider.cache_clear()
+        finally:
+            connection_created.disconnect(dispatch_uid="benchmark-endpoints")
+            teardown_databases(old_config, verbosity=0)
+            workdir.cleanup()
+
+        report = {
+            "meta": {
+                "created": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+                "requests": options["requests"],
+                "repeat": options["repeat"],
+                "dataset": {key: options[key] for key in benchmarking.DATASET_DEFAULTS},
+            },
+            "results": results,
+        }
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        failures = [f"{key}: {count} unexpected responses" for key, count in self._errors(results)]
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())["results"]
+            failures += self._regressions(baseline, results, options)
+        if failures:
+            raise CommandError("Benchmark regressions:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("No regressions"))
+
+    def _check_coverage(self, scenarios) -> None:  # noqa: ANN001
+        missing = benchmarking.uncovered_routes(scenarios)
+        if missing:
+            self.stderr.write(f"Routes without a benchmark scenario: {', '.join(sorted(missing))}")
+
+    async def _run_all(self, scenarios, levels, requests: int, repeat: int, token: str) -> Dict[str, Any]:  # noqa: ANN001
+        from backend.asgi import application
+
+        self._numbers = itertools.count()
+        results = {}
+        headers = {"Authorization": f"Token {token}", "X-Forwarded-Proto": "https"}
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver", headers=headers) as client:
+            self.stdout.write(
+                f"{'route':<20} {'conc':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>7} {'errors':>6}"
+            )
+            for scenario in scenarios:
+                for level in levels:
+                    key = f"{scenario['name']}@{level}"
+                    runs = [await self._drive(client, scenario, level, requests) for _ in range(max(repeat, 1))]
+                    results[key] = result = {
+                        metric: statistics.median(run[metric] for run in runs) for metric in runs[0]
+                    }
+                    self.stdout.write(
+                        f"{scenario['name']:<20} {level:>4} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                        f"{result['p99_ms']:>8.2f} {result['rps']:>8.1f} {result['queries']:>7.2f} {result['errors']:>6}"
+                    )
+        return results
+
+    async def _drive(self, client: httpx.AsyncClient, scenario, concurrency: int, requests: int) -> Dict[str, Any]:  # noqa: ANN001
+        # Numbers keep counting across routes and levels so no request repeats an earlier one.
+        numbers = self._numbers
+        last = next(numbers) + requests
+        latencies: List[float] = []
+        queries: List[int] = []
+        errors = 0
+        ok = scenario.get("ok", (200,))
+        measure = scenario.get("measure", ok)
+
+        async def worker() -> None:
+            nonlocal errors
+            while (n := next(numbers)) < last:
+                counter = [0]
+                _queries.set(counter)
+                started = time.perf_counter()
+                response = await client.request(
+                    scenario.get("method", "GET"),
+                    benchmarking.fill(scenario["path"], n),
+                    json=benchmarking.fill(scenario["json"], n) if "json" in scenario else None,
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code in measure:
+                    queries.append(counter[0])
+                if response.status_code not in ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        return {
+            "p50_ms": round(_percentile(latencies, 50), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "p99_ms": round(_percentile(latencies, 99), 3),
+            "rps": round(requests / elapsed, 1),
+            "queries": round(statistics.mean(queries), 2) if queries else 0,
+            "max_queries": max(queries, default=0),
+            "errors": errors,
+        }
+
+    def _errors(self, results):  # noqa: ANN001, ANN202
+        return [(key, result["errors"]) for key, result in results.items() if result["errors"]]
+
+    def _regressions(self, baseline, results, options) -> List[str]:  # noqa: ANN001
+        tolerance = options["latency_tolerance"]
+        failures = []
+        for key, result in results.items():
+            expected = baseline.get(key)
+            if expected is None:
+                continue
+            # Sub-millisecond jitter on fast routes is not a regression.
+            if result["p95_ms"] > expected["p95_ms"] * (1 + tolerance) and result["p95_ms"] - expected["p95_ms"] > 1:
+                failures.append(f"{key}: p95 {result['p95_ms']:.2f} ms vs baseline {expected['p95_ms']:.2f} ms")
+            if result["rps"] < expected["rps"] / (1 + tolerance):
+                failures.append(f"{key}: {result['rps']:.1f} req/s vs baseline {expected['rps']:.1f} req/s")
+            if result["queries"] > expected["queries"] + options["query_tolerance"]:
+                failures.append(f"{key}: {result['queries']:.2f} queries/request vs baseline {expected['queries']:.2f}")
+        return failures
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import adrain, drain
+
+
+class Command(BaseCommand):
+    help = "Deliver queued form submissions to Zoho CRM."
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--once", action="store_true", help="Drain due leads and exit instead of polling.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Leads sent per Zoho call (max 100).")
+        parser.add_argument(
+            "--max-wait-ms",
+            type=int,
+            default=None,
+            help="Flush a partial batch once its oldest lead has waited this long.",
+        )
+        parser.add_argument("--interval", type=float, default=0.5, help="Seconds to sleep between polls.")
+        parser.add_argument(
+            "--async",
+            dest="use_async",
+            action="store_true",
+            help="Send each batch's Zoho calls concurrently over the async client.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        if options["use_async"]:
+            asyncio.run(self._poll_async(options))
+            return
+        while True:
+            result = drain(batch_size=options["batch_size"], max_wait_ms=self._max_wait_ms(options))
+            self._report(result)
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    async def _poll_async(self, options) -> None:  # noqa: ANN001
+        # One event loop for the whole run keeps the async client's connections alive.
+        while True:
+            result = await adrain(batch_size=options["batch_size"], max_wait_ms=self._max_wait_ms(options))
+            self._report(result)
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
+
+    def _max_wait_ms(self, options):  # noqa: ANN001, ANN202
+        # A one-off run flushes everything due instead of waiting for a full batch.
+        return 0 if options["once"] else options["max_wait_ms"]
+
+    def _report(self, result) -> None:  # noqa: ANN001
+        if result.processed:
+            self.stdout.write(
+                f"Delivered {result.delivered}, retrying {result.retried}, "
+                f"deferred {result.deferred}, dead-lettered {result.dead}"
+            )
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Send requests to a running server from a fixed number of concurrent clients and "
+        "report throughput, latency percentiles and status codes. Point it at the same "
+        "endpoint under the WSGI and ASGI servers to compare how many slow requests one "
+        "container keeps in flight."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--url", default="http://127.0.0.1:8080", help="Base URL of the server under test.")
+        parser.add_argument("--path", default="/api/health/")
+        parser.add_argument("--method", default="GET")
+        parser.add_argument("--body", default="", help="JSON request body.")
+        parser.add_argument("--token", default="", help="DRF token sent as 'Authorization: Token ...'.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=500, help="Total requests across all clients.")
+        parser.add_argument("--timeout", type=float, default=60)
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        if options["body"]:
+            try:
+                json.loads(options["body"])
+            except ValueError as exc:
+                raise CommandError(f"--body is not valid JSON: {exc}") from exc
+        latencies, statuses, elapsed = asyncio.run(self._run(options))
+        if not latencies:
+            raise CommandError(f"No request completed: {dict(statuses)}")
+        p50, p95, p99 = self._percentiles(latencies)
+        self.stdout.write(
+            f"{options['method']} {options['path']} x{len(latencies)} at concurrency {options['concurrency']}: "
+            f"{len(latencies) / elapsed:.1f} req/s, "
+            f"p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms, max {max(latencies) * 1000:.0f} ms"
+        )
+        self.stdout.write(f"Status codes: {dict(sorted(statuses.items(), key=str))}")
+
+    async def _run(self, options):  # noqa: ANN001, ANN202
+        headers = {"Content-Type": "application/json"}
+        if options["token"]:
+            headers["Authorization"] = f"Token {options['token']}"
+        remaining = options["requests"]
+        latencies, statuses = [], Counter()
+        limits = httpx.Limits(max_connections=options["concurrency"])
+
+        async with httpx.AsyncClient(
+            base_url=options["url"], headers=headers, limits=limits, timeout=options["timeout"]
+        ) as client:
+
+            async def worker() -> None:
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    started = time.perf_counter()
+                    try:
+                        # Reading the whole body includes streamed responses in the latency.
+                        response = await client.request(
+                            options["method"], options["path"], content=options["body"] or None
+                        )
+                    except httpx.HTTPError as exc:
+                        statuses[type(exc).__name__] += 1
+                        continue
+                    latencies.append(time.perf_counter() - started)
+                    statuses[response.status_code] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+            return latencies, statuses, time.perf_counter() - started
+
+    def _percentiles(self, latencies):  # noqa: ANN001, ANN202
+        if len(latencies) == 1:
+            return [latencies[0] * 1000] * 3
+        cuts = statistics.quantiles([latency * 1000 for latency in latencies], n=100, method="inclusive")
+        return cuts[49], cuts[94], cuts[98]
@@ -0,0 +1,342 @@
+"""Per-request timings and per-route latency histograms.
+
+``MetricsMiddleware`` opens a ``RequestTimings`` for every request in a context
+variable. Database queries (through an execute wrapper on every connection) and
+``span()`` blocks around serialization, Zoho calls and the RAG services add to
+it; the middleware then sends the totals in a ``Server-Timing`` header and folds
+them into this process's ``Registry``.
+
+Each worker writes its registry to ``METRICS_DIR`` at most every
+``METRICS_FLUSH_SECONDS`` and ``/api/metrics/`` merges the files of all workers
+in the container, so a scrape sees every worker whichever one serves it. A file
+is named after its worker's pid and start time, so a later process given the
+same pid neither overwrites it nor passes for its owner. Files left by exited
+workers are folded into ``archive.json`` so counters never go backwards when
+gunicorn recycles a worker. With ``METRICS_DIR`` empty only the serving process
+is reported.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[str, ...]
+Families = Dict[str, Dict[Labels, Any]]
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase (``db``, ``serialize``, ``zoho``, ``rag``) in one request."""
+
+    __slots__ = ("durations", "queries", "_open")
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self.queries = 0
+        self._open: set = set()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = []
+        for name, seconds in self.durations.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if name == "db":
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Add the block's wall time to the current request's ``name`` phase.
+
+    Does nothing outside a request. Nested or concurrent blocks of the same
+    phase count once, so e.g. a page serializer and its section serializers are
+    not added up twice.
+    """
+    timings = _current.get()
+    if timings is None or name in timings._open:
+        yield
+        return
+    timings._open.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+        timings._open.discard(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``span`` for sync functions."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _time_query(execute, sql, params, many, context):  # noqa: ANN001, ANN202
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.add("db", time.perf_counter() - started)
+
+
+def install_query_timer(sender, connection, **kwargs) -> None:  # noqa: ANN001, ANN003
+    """``connection_created`` receiver adding the query timer to new connections."""
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+class TimedSerializerMixin:
+    """Counts ``to_representation`` towards the request's ``serialize`` phase."""
+
+    def to_representation(self, instance):  # noqa: ANN001, ANN201
+        with span("serialize"):
+            return super().to_representation(instance)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """DRF's ``JSONRenderer`` with encoding counted as serialization."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):  # noqa: ANN001
+        with span("serialize"):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class Registry:
+    """This process's request counters, latency histograms and phase totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._families: Families = {}
+        self.next_flush = 0.0
+        self._owner: Optional[Tuple[int, str]] = None
+
+    def observe(self, route: str, method: str, status: int, seconds: float, timings: RequestTimings) -> None:
+        bucket = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            families = self._families
+            requests = families.setdefault("http_requests_total", {})
+            key = (route, method, str(status))
+            requests[key] = requests.get(key, 0) + 1
+
+            # Per-bucket (not cumulative) counts followed by the sum of observations.
+            histogram = families.setdefault("http_request_duration_seconds", {}).get((route, method))
+            if histogram is None:
+                histogram = families["http_request_duration_seconds"][(route, method)] = [0] * (len(BUCKETS) + 2)
+            histogram[bucket] += 1
+            histogram[-1] += seconds
+
+            phases = families.setdefault("http_request_phase_seconds_total", {})
+            for phase, phase_seconds in timings.durations.items():
+                phases[(route, phase)] = phases.get((route, phase), 0.0) + phase_seconds
+            queries = families.setdefault("http_request_db_queries_total", {})
+            queries[(route,)] = queries.get((route,), 0) + timings.queries
+
+    def snapshot(self) -> Dict[str, List[Any]]:
+        with self._lock:
+            return {
+                family: [[list(labels), list(value) if isinstance(value, list) else value] for labels, value in samples.items()]
+                for family, samples in self._families.items()
+            }
+
+    def flush(self) -> None:
+        directory = Path(settings.METRICS_DIR)
+        self.next_flush = time.monotonic() + settings.METRICS_FLUSH_SECONDS
+        directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        if self._owner is None or self._owner[0] != pid:
+            # Recomputed in each forked worker; the start time is read once per process.
+            self._owner = (pid, _started(pid) or uuid.uuid4().hex)
+        name = f"{pid}-{self._owner[1]}"
+        temporary = directory / f"{name}.{threading.get_ident()}.tmp"
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, directory / f"{name}.json")
+
+
+registry = Registry()
+
+
+def start() -> Tuple[RequestTimings, Token, float]:
+    timings = RequestTimings()
+    return timings, _current.set(timings), time.perf_counter()
+
+
+def finish(request, response, timings: RequestTimings, token: Token, started: float) -> None:  # noqa: ANN001
+    """Close the request's timings, record them and add the ``Server-Timing`` header."""
+    elapsed = time.perf_counter() - started
+    _current.reset(token)
+    match = getattr(request, "resolver_match", None)
+    route = (match.view_name if match else "") or "unmatched"
+    method = request.method if request.method in METHODS else "OTHER"
+    registry.observe(route, method, response.status_code, elapsed, timings)
+    if settings.METRICS_SERVER_TIMING:
+        # Streaming responses are timed up to their headers.
+        response["Server-Timing"] = timings.server_timing(elapsed)
+    if settings.METRICS_DIR and time.monotonic() >= registry.next_flush:
+        try:
+            registry.flush()
+        except OSError:
+            logger.exception("Could not write metrics to %s", settings.METRICS_DIR)
+
+
+def _merge(into: Families, snapshot: Dict[str, List[Any]]) -> None:
+    for family, samples in snapshot.items():
+        target = into.setdefault(family, {})
+        for labels, value in samples:
+            key = tuple(labels)
+            current_value = target.get(key)
+            if current_value is None:
+                target[key] = value
+            elif isinstance(value, list):
+                target[key] = [a + b for a, b in zip(current_value, value)]
+            else:
+                target[key] = current_value + value
+
+
+def _read(path: Path) -> Dict[str, List[Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        # Removed or archived by another worker since it was listed.
+        return {}
+
+
+def _started(pid: int) -> Optional[str]:
+    """Start time of ``pid`` in clock ticks since boot, or None where ``/proc`` is unavailable."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # The command name in parentheses may contain spaces; field 22 counts from the state after it.
+    return stat.rpartition(")")[2].split()[19]
+
+
+def _alive(pid: int, started: str) -> bool:
+    """Whether the process that wrote a file as ``pid`` with ``started`` still runs."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    current = _started(pid)
+    # A random id (no /proc when the file was written), or none in a file from an
+    # older release, can only be checked by pid.
+    return current is None or not started.isdigit() or current == started
+
+
+def _owner_exited(path: Path) -> bool:
+    pid, _, started = path.stem.partition("-")
+    return pid.isdigit() and not _alive(int(pid), started)
+
+
+def _archive_exited(directory: Path) -> None:
+    exited = [path for path in directory.glob("*.json") if _owner_exited(path)]
+    if not exited:
+        return
+    with open(directory / "archive.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = directory / "archive.json"
+        archive: Families = {}
+        _merge(archive, _read(archive_path))
+        exited = [path for path in exited if path.exists()]
+        for path in exited:
+            _merge(archive, _read(path))
+        temporary = archive_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({
+            family: [[list(labels), value] for labels, value in samples.items()]
+            for family, samples in archive.items()
+        }))
+        os.replace(temporary, archive_path)
+        for path in exited:
+            path.unlink(missing_ok=True)
+
+
+def collect() -> Families:
+    """Merged metrics of every worker sharing ``METRICS_DIR``, or of this process."""
+    families: Families = {}
+    if not settings.METRICS_DIR:
+        _merge(families, registry.snapshot())
+        return families
+    registry.flush()
+    directory = Path(settings.METRICS_DIR)
+    _archive_exited(directory)
+    for path in directory.glob("*.json"):
+        _merge(families, _read(path))
+    return families
+
+
+def _labels(names: Tuple[str, ...], values: Labels, **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def render(families: Families) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+
+    def counter(family: str, help_text: str, names: Tuple[str, ...]) -> None:
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} counter")
+        for labels, value in sorted(families.get(family, {}).items()):
+            lines.append(f"{family}{_labels(names, labels)} {value}")
+
+    counter("http_requests_total", "Requests by URL name, method and status.", ("route", "method", "status"))
+
+    family = "http_request_duration_seconds"
+    lines.append(f"# HELP {family} Request latency by URL name and method.")
+    lines.append(f"# TYPE {family} histogram")
+    for labels, histogram in sorted(families.get(family, {}).items()):
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), histogram[:-1]):
+            cumulative += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            lines.append(f"{family}_bucket{_labels(('route', 'method'), labels, le=le)} {cumulative}")
+        lines.append(f"{family}_sum{_labels(('route', 'method'), labels)} {histogram[-1]}")
+        lines.append(f"{family}_count{_labels(('route', 'method'), labels)} {cumulative}")
+
+    counter(
+        "http_request_phase_seconds_total",
+        "Time spent in database queries, serialization, Zoho calls and RAG services, by URL name.",
+        ("route", "phase"),
+    )
+    counter("http_request_db_queries_total", "Database queries by URL name.", ("route",))
+    return "\n".join(lines) + "\n"
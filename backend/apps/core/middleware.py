@@ -0,0 +1,70 @@
+"""Project middleware; all of it async-capable so ASGI requests stay off threads."""
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that lets async requests through without a thread hop.
+
+    WhiteNoise is sync-only, and one sync middleware makes Django run the whole
+    chain below it, views included, on a thread for every request. Here only
+    requests for static files reach WhiteNoise's (sync) file serving.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):  # noqa: ANN001
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):  # noqa: ANN001, ANN204
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):  # noqa: ANN001, ANN204
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class MetricsMiddleware:
+    """Times each request and its phases; see ``apps.core.metrics``.
+
+    Goes first in ``MIDDLEWARE`` so the total includes every other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):  # noqa: ANN001
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):  # noqa: ANN001, ANN204
+        if self.async_mode:
+            return self.__acall__(request)
+        timings, token, started = metrics.start()
+        response = self.get_response(request)
+        metrics.finish(request, response, timings, token, started)
+        return response
+
+    async def __acall__(self, request):  # noqa: ANN001, ANN204
+        timings, token, started = metrics.start()
+        response = await self.get_response(request)
+        metrics.finish(request, response, timings, token, started)
+        return response
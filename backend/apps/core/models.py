@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils import timezone
+
+
+class LeadOutbox(models.Model):
+    """Form submission waiting to be delivered to Zoho CRM."""
+
+    CONTACT = "contact"
+    EBOOK = "ebook"
+
+    KIND_CHOICES = [
+        (CONTACT, "Contact"),
+        (EBOOK, "Ebook download"),
+    ]
+
+    PENDING = "pending"
+    DELIVERED = "delivered"
+    DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (DELIVERED, "Delivered"),
+        (DEAD, "Dead letter"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    # Doubles as a lease: claimed rows are pushed forward so a crashed worker's
+    # batch becomes eligible again once the lease runs out.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    zoho_id = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"], name="core_outbox_due_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.kind} lead #{self.pk} ({self.status})"
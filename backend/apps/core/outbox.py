@@ -0,0 +1,223 @@
+"""Durable outbox for leads bound for Zoho CRM.
+
+Form views only insert a row here; ``drain`` (run by the ``drain_lead_outbox``
+management command) delivers due rows through Zoho's multi-record insert,
+retrying with exponential backoff and dead-lettering rows that keep failing.
+While the Zoho circuit breaker is open rows simply stay queued.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import LeadOutbox
+from .resilience import CircuitOpenError, RateLimitExceeded
+from .zoho import MAX_RECORDS_PER_CALL, acreate_leads, create_leads, get_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DrainResult:
+    delivered: int = 0
+    retried: int = 0
+    dead: int = 0
+    deferred: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.delivered + self.retried + self.dead + self.deferred
+
+
+def backlog() -> Dict[str, int]:
+    counts = dict(LeadOutbox.objects.values_list("status").annotate(total=Count("id")))
+    return {status: counts.get(status, 0) for status, _ in LeadOutbox.STATUS_CHOICES}
+
+
+async def abacklog() -> Dict[str, int]:
+    counts = {status: total async for status, total in LeadOutbox.objects.values_list("status").annotate(total=Count("id"))}
+    return {status: counts.get(status, 0) for status, _ in LeadOutbox.STATUS_CHOICES}
+
+
+def enqueue_lead(kind: str, payload: Dict[str, Any]) -> LeadOutbox:
+    return LeadOutbox.objects.create(kind=kind, payload=payload)
+
+
+async def aenqueue_lead(kind: str, payload: Dict[str, Any]) -> LeadOutbox:
+    return await LeadOutbox.objects.acreate(kind=kind, payload=payload)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    base = settings.LEAD_OUTBOX_BACKOFF_SECONDS
+    delay = min(base * 2 ** max(attempts - 1, 0), settings.LEAD_OUTBOX_MAX_BACKOFF_SECONDS)
+    # Jitter keeps a recovering Zoho from being hit by the whole backlog at once.
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(limit: int) -> List[LeadOutbox]:
+    """Lease up to ``limit`` due rows; concurrent workers skip each other's rows."""
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            LeadOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=LeadOutbox.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:limit]
+        )
+        if entries:
+            LeadOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                next_attempt_at=now + timedelta(seconds=settings.LEAD_OUTBOX_LEASE_SECONDS)
+            )
+    return entries
+
+
+_OUTCOME_FIELDS = ["status", "attempts", "zoho_id", "last_error", "next_attempt_at", "delivered_at", "updated_at"]
+
+
+def _apply_outcome(entry: LeadOutbox, ok: bool, detail: str, now: datetime) -> None:
+    entry.attempts += 1
+    entry.updated_at = now
+    if ok:
+        entry.status = LeadOutbox.DELIVERED
+        entry.zoho_id = detail
+        entry.last_error = ""
+        entry.delivered_at = now
+    elif entry.attempts >= settings.LEAD_OUTBOX_MAX_ATTEMPTS:
+        entry.status = LeadOutbox.DEAD
+        entry.last_error = detail[:2000]
+        logger.error("Lead outbox entry %s dead-lettered after %s attempts: %s", entry.pk, entry.attempts, detail)
+    else:
+        entry.last_error = detail[:2000]
+        entry.next_attempt_at = now + backoff_delay(entry.attempts)
+
+
+def _parse_record(record: Dict[str, Any]) -> Tuple[bool, str]:
+    if record.get("status") == "success":
+        return True, str(record.get("details", {}).get("id", ""))
+    return False, f"{record.get('code')}: {record.get('message')}"
+
+
+def _defer(entries: List[LeadOutbox], retry_after: float) -> None:
+    """Push rows back without spending an attempt while Zoho is known to be unavailable."""
+    LeadOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+        next_attempt_at=timezone.now() + timedelta(seconds=max(retry_after, 1)),
+        updated_at=timezone.now(),
+    )
+
+
+def _record_outcomes(entries: List[LeadOutbox], outcomes: List[Tuple[bool, str]], result: DrainResult) -> None:
+    now = timezone.now()
+    for entry, (ok, detail) in zip(entries, outcomes):
+        _apply_outcome(entry, ok, detail, now)
+        if entry.status == LeadOutbox.DELIVERED:
+            result.delivered += 1
+        elif entry.status == LeadOutbox.DEAD:
+            result.dead += 1
+        else:
+            result.retried += 1
+    LeadOutbox.objects.bulk_update(entries, _OUTCOME_FIELDS)
+
+
+def deliver_batch(entries: List[LeadOutbox], result: DrainResult) -> None:
+    """Send ``entries`` in one Zoho call and record each row's own outcome."""
+    try:
+        outcomes = [_parse_record(record) for record in create_leads([entry.payload for entry in entries])]
+    except (CircuitOpenError, RateLimitExceeded) as exc:
+        logger.info("Deferring %s leads: %s", len(entries), exc)
+        _defer(entries, exc.retry_after)
+        result.deferred += len(entries)
+        return
+    except (requests.RequestException, RuntimeError, ValueError) as exc:
+        outcomes = [(False, f"{type(exc).__name__}: {exc}")] * len(entries)
+    _record_outcomes(entries, outcomes, result)
+
+
+async def adeliver_batch(entries: List[LeadOutbox], result: DrainResult) -> None:
+    """``deliver_batch`` over the async Zoho client."""
+    try:
+        outcomes = [_parse_record(record) for record in await acreate_leads([entry.payload for entry in entries])]
+    except (CircuitOpenError, RateLimitExceeded) as exc:
+        logger.info("Deferring %s leads: %s", len(entries), exc)
+        await sync_to_async(_defer)(entries, exc.retry_after)
+        result.deferred += len(entries)
+        return
+    except (httpx.HTTPError, RuntimeError, ValueError) as exc:
+        outcomes = [(False, f"{type(exc).__name__}: {exc}")] * len(entries)
+    await sync_to_async(_record_outcomes)(entries, outcomes, result)
+
+
+def batch_ready(batch_size: int, max_wait: timedelta) -> bool:
+    """A batch is flushed once it is full or its oldest lead has waited ``max_wait``."""
+    now = timezone.now()
+    due = LeadOutbox.objects.filter(status=LeadOutbox.PENDING, next_attempt_at__lte=now)
+    oldest = due.order_by("next_attempt_at").values_list("next_attempt_at", flat=True).first()
+    if oldest is None:
+        return False
+    return oldest <= now - max_wait or due[:batch_size].count() >= batch_size
+
+
+def drain(batch_size: Optional[int] = None, max_wait_ms: Optional[int] = None) -> DrainResult:
+    """Deliver due rows in batches of up to ``batch_size``.
+
+    Rows that have never been attempted share one multi-record call; rows that
+    already failed are retried one per call so a single bad record cannot keep
+    sinking the rest of its batch. ``max_wait_ms=0`` flushes whatever is due.
+    """
+    result = DrainResult()
+    limit = min(batch_size or settings.LEAD_OUTBOX_BATCH_SIZE, MAX_RECORDS_PER_CALL)
+    wait_ms = settings.LEAD_OUTBOX_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms
+    max_wait = timedelta(milliseconds=wait_ms)
+    breaker = get_client().breaker
+    while batch_ready(limit, max_wait):
+        if breaker.state() == breaker.OPEN:
+            break
+        entries = claim_batch(limit)
+        if not entries:
+            break
+        fresh = [entry for entry in entries if entry.attempts == 0]
+        retries = [entry for entry in entries if entry.attempts > 0]
+        if fresh:
+            deliver_batch(fresh, result)
+        for entry in retries:
+            deliver_batch([entry], result)
+        if result.deferred:
+            break
+    return result
+
+
+async def adrain(batch_size: Optional[int] = None, max_wait_ms: Optional[int] = None) -> DrainResult:
+    """``drain`` that sends a claimed batch's calls concurrently.
+
+    The fresh batch and every retried row go out at once instead of one after
+    another, so a slow Zoho costs one round trip per claimed batch.
+    """
+    result = DrainResult()
+    limit = min(batch_size or settings.LEAD_OUTBOX_BATCH_SIZE, MAX_RECORDS_PER_CALL)
+    wait_ms = settings.LEAD_OUTBOX_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms
+    max_wait = timedelta(milliseconds=wait_ms)
+    breaker = get_client().breaker
+    while await sync_to_async(batch_ready)(limit, max_wait):
+        if await sync_to_async(breaker.state)() == breaker.OPEN:
+            break
+        entries = await sync_to_async(claim_batch)(limit)
+        if not entries:
+            break
+        fresh = [entry for entry in entries if entry.attempts == 0]
+        calls = [[entry] for entry in entries if entry.attempts > 0]
+        if fresh:
+            calls.insert(0, fresh)
+        await asyncio.gather(*(adeliver_batch(call, result) for call in calls))
+        if result.deferred:
+            break
+    return result
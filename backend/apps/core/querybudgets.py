@@ -0,0 +1,116 @@
+"""Query budgets per URL name and detection of repeated (N+1) queries.
+
+``QUERY_BUDGETS`` holds the most queries (savepoints aside) one request to
+each route may issue on the benchmark dataset with a cold cache, on-commit work
+included. ``apps/core/tests.py`` requests every API route and every admin
+changelist and change form, and fails when one is missing a budget, goes over
+it, or runs the same statement ``REPEAT_THRESHOLD`` times, which is how a lazy
+load inside a loop shows up.
+"""
+from __future__ import annotations
+
+import re
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from django.conf import settings
+
+QUERY_BUDGETS: Dict[str, int] = {
+    # API, authenticated with a DRF token (one query).
+    "api-root": 1,
+    "page-detail": 3,
+    "service-list": 3,
+    "service-detail": 3,
+    "ebook-list": 3,
+    "ebook-detail": 3,
+    "blog-post-list": 3,
+    "blog-post-detail": 3,
+    "health": 0,
+    "zoho-health": 1,
+    "metrics": 0,
+    "contact-form": 1,
+    "ebook-form": 1,
+    "rag-preview": 7,
+    "rag-preview-stream": 6,
+    "rag-publish": 13,
+    "rag-revisions": 2,
+    "rag-rollback": 14,
+    # Admin, as a superuser with a database session (two queries).
+    "admin:content_blogpost_changelist": 5,
+    "admin:content_blogpost_change": 4,
+    "admin:content_ebook_changelist": 5,
+    "admin:content_ebook_change": 4,
+    "admin:content_hero_changelist": 5,
+    "admin:content_page_changelist": 5,
+    "admin:content_page_change": 6,
+    "admin:content_pagerevision_changelist": 6,
+    "admin:content_pagerevision_change": 5,
+    "admin:content_service_changelist": 5,
+    "admin:content_service_change": 4,
+    "admin:core_leadoutbox_changelist": 5,
+    "admin:core_leadoutbox_change": 4,
+}
+
+# Occurrences of one statement in a request that count as an N+1 pattern.
+REPEAT_THRESHOLD = 3
+
+_IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+# Execute wrappers sit between the caller and the database; their frames say nothing.
+_WRAPPER_FILES = {str(Path(__file__).resolve()), str(Path(__file__).resolve().with_name("metrics.py"))}
+
+
+def _project_frames() -> List[traceback.FrameSummary]:
+    base = str(settings.BASE_DIR)
+    return [
+        frame
+        for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base) and "site-packages" not in frame.filename and frame.filename not in _WRAPPER_FILES
+    ]
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    stack: List[traceback.FrameSummary] = field(repr=False)
+
+    @property
+    def origin(self) -> str:
+        """The innermost project frame that led to the query."""
+        if not self.stack:
+            return "<outside the project>"
+        frame = self.stack[-1]
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class QueryRecorder:
+    """Execute wrapper keeping each statement with the project frames that issued it.
+
+    Install with ``connection.execute_wrapper(recorder)``.
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[RecordedQuery] = []
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: ANN001, ANN204
+        self.queries.append(RecordedQuery(sql, _project_frames()))
+        return execute(sql, params, many, context)
+
+    @property
+    def statements(self) -> List[RecordedQuery]:
+        """Queries that count against a budget: everything but savepoint control.
+
+        Savepoints depend on how deeply the caller's transaction is nested (every
+        ``atomic`` block is one inside a test case), not on the route's work.
+        """
+        return [query for query in self.queries if not query.sql.startswith(_TRANSACTION_CONTROL)]
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> Dict[str, List[RecordedQuery]]:
+        """Statements run at least ``threshold`` times, ignoring ``IN`` list lengths and savepoints."""
+        groups: Dict[str, List[RecordedQuery]] = defaultdict(list)
+        for query in self.statements:
+            groups[_IN_LIST.sub("(...)", query.sql)].append(query)
+        return {sql: queries for sql, queries in groups.items() if len(queries) >= threshold}
@@ -0,0 +1,141 @@
+"""Rate limiting and circuit breaking for outbound calls.
+
+Both primitives keep their state in Django's cache so every thread and worker
+sharing the cache backend sees the same quota and the same breaker.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict
+
+from django.core.cache import cache
+
+from .locks import cache_lock
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class RateLimitExceeded(RuntimeError):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Rate limit '{name}' exhausted; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate_per_minute`` and holding at most ``capacity`` tokens."""
+
+    def __init__(self, name: str, rate_per_minute: float, capacity: int) -> None:
+        self.name = name
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity
+        self.state_key = f"ratelimit:{name}:state"
+        self.lock_key = f"ratelimit:{name}:lock"
+
+    def _refill(self, now: float) -> Dict[str, float]:
+        state = cache.get(self.state_key) or {"tokens": float(self.capacity), "updated": now}
+        elapsed = max(now - state["updated"], 0)
+        return {"tokens": min(self.capacity, state["tokens"] + elapsed * self.rate), "updated": now}
+
+    def try_acquire(self) -> float:
+        """Take one token; returns 0 on success or the seconds until one is available."""
+        with cache_lock(self.lock_key, timeout=5, wait=1, poll_interval=0.005) as acquired:
+            if not acquired:
+                return 0.1
+            state = self._refill(time.time())
+            wait = 0.0
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+            else:
+                wait = (1 - state["tokens"]) / self.rate
+            cache.set(self.state_key, state, None)
+            return wait
+
+    def acquire(self, wait: float = 0) -> None:
+        """Block up to ``wait`` seconds for a token, raising ``RateLimitExceeded`` otherwise."""
+        deadline = time.monotonic() + wait
+        while True:
+            retry_after = self.try_acquire()
+            if not retry_after:
+                return
+            remaining = deadline - time.monotonic()
+            if retry_after > remaining:
+                raise RateLimitExceeded(self.name, retry_after)
+            time.sleep(retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self._refill(time.time())
+        return {
+            "tokens": round(state["tokens"], 2),
+            "capacity": self.capacity,
+            "rate_per_minute": self.rate * 60,
+        }
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call fails fast with ``CircuitOpenError``. After
+    ``reset_timeout`` seconds the breaker is half-open: a single caller across
+    all workers is let through as a probe, and its result closes or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures_key = f"breaker:{name}:failures"
+        self.open_key = f"breaker:{name}:open_until"
+        self.probe_key = f"breaker:{name}:probe"
+
+    def state(self) -> str:
+        if cache.get(self.open_key):
+            return self.OPEN
+        if (cache.get(self.failures_key) or 0) >= self.failure_threshold:
+            return self.HALF_OPEN
+        return self.CLOSED
+
+    def retry_after(self) -> float:
+        open_until = cache.get(self.open_key)
+        return max(open_until - time.time(), 0) if open_until else 0.0
+
+    def before_call(self) -> bool:
+        """Let a call through or raise ``CircuitOpenError``; True when the call is the half-open probe."""
+        state = self.state()
+        if state == self.OPEN:
+            raise CircuitOpenError(self.name, self.retry_after())
+        if state == self.HALF_OPEN and not cache.add(self.probe_key, 1, self.reset_timeout):
+            raise CircuitOpenError(self.name, self.reset_timeout)
+        return state == self.HALF_OPEN
+
+    def release_probe(self) -> None:
+        """Give up the probe slot taken by ``before_call`` without having made the call."""
+        cache.delete(self.probe_key)
+
+    def record_success(self) -> None:
+        cache.delete_many([self.failures_key, self.probe_key])
+
+    def record_failure(self) -> None:
+        cache.add(self.failures_key, 0, None)
+        failures = cache.incr(self.failures_key)
+        if failures >= self.failure_threshold:
+            cache.set(self.open_key, time.time() + self.reset_timeout, self.reset_timeout)
+            cache.delete(self.probe_key)
+            logger.warning("Circuit '%s' opened after %s consecutive failures", self.name, failures)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state(),
+            "failures": cache.get(self.failures_key) or 0,
+            "retry_after": round(self.retry_after(), 1),
+        }
@@ -5,7 +5,9 @@ from typing import Any, Dict
 from django.conf import settings
 
 from .forms import ContactForm, EbookDownloadForm, SubmissionContext
-from .zoho import create_lead
+from .models import LeadOutbox
+from .outbox import aenqueue_lead, enqueue_lead
+from .zoho import acreate_lead, create_lead
 
 
 def _base_payload(cleaned_data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
@@ -29,7 +31,21 @@ def _base_payload(cleaned_data: Dict[str, Any], context: SubmissionContext) -> D
     return payload
 
 
-def submit_contact(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+def _queue_lead(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    if settings.ENABLE_MOCKS:
+        return create_lead(payload)
+    entry = enqueue_lead(kind, payload)
+    return {"id": entry.pk, "status": "queued"}
+
+
+async def _aqueue_lead(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    if settings.ENABLE_MOCKS:
+        return await acreate_lead(payload)
+    entry = await aenqueue_lead(kind, payload)
+    return {"id": entry.pk, "status": "queued"}
+
+
+def _contact_payload(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
     form = ContactForm(data)
     form.full_clean()
     if not form.is_valid():
@@ -41,10 +57,10 @@ def submit_contact(data: Dict[str, Any], context: SubmissionContext) -> Dict[str
         "Description": form.cleaned_data.get("message"),
         "GDPR_Consent": "Granted" if form.cleaned_data["consent"] else "Denied",
     })
-    return create_lead(payload)
+    return payload
 
 
-def submit_ebook_download(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+def _ebook_payload(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
     form = EbookDownloadForm(data)
     form.full_clean()
     if not form.is_valid():
@@ -55,4 +71,20 @@ def submit_ebook_download(data: Dict[str, Any], context: SubmissionContext) -> D
         "GDPR_Consent": "Granted" if form.cleaned_data["consent"] else "Denied",
         "Description": f"Requested ebook: {form.cleaned_data['ebook_slug']}",
     })
-    return create_lead(payload)
+    return payload
+
+
+def submit_contact(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+    return _queue_lead(LeadOutbox.CONTACT, _contact_payload(data, context))
+
+
+def submit_ebook_download(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+    return _queue_lead(LeadOutbox.EBOOK, _ebook_payload(data, context))
+
+
+async def asubmit_contact(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+    return await _aqueue_lead(LeadOutbox.CONTACT, _contact_payload(data, context))
+
+
+async def asubmit_ebook_download(data: Dict[str, Any], context: SubmissionContext) -> Dict[str, Any]:
+    return await _aqueue_lead(LeadOutbox.EBOOK, _ebook_payload(data, context))
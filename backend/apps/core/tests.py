@@ -0,0 +1,361 @@
+import json
+import os
+import tempfile
+import threading
+import traceback
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from apps.content.models import Page
+from apps.rag.services import publish_draft
+
+from . import benchmarking, metrics, outbox, zoho
+from .models import LeadOutbox
+from .outbox import DrainResult, enqueue_lead
+from .querybudgets import QUERY_BUDGETS, QueryRecorder
+from .resilience import CircuitBreaker, CircuitOpenError, RateLimitExceeded, TokenBucket
+
+
+@override_settings(RAG_FAKE_TOKEN_DELAY=0, DEBUG=False, METRICS_DIR="", METRICS_TOKEN="")
+class QueryBudgetTests(TestCase):
+    """Every API route and project admin view stays within its ``QUERY_BUDGETS`` entry, without N+1 patterns.
+
+    Each route is requested once on the benchmark dataset with a cold cache.
+    Failures list the offending queries with the project frames that issued them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):  # noqa: ANN206
+        cls.token = benchmarking.seed(**benchmarking.DATASET_DEFAULTS)
+        # Rows for the admin change views the API scenarios would otherwise create.
+        publish_draft(Page.BLOG, [{"order": 0, "body": "Budget check"}])
+        enqueue_lead(LeadOutbox.CONTACT, {"email": "budget@example.com"})
+        cls.admin_user = get_user_model().objects.create_superuser("budget-admin", "budget-admin@example.com", None)
+
+    def record(self, client: Client, method: str, path: str, **kwargs: Any) -> QueryRecorder:
+        # Measured cold so cached responses cannot hide the queries behind them.
+        cache.clear()
+        recorder = QueryRecorder()
+        # On-commit work (snapshot and index refreshes) is part of the request's cost.
+        with connection.execute_wrapper(recorder), self.captureOnCommitCallbacks(execute=True):
+            response = client.generic(method, path, secure=True, **kwargs)
+        if response.streaming:
+            # Streamed bodies run their queries while being consumed; the async
+            # stream is drained synchronously here on purpose.
+            with connection.execute_wrapper(recorder), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                b"".join(response)
+        self.last_status = response.status_code
+        return recorder
+
+    def assertWithinBudget(self, name: str, recorder: QueryRecorder) -> None:  # noqa: N802
+        budget = QUERY_BUDGETS.get(name)
+        count = len(recorder.statements)
+        self.assertIsNotNone(budget, f"{name}: no query budget in apps/core/querybudgets.py ({count} queries now)")
+        self.assertLessEqual(count, budget, _overrun(name, recorder, budget))
+        repeated = recorder.repeated()
+        self.assertFalse(repeated, "\n\n".join(_repeats(name, sql, queries) for sql, queries in repeated.items()))
+
+    def test_api_routes(self) -> None:
+        client = Client(HTTP_AUTHORIZATION=f"Token {self.token}")
+        for scenario in benchmarking.scenarios():
+            with self.subTest(route=scenario["name"]):
+                body = benchmarking.fill(scenario.get("json"), 0)
+                recorder = self.record(
+                    client,
+                    scenario.get("method", "GET"),
+                    benchmarking.fill(scenario["path"], 0),
+                    **({"data": json.dumps(body), "content_type": "application/json"} if body is not None else {}),
+                )
+                self.assertIn(self.last_status, scenario.get("ok", (200,)))
+                self.assertWithinBudget(scenario["name"], recorder)
+
+    def test_admin_views(self) -> None:
+        client = Client()
+        client.force_login(self.admin_user)
+        for model in _project_admin_models():
+            opts = model._meta
+            paths = [reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")]
+            first = model._default_manager.order_by("pk").values_list("pk", flat=True).first()
+            if first is not None:
+                paths.append(reverse(f"admin:{opts.app_label}_{opts.model_name}_change", args=[first]))
+            for path in paths:
+                match = resolve(path)
+                name = f"{match.namespace}:{match.url_name}"
+                with self.subTest(route=name):
+                    recorder = self.record(client, "GET", path)
+                    self.assertEqual(self.last_status, 200)
+                    self.assertWithinBudget(name, recorder)
+
+    def test_budgets_name_existing_routes(self) -> None:
+        admin_views = {
+            f"admin:{model._meta.app_label}_{model._meta.model_name}_{view}"
+            for model in _project_admin_models()
+            for view in ("changelist", "change")
+        }
+        stale = set(QUERY_BUDGETS) - benchmarking.route_names() - admin_views
+        self.assertFalse(stale, f"Budgets for routes that no longer exist: {sorted(stale)}")
+
+
+@override_settings(ENABLE_MOCKS=False, LEAD_OUTBOX_MAX_ATTEMPTS=2)
+class LeadDeliveryTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def assertDeadLettered(self, entry: LeadOutbox, error: str) -> None:  # noqa: N802
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), (LeadOutbox.DEAD, 2))
+        self.assertIn(error, entry.last_error)
+
+    def test_token_error_body_fails_the_attempt(self) -> None:
+        entry = enqueue_lead(LeadOutbox.CONTACT, {"Email": "lead@example.com"})
+        token_error = mock.patch.object(zoho, "_request_access_token", return_value={"error": "invalid_code"})
+        with token_error, self.assertLogs(outbox.logger, "ERROR"):
+            for _ in range(2):
+                outbox.deliver_batch([entry], DrainResult())
+        self.assertDeadLettered(entry, "ZohoAuthError: Zoho token refresh failed: invalid_code")
+
+    async def test_token_error_body_fails_the_async_attempt(self) -> None:
+        entry = await outbox.aenqueue_lead(LeadOutbox.CONTACT, {"Email": "lead@example.com"})
+        token_error = mock.patch.object(zoho, "_request_access_token", return_value={"error": "invalid_code"})
+        with token_error, self.assertLogs(outbox.logger, "ERROR"):
+            for _ in range(2):
+                await outbox.adeliver_batch([entry], DrainResult())
+        await sync_to_async(self.assertDeadLettered)(entry, "invalid_code")
+
+
+    def zoho_answers(self, status: int, body: Any):  # noqa: ANN201
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode()
+        token = mock.patch.object(zoho.token_provider, "get_token", return_value="token")
+        token.start()
+        self.addCleanup(token.stop)
+        return mock.patch.object(zoho, "_post_leads", return_value=response)
+
+    def test_non_object_body_fails_the_attempt(self) -> None:
+        for body in ([], None):
+            with self.subTest(body=body):
+                entry = enqueue_lead(LeadOutbox.CONTACT, {"Email": "lead@example.com"})
+                with self.zoho_answers(200, body), self.assertLogs(outbox.logger, "ERROR"):
+                    for _ in range(2):
+                        outbox.deliver_batch([entry], DrainResult())
+                self.assertDeadLettered(entry, "ValueError: Unexpected Zoho response")
+
+    def test_rejected_single_lead_raises(self) -> None:
+        rejected = {"code": "INVALID_DATA", "details": {}, "message": "invalid data", "status": "error"}
+        with self.zoho_answers(400, {"data": [rejected]}):
+            with self.assertRaises(zoho.ZohoRecordError) as raised:
+                zoho.create_lead({"Email": "lead@example.com"})
+        self.assertEqual(raised.exception.record, rejected)
+
+
+class ResilienceTests(SimpleTestCase):
+    """Breaker and limiter state, on a clock the test moves by hand."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.now = 1_000_000.0
+        # The cache expires keys on the same clock.
+        clock = mock.patch("time.time", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+
+    def test_breaker_opens_after_consecutive_failures(self) -> None:
+        for _ in range(2):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+        with self.assertLogs("apps.core.resilience", "WARNING"):
+            for _ in range(3):
+                self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.before_call()
+        self.assertEqual(raised.exception.retry_after, 60)
+
+    def test_half_open_breaker_lets_one_probe_through(self) -> None:
+        with self.assertLogs("apps.core.resilience", "WARNING"):
+            for _ in range(3):
+                self.breaker.record_failure()
+        self.now += 61
+        self.assertEqual(self.breaker.state(), CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.before_call())
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+        self.assertFalse(self.breaker.before_call())
+
+    def test_failed_probe_reopens_the_breaker(self) -> None:
+        with self.assertLogs("apps.core.resilience", "WARNING") as logs:
+            for _ in range(3):
+                self.breaker.record_failure()
+            self.now += 61
+            self.assertTrue(self.breaker.before_call())
+            self.breaker.record_failure()
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(self.breaker.state(), CircuitBreaker.OPEN)
+
+    def test_bucket_allows_a_burst_then_refills_at_its_rate(self) -> None:
+        bucket = TokenBucket("test", rate_per_minute=60, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertAlmostEqual(bucket.try_acquire(), 1)
+        with self.assertRaises(RateLimitExceeded) as raised:
+            bucket.acquire(wait=0.5)
+        self.assertAlmostEqual(raised.exception.retry_after, 1)
+        self.now += 2
+        bucket.acquire()
+        bucket.acquire()
+        self.assertGreater(bucket.try_acquire(), 0)
+
+    @override_settings(ZOHO_RATE_LIMIT_WAIT=0, ZOHO_RATE_LIMIT_BURST=1, ZOHO_BREAKER_FAILURE_THRESHOLD=3)
+    def test_rate_limited_probe_frees_the_probe_slot(self) -> None:
+        client = zoho.ZohoClient(base_url="http://zoho.invalid")
+        self.addCleanup(client.close)
+        with self.assertLogs("apps.core.resilience", "WARNING"):
+            for _ in range(3):
+                client.breaker.record_failure()
+        self.now += settings.ZOHO_BREAKER_RESET_SECONDS + 1
+        client.limiter.acquire()
+        with self.assertRaises(RateLimitExceeded):
+            client.post("/crm/v2/Leads")
+        # The next caller gets the probe instead of a CircuitOpenError.
+        self.assertTrue(client.breaker.before_call())
+
+
+class _KeepAliveEndpoint(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"port": self.client_address[1]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:  # noqa: ANN002
+        pass
+
+
+class ZohoClientTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        zoho.reset_client()
+        self.addCleanup(zoho.reset_client)
+
+    def test_calls_reuse_one_connection(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveEndpoint)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = zoho.ZohoClient(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+        self.addCleanup(client.close)
+        ports = {client.post("/crm/v2/Leads", json={}).json()["port"] for _ in range(3)}
+        self.assertEqual(len(ports), 1)
+        self.assertEqual(client.pool_stats(), {"hits": 2, "misses": 1})
+
+    def test_forked_process_gets_its_own_client(self) -> None:
+        parent = zoho.get_client()
+        self.addCleanup(parent.close)
+        self.assertIs(zoho.get_client(), parent)
+        with mock.patch("os.getpid", return_value=parent.pid + 1):
+            child = zoho.get_client()
+            self.assertIsNot(child, parent)
+            self.assertIs(zoho.get_client(), child)
+            self.assertIsNot(child.session, parent.session)
+
+
+def _project_admin_models() -> List[type]:
+    # The project's own admins; Django's and DRF's are not ours to budget.
+    models = [model for model in admin.site._registry if model._meta.app_config.name.startswith("apps.")]
+    return sorted(models, key=lambda model: model._meta.label)
+
+
+def _overrun(name: str, recorder: QueryRecorder, budget: int) -> str:
+    lines = [f"{name}: {len(recorder.statements)} queries, budget {budget}"]
+    lines += [f"  {query.sql[:160]}\n      from {query.origin}" for query in recorder.statements]
+    return "\n".join(lines)
+
+
+def _repeats(name: str, sql: str, queries: List[Any]) -> str:
+    lines = [f"{name}: N+1, {len(queries)} runs of", f"  {sql[:240]}"]
+    origins: Dict[str, int] = {}
+    for query in queries:
+        origins[query.origin] = origins.get(query.origin, 0) + 1
+    lines += [f"  {count}x from {origin}" for origin, count in origins.items()]
+    lines.append("  First run, project frames only:")
+    lines += ["  " + line for line in "".join(traceback.format_list(queries[0].stack)).splitlines()]
+    return "\n".join(lines)
+
+
+class MetricsFileTests(SimpleTestCase):
+    """Workers' metrics files are told apart by pid and start time."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(METRICS_DIR=directory.name, METRICS_FLUSH_SECONDS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry = mock.patch.object(metrics, "registry", metrics.Registry())
+        registry.start()
+        self.addCleanup(registry.stop)
+        metrics.registry.observe("probe", "GET", 200, 0.01, metrics.RequestTimings())
+
+    def write_worker_file(self, name: str, requests_total: int) -> None:
+        samples = {"http_requests_total": [[["probe", "GET", "200"], requests_total]]}
+        (self.directory / f"{name}.json").write_text(json.dumps(samples))
+
+    def requests_total(self) -> int:
+        return metrics.collect()["http_requests_total"][("probe", "GET", "200")]
+
+    def test_file_of_a_reused_pid_is_archived(self) -> None:
+        # Same pid as this process, but written by an earlier process that had it.
+        self.write_worker_file(f"{os.getpid()}-1", 5)
+        self.assertEqual(self.requests_total(), 6)
+        self.assertEqual(
+            sorted(path.name for path in self.directory.glob("*.json")),
+            sorted([f"{os.getpid()}-{metrics._started(os.getpid())}.json", "archive.json"]),
+        )
+        self.assertEqual(self.requests_total(), 6)
+
+    def test_live_worker_file_is_kept(self) -> None:
+        parent = os.getppid()
+        self.write_worker_file(f"{parent}-{metrics._started(parent)}", 5)
+        self.assertEqual(self.requests_total(), 6)
+        self.assertFalse((self.directory / "archive.json").exists())
+
+    def test_new_process_with_a_reused_pid_does_not_overwrite(self) -> None:
+        metrics.registry.flush()
+        with mock.patch.object(metrics, "_started", return_value="1"):
+            metrics.Registry().flush()
+        self.assertEqual(len(list(self.directory.glob("*.json"))), 2)
+
+    def test_forked_worker_writes_its_own_file(self) -> None:
+        metrics.registry.flush()
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            metrics.registry.flush()
+        self.assertEqual(len(list(self.directory.glob("*.json"))), 2)
@@ -8,7 +8,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import View
 
 from .forms import SubmissionContext
-from .services import submit_contact, submit_ebook_download
+from .services import asubmit_contact, asubmit_ebook_download
 
 
 def _parse_body(request) -> dict:  # noqa: ANN001 - Django request
@@ -20,33 +20,31 @@ def _parse_body(request) -> dict:  # noqa: ANN001 - Django request
     return request.POST.dict()
 
 
+def _submission_context(request) -> SubmissionContext:  # noqa: ANN001 - Django request
+    return SubmissionContext(
+        utm_params={key: request.GET.get(key, "") for key in request.GET if key.startswith("utm_")},
+        referer=request.META.get("HTTP_REFERER"),
+        ga_client_id=request.COOKIES.get("_ga"),
+    )
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class ContactFormView(View):
-    def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+    async def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         data = _parse_body(request)
-        context = SubmissionContext(
-            utm_params={key: request.GET.get(key, "") for key in request.GET if key.startswith("utm_")},
-            referer=request.META.get("HTTP_REFERER"),
-            ga_client_id=request.COOKIES.get("_ga"),
-        )
         try:
-            result = submit_contact(data, context)
+            result = await asubmit_contact(data, _submission_context(request))
         except ValueError as exc:  # pragma: no cover - serialized message for API
             return JsonResponse({"errors": str(exc)}, status=400)
-        return JsonResponse(result)
+        return JsonResponse(result, status=202)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class EbookFormView(View):
-    def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+    async def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         data = _parse_body(request)
-        context = SubmissionContext(
-            utm_params={key: request.GET.get(key, "") for key in request.GET if key.startswith("utm_")},
-            referer=request.META.get("HTTP_REFERER"),
-            ga_client_id=request.COOKIES.get("_ga"),
-        )
         try:
-            result = submit_ebook_download(data, context)
+            result = await asubmit_ebook_download(data, _submission_context(request))
         except ValueError as exc:  # pragma: no cover
             return JsonResponse({"errors": str(exc)}, status=400)
-        return JsonResponse(result)
+        return JsonResponse(result, status=202)
@@ -1,55 +1,447 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .locks import cache_lock
+from .metrics import span
+from .resilience import CircuitBreaker, RateLimitExceeded, TokenBucket
 
 logger = logging.getLogger(__name__)
 
 
-def _get_access_token() -> str:
+class PoolStats:
+    """Counts how often a request found a live keep-alive connection in the pool."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, reused: bool) -> None:
+        with self._lock:
+            if reused:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def _counting_pool(base: type, stats: PoolStats) -> type:
+    class CountingPool(base):  # type: ignore[misc, valid-type]
+        def _get_conn(self, timeout=None):  # noqa: ANN001, ANN202
+            conn = super()._get_conn(timeout=timeout)
+            # Dropped connections are closed by urllib3 before they are returned,
+            # so an open socket here means the TCP/TLS handshake is skipped.
+            stats.record(reused=getattr(conn, "sock", None) is not None)
+            return conn
+
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    def __init__(self, stats: PoolStats, **kwargs: Any) -> None:
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+
+class ZohoClient:
+    """Keep-alive HTTP client for Zoho with a per-process connection pool.
+
+    All Zoho traffic goes through one ``requests.Session`` so each worker pays the
+    TCP and TLS handshake once and reuses the connection for later leads. Calls
+    draw from a shared token bucket sized to the API quota and fail fast while
+    the circuit breaker is open.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+    ) -> None:
+        self.base_url = (base_url or settings.ZOHO_BASE_URL).rstrip("/")
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else settings.ZOHO_CONNECT_TIMEOUT,
+            read_timeout if read_timeout is not None else settings.ZOHO_READ_TIMEOUT,
+        )
+        self.pid = os.getpid()
+        self.stats = PoolStats()
+        self.session = requests.Session()
+        adapter = _CountingAdapter(
+            self.stats,
+            pool_connections=2,
+            pool_maxsize=pool_size or settings.ZOHO_POOL_SIZE,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter = TokenBucket(
+            "zoho",
+            rate_per_minute=settings.ZOHO_RATE_LIMIT_PER_MINUTE,
+            capacity=settings.ZOHO_RATE_LIMIT_BURST,
+        )
+        self.breaker = CircuitBreaker(
+            "zoho",
+            failure_threshold=settings.ZOHO_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.ZOHO_BREAKER_RESET_SECONDS,
+        )
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        probe = self.breaker.before_call()
+        try:
+            self.limiter.acquire(wait=settings.ZOHO_RATE_LIMIT_WAIT)
+        except RateLimitExceeded:
+            # No call went out, so the probe slot must not sit taken until it expires.
+            if probe:
+                self.breaker.release_probe()
+            raise
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            with span("zoho"):
+                response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def pool_stats(self) -> Dict[str, int]:
+        return self.stats.snapshot()
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "breaker": self.breaker.snapshot(),
+            "rate_limit": self.limiter.snapshot(),
+            "pool": self.pool_stats(),
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncZohoClient:
+    """``httpx`` counterpart of ``ZohoClient`` for async views and workers.
+
+    Waiting on Zoho suspends the calling coroutine instead of holding a thread.
+    The breaker and rate limiter share their cache keys with ``ZohoClient``, so
+    sync and async callers see one quota and one circuit.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+    ) -> None:
+        pool_size = pool_size or settings.ZOHO_POOL_SIZE
+        self.client = httpx.AsyncClient(
+            base_url=(base_url or settings.ZOHO_BASE_URL).rstrip("/"),
+            timeout=httpx.Timeout(
+                read_timeout if read_timeout is not None else settings.ZOHO_READ_TIMEOUT,
+                connect=connect_timeout if connect_timeout is not None else settings.ZOHO_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.limiter = TokenBucket(
+            "zoho",
+            rate_per_minute=settings.ZOHO_RATE_LIMIT_PER_MINUTE,
+            capacity=settings.ZOHO_RATE_LIMIT_BURST,
+        )
+        self.breaker = CircuitBreaker(
+            "zoho",
+            failure_threshold=settings.ZOHO_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.ZOHO_BREAKER_RESET_SECONDS,
+        )
+
+    async def _acquire(self, wait: float) -> None:
+        deadline = time.monotonic() + wait
+        while True:
+            retry_after = await sync_to_async(self.limiter.try_acquire)()
+            if not retry_after:
+                return
+            if retry_after > deadline - time.monotonic():
+                raise RateLimitExceeded(self.limiter.name, retry_after)
+            await asyncio.sleep(retry_after)
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        probe = await sync_to_async(self.breaker.before_call)()
+        try:
+            await self._acquire(settings.ZOHO_RATE_LIMIT_WAIT)
+        except RateLimitExceeded:
+            if probe:
+                await sync_to_async(self.breaker.release_probe)()
+            raise
+        try:
+            with span("zoho"):
+                response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            await sync_to_async(self.breaker.record_failure)()
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            await sync_to_async(self.breaker.record_failure)()
+        else:
+            await sync_to_async(self.breaker.record_success)()
+        return response
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_client: Optional[ZohoClient] = None
+_client_lock = threading.Lock()
+# httpx clients are bound to the event loop they first ran on.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncZohoClient]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> ZohoClient:
+    """Return the process-wide client, creating a fresh one after a fork."""
+    global _client
+    client = _client
+    if client is not None and client.pid == os.getpid():
+        return client
+    with _client_lock:
+        if _client is None or _client.pid != os.getpid():
+            _client = ZohoClient()
+        return _client
+
+
+def get_async_client() -> AsyncZohoClient:
+    """Return the client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncZohoClient()
+    return client
+
+
+def reset_client() -> None:
+    """Close the process-wide client so the next call picks up current settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def _request_access_token() -> Dict[str, Any]:
     if not all([settings.ZOHO_CLIENT_ID, settings.ZOHO_CLIENT_SECRET, settings.ZOHO_REFRESH_TOKEN]):
         raise RuntimeError('Zoho OAuth credentials are not configured')
-    response = requests.post(
-        f"{settings.ZOHO_BASE_URL}/oauth/v2/token",
+    response = get_client().post(
+        "/oauth/v2/token",
         params={
             "refresh_token": settings.ZOHO_REFRESH_TOKEN,
             "client_id": settings.ZOHO_CLIENT_ID,
             "client_secret": settings.ZOHO_CLIENT_SECRET,
             "grant_type": "refresh_token",
         },
-        timeout=10,
     )
     response.raise_for_status()
-    data = response.json()
-    return data["access_token"]
+    return response.json()
 
 
-def create_lead(payload: Dict[str, Any]) -> Dict[str, Any]:
+class ZohoAuthError(RuntimeError):
+    """Zoho answered the token request without an access token."""
+
+    def __init__(self, error: str) -> None:
+        super().__init__(f"Zoho token refresh failed: {error}")
+        self.error = error
+
+
+class ZohoTokenProvider:
+    """Shares one Zoho access token between threads and workers.
+
+    The token lives in Django's cache until ``ZOHO_TOKEN_REFRESH_MARGIN`` seconds
+    before Zoho expires it. Refreshes are serialized with a thread lock inside the
+    process and a cache lock across processes, so a burst of submissions against
+    an empty cache results in a single refresh-token grant.
+    """
+
+    cache_key = "zoho:oauth:access_token"
+    lock_key = "zoho:oauth:refresh_lock"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def get_token(self) -> str:
+        token = cache.get(self.cache_key)
+        if token:
+            return token
+        with self._lock:
+            token = cache.get(self.cache_key)
+            if token:
+                return token
+            with cache_lock(self.lock_key, timeout=30, wait=15) as acquired:
+                # Another worker may have refreshed while we waited for the lock.
+                token = cache.get(self.cache_key)
+                if token:
+                    return token
+                if not acquired:
+                    logger.warning("Timed out waiting for the Zoho token refresh lock; refreshing anyway")
+                return self._refresh()
+
+    def invalidate(self, token: str) -> None:
+        """Drop ``token`` from the cache unless another caller already replaced it."""
+        if cache.get(self.cache_key) == token:
+            cache.delete(self.cache_key)
+
+    def _refresh(self) -> str:
+        data = _request_access_token()
+        if not isinstance(data, dict) or not data.get("access_token"):
+            # Zoho reports grant errors such as invalid_code with a 200 status.
+            error = data.get("error") if isinstance(data, dict) else None
+            raise ZohoAuthError(str(error or "response has no access_token"))
+        token = data["access_token"]
+        ttl = int(data.get("expires_in", 3600)) - settings.ZOHO_TOKEN_REFRESH_MARGIN
+        if ttl > 0:
+            cache.set(self.cache_key, token, ttl)
+        logger.info("Refreshed Zoho access token (cached for %ss)", max(ttl, 0))
+        return token
+
+
+token_provider = ZohoTokenProvider()
+
+
+# Zoho accepts at most this many records per insert call.
+MAX_RECORDS_PER_CALL = 100
+
+
+def _post_leads(payloads: List[Dict[str, Any]], token: str) -> requests.Response:
+    return get_client().post(
+        "/crm/v2/Leads",
+        json={"data": payloads},
+        headers={"Authorization": f"Zoho-oauthtoken {token}"},
+    )
+
+
+def _mock_record(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "code": "MOCK_SUCCESS",
+        "details": {"id": "mock-lead", "email": payload.get("Email")},
+        "message": "Lead stored locally (mock)",
+        "status": "success",
+    }
+
+
+def create_leads(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert up to ``MAX_RECORDS_PER_CALL`` leads in one call.
+
+    Returns Zoho's per-record results in the same order as ``payloads`` so callers
+    can tell which submissions failed when only part of the batch is rejected.
+    """
+    if len(payloads) > MAX_RECORDS_PER_CALL:
+        raise ValueError(f"Zoho accepts at most {MAX_RECORDS_PER_CALL} leads per call")
     if settings.ENABLE_MOCKS:
         logger.info("Mock mode enabled – returning fake Zoho lead payload")
-        return {
-            "data": [
-                {
-                    "code": "MOCK_SUCCESS",
-                    "details": {"id": "mock-lead", "email": payload.get("Email")},
-                    "message": "Lead stored locally (mock)",
-                    "status": "success",
-                }
-            ]
-        }
+        return [_mock_record(payload) for payload in payloads]
+
+    token = token_provider.get_token()
+    response = _post_leads(payloads, token)
+    if response.status_code == 401:
+        logger.info("Zoho rejected the cached access token; refreshing and retrying")
+        token_provider.invalidate(token)
+        response = _post_leads(payloads, token_provider.get_token())
+    return _lead_records(response, payloads)
+
 
-    token = _get_access_token()
-    headers = {"Authorization": f"Zoho-oauthtoken {token}"}
-    response = requests.post(
-        f"{settings.ZOHO_BASE_URL}/crm/v2/Leads",
-        json={"data": [payload]},
-        headers=headers,
-        timeout=10,
+async def _apost_leads(payloads: List[Dict[str, Any]], token: str) -> httpx.Response:
+    return await get_async_client().post(
+        "/crm/v2/Leads",
+        json={"data": payloads},
+        headers={"Authorization": f"Zoho-oauthtoken {token}"},
     )
-    response.raise_for_status()
-    data = response.json()
+
+
+async def acreate_leads(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Async ``create_leads``; raises ``httpx.HTTPError`` where it raises ``requests`` errors."""
+    if len(payloads) > MAX_RECORDS_PER_CALL:
+        raise ValueError(f"Zoho accepts at most {MAX_RECORDS_PER_CALL} leads per call")
+    if settings.ENABLE_MOCKS:
+        logger.info("Mock mode enabled – returning fake Zoho lead payload")
+        return [_mock_record(payload) for payload in payloads]
+
+    # Token refreshes are rare and serialized across workers, so they keep the sync path.
+    token = await sync_to_async(token_provider.get_token)()
+    response = await _apost_leads(payloads, token)
+    if response.status_code == 401:
+        logger.info("Zoho rejected the cached access token; refreshing and retrying")
+        await sync_to_async(token_provider.invalidate)(token)
+        response = await _apost_leads(payloads, await sync_to_async(token_provider.get_token)())
+    return _lead_records(response, payloads)
+
+
+def _lead_records(response: Any, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    records = None
+    if response.status_code < 500:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        # A list or null body would otherwise fail with AttributeError outside the callers' error handling.
+        records = body.get("data") if isinstance(body, dict) else None
+    # Record-level rejections come back as a 4xx with one result per record;
+    # anything else is a failure of the whole call.
+    if not isinstance(records, list) or len(records) != len(payloads):
+        response.raise_for_status()
+        raise ValueError(f"Unexpected Zoho response for {len(payloads)} leads: {response.text[:500]}")
+    logger.info("Sent %s leads to Zoho", len(payloads))
+    return records
+
+
+class ZohoRecordError(ValueError):
+    """Zoho answered the call but rejected the record itself."""
+
+    def __init__(self, record: Dict[str, Any]) -> None:
+        super().__init__(f"Zoho rejected the lead: {record.get('code')}: {record.get('message')}")
+        self.record = record
+
+
+def _created(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if records[0].get("status") != "success":
+        raise ZohoRecordError(records[0])
+    data = {"data": records}
     logger.info("Lead created in Zoho: %s", data)
     return data
+
+
+def create_lead(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert one lead, raising ``ZohoRecordError`` when Zoho rejects it."""
+    return _created(create_leads([payload]))
+
+
+async def acreate_lead(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _created(await acreate_leads([payload]))
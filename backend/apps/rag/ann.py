@@ -0,0 +1,362 @@
+"""IVF-flat approximate nearest-neighbour index.
+
+Vectors are clustered around ``nlist`` centroids with spherical k-means and
+stored grouped by cluster, so a query scores the centroids and then only the
+``nprobe`` closest clusters. Raising ``nprobe`` trades latency for recall;
+``nprobe == nlist`` is an exact scan.
+
+The base layout is written once as ``.npy`` files and opened with
+``mmap_mode="r"``, so every worker on a host shares one copy through the page
+cache. Later inserts land in a small in-memory delta that is searched by brute
+force, and deletes are tombstones over the base. Both are saved next to the
+base and folded into it by ``compact`` once they grow past
+``RAG_IVF_COMPACT_RATIO``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.locks import cache_lock
+
+from .embeddings import Embedder, get_embedder
+from .models import ContentChunk
+
+logger = logging.getLogger(__name__)
+
+WRITE_LOCK_KEY = "rag:ann:write"
+# Set when committed changes could not be written to the index; see ``apply_changes``.
+PENDING_KEY = "rag:ann:pending"
+# Publish commit hooks wait this long for the write lock before leaving their changes pending.
+REQUEST_LOCK_WAIT = 5
+_ASSIGN_BLOCK = 65536
+
+
+def top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """Return the ``k`` best ``(id, score)`` pairs, best first; ``-inf`` scores are dropped."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    if k < len(scores):
+        top = np.argpartition(scores, -k)[-k:]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(int(ids[row]), float(scores[row])) for row in top if scores[row] > -np.inf]
+
+
+def default_nlist(count: int) -> int:
+    return max(1, min(int(4 * np.sqrt(count)), count // 32 or 1))
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_BLOCK):
+        block = np.asarray(vectors[start:start + _ASSIGN_BLOCK], dtype=np.float32)
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample of at most 64 vectors per centroid."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * 64)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = counts == 0
+        # Re-seed empty clusters from random points so every list gets used.
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.where(norms > 0, norms, 1)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        offsets: np.ndarray,
+        delta_vectors: Optional[np.ndarray] = None,
+        delta_ids: Optional[np.ndarray] = None,
+        deleted: Optional[np.ndarray] = None,
+    ) -> None:
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        dimensions = centroids.shape[1]
+        self.delta_vectors = (
+            delta_vectors if delta_vectors is not None else np.empty((0, dimensions), dtype=np.float32)
+        )
+        self.delta_ids = delta_ids if delta_ids is not None else np.empty(0, dtype=np.int64)
+        # Base ids that were removed or replaced by a delta entry.
+        self.deleted = deleted if deleted is not None else np.empty(0, dtype=np.int64)
+        self.path: Optional[Path] = None
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self.ids) - len(self.deleted) + len(self.delta_ids)
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, ids: np.ndarray, nlist: Optional[int] = None, seed: int = 0) -> "IVFIndex":
+        if not len(vectors):
+            raise ValueError("Cannot build an IVF index without vectors")
+        nlist = min(nlist or default_nlist(len(vectors)), len(vectors))
+        centroids = train_centroids(vectors, nlist, seed=seed)
+        return cls._grouped(centroids, vectors, np.asarray(ids, dtype=np.int64))
+
+    @classmethod
+    def _grouped(cls, centroids: np.ndarray, vectors: np.ndarray, ids: np.ndarray) -> "IVFIndex":
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=len(centroids)), out=offsets[1:])
+        grouped = np.empty((len(vectors), centroids.shape[1]), dtype=np.float32)
+        for start in range(0, len(order), _ASSIGN_BLOCK):
+            rows = order[start:start + _ASSIGN_BLOCK]
+            grouped[start:start + len(rows)] = vectors[rows]
+        return cls(centroids, grouped, ids[order], offsets)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        exclude: Sequence[int] = (),
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        query = query.astype(np.float32, copy=False)
+        nprobe = min(nprobe or settings.RAG_IVF_NPROBE, self.nlist)
+        centroid_scores = self.centroids @ query
+        if nprobe < self.nlist:
+            probe = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+        else:
+            probe = np.arange(self.nlist)
+        score_parts = [self.delta_vectors @ query]
+        id_parts = [self.delta_ids]
+        for cluster in probe:
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            if start == end:
+                continue
+            score_parts.append(self.vectors[start:end] @ query)
+            id_parts.append(self.ids[start:end])
+        scores = np.concatenate(score_parts)
+        ids = np.concatenate(id_parts)
+        # Tombstones only hide base entries; delta entries come first.
+        base = np.arange(len(ids)) >= len(self.delta_ids)
+        blocked = base & np.isin(ids, self.deleted)
+        if len(exclude):
+            blocked |= np.isin(ids, np.asarray(exclude, dtype=np.int64))
+        scores[blocked] = -np.inf
+        return top_k(scores, ids, k)
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Insert or replace ``ids``; the previous version of an id stops matching."""
+        ids = np.asarray(ids, dtype=np.int64)
+        self.remove(ids)
+        self.delta_ids = np.concatenate([self.delta_ids, ids])
+        self.delta_vectors = np.concatenate([self.delta_vectors, np.asarray(vectors, dtype=np.float32)])
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if not len(ids):
+            return
+        keep = ~np.isin(self.delta_ids, ids)
+        self.delta_ids = self.delta_ids[keep]
+        self.delta_vectors = self.delta_vectors[keep]
+        self.deleted = np.union1d(self.deleted, ids[np.isin(ids, self.ids)])
+
+    def needs_compaction(self) -> bool:
+        pending = len(self.delta_ids) + len(self.deleted)
+        return pending > max(len(self.ids) * settings.RAG_IVF_COMPACT_RATIO, 1024)
+
+    def compact(self) -> "IVFIndex":
+        """Fold the delta and tombstones into a new base, keeping the centroids."""
+        live = ~np.isin(self.ids, self.deleted)
+        vectors = np.concatenate([np.asarray(self.vectors[live]), self.delta_vectors])
+        ids = np.concatenate([self.ids[live], self.delta_ids])
+        return self._grouped(self.centroids, vectors, ids)
+
+    # Persistence -----------------------------------------------------------------
+
+    def save(self, root: Path, meta: dict) -> Path:
+        """Write the base as a new version under ``root`` and point ``CURRENT`` at it."""
+        root.mkdir(parents=True, exist_ok=True)
+        version = root / f"v{time.time_ns()}"
+        staging = Path(tempfile.mkdtemp(dir=root, prefix=".staging-"))
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            np.save(staging / f"{name}.npy", getattr(self, name))
+        (staging / "meta.json").write_text(json.dumps({**meta, "nlist": self.nlist}))
+        os.replace(staging, version)
+        self.path = version
+        self.save_delta()
+        _atomic_write(root / "CURRENT", version.name)
+        for old in root.glob("v*"):
+            # Workers still mapping an old version keep their pages until they reload.
+            if old != version:
+                shutil.rmtree(old, ignore_errors=True)
+        return version
+
+    def save_delta(self) -> None:
+        if self.path is None:
+            raise ValueError("Save the base before its delta")
+        fd, staging = tempfile.mkstemp(dir=self.path, suffix=".npz")
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, vectors=self.delta_vectors, ids=self.delta_ids, deleted=self.deleted)
+        os.replace(staging, self.path / "delta.npz")
+
+    @classmethod
+    def open(cls, root: Path) -> Optional[Tuple["IVFIndex", dict]]:
+        """Map the current version under ``root``, or return None if there is none."""
+        try:
+            version = root / (root / "CURRENT").read_text().strip()
+            meta = json.loads((version / "meta.json").read_text())
+            arrays = {
+                name: np.load(version / f"{name}.npy", mmap_mode="r")
+                for name in ("centroids", "vectors", "ids", "offsets")
+            }
+        except (FileNotFoundError, ValueError):
+            return None
+        delta = {}
+        if (version / "delta.npz").exists():
+            with np.load(version / "delta.npz") as stored:
+                delta = {"delta_vectors": stored["vectors"], "delta_ids": stored["ids"], "deleted": stored["deleted"]}
+        index = cls(
+            np.asarray(arrays["centroids"]),
+            arrays["vectors"],
+            np.asarray(arrays["ids"]),
+            np.asarray(arrays["offsets"]),
+            **delta,
+        )
+        index.path = version
+        return index, meta
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    fd, staging = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "w") as handle:
+        handle.write(text)
+    os.replace(staging, path)
+
+
+# Stored index for ``ContentChunk`` -------------------------------------------------
+
+
+def index_dir() -> Path:
+    return Path(settings.RAG_INDEX_DIR)
+
+
+def _load_vectors(embedder: Embedder, ids: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    rows = ContentChunk.objects.filter(embedder=embedder.signature)
+    if ids is not None:
+        rows = rows.filter(pk__in=list(ids))
+    rows = list(rows.order_by("pk").values_list("pk", "embedding").iterator())
+    vectors = np.empty((len(rows), embedder.dimensions), dtype=np.float32)
+    for row, (_, embedding) in enumerate(rows):
+        vectors[row] = np.frombuffer(embedding, dtype=np.float32)
+    return np.array([pk for pk, _ in rows], dtype=np.int64), vectors
+
+
+def rebuild(embedder: Optional[Embedder] = None) -> Optional[IVFIndex]:
+    """Train and save a fresh index over every stored chunk."""
+    embedder = embedder or get_embedder()
+    ids, vectors = _load_vectors(embedder)
+    if not len(ids):
+        return None
+    index = IVFIndex.build(vectors, ids, nlist=settings.RAG_IVF_NLIST or None)
+    index.save(index_dir(), {"embedder": embedder.signature})
+    logger.info("Built IVF index with %s vectors in %s lists", len(ids), index.nlist)
+    return index
+
+
+def load(embedder: Optional[Embedder] = None) -> Optional[IVFIndex]:
+    """Open the saved index, building it first if it is missing or stale.
+
+    Returns None when another process holds the write lock for longer than
+    the wait, so the caller can fall back to exact search.
+    """
+    embedder = embedder or get_embedder()
+    opened = IVFIndex.open(index_dir())
+    if opened is not None and opened[1].get("embedder") == embedder.signature:
+        return opened[0]
+    with cache_lock(WRITE_LOCK_KEY, timeout=600, wait=600) as acquired:
+        # Another worker may have built it while we waited.
+        opened = IVFIndex.open(index_dir())
+        if opened is not None and opened[1].get("embedder") == embedder.signature:
+            return opened[0]
+        if not acquired:
+            logger.warning("Timed out waiting for the IVF index build; using exact search")
+            return None
+        return rebuild(embedder)
+
+
+def pending() -> bool:
+    """Whether committed chunk changes are still missing from the saved index."""
+    return bool(cache.get(PENDING_KEY))
+
+
+def apply_changes(
+    changed_ids: Sequence[int], removed_ids: Sequence[int], full: bool = False, in_request: bool = False
+) -> None:
+    """Mirror committed chunk changes into the saved index and tell workers to reload.
+
+    Changes that cannot be written, because another process kept the write
+    lock or the index needs a full rebuild that ``in_request`` callers may not
+    do, are marked pending; the next ``reindex_content`` run rebuilds the index.
+    """
+    from .index import bump_generation
+
+    embedder = get_embedder()
+    wait = REQUEST_LOCK_WAIT if in_request else 600
+    with cache_lock(WRITE_LOCK_KEY, timeout=600, wait=wait) as acquired:
+        if not acquired:
+            _leave_pending("the index is being written elsewhere", changed_ids, removed_ids)
+            return
+        if not in_request and pending():
+            # Cleared before the table is read, so changes committed from here on set it again.
+            cache.delete(PENDING_KEY)
+            full = True
+        opened = None if full else IVFIndex.open(index_dir())
+        if opened is None or opened[1].get("embedder") != embedder.signature:
+            if in_request:
+                _leave_pending("the index needs a full rebuild", changed_ids, removed_ids)
+                return
+            try:
+                rebuild(embedder)
+            except Exception:
+                cache.set(PENDING_KEY, 1, None)
+                raise
+        else:
+            index = opened[0]
+            index.remove(removed_ids)
+            ids, vectors = _load_vectors(embedder, changed_ids)
+            index.add(ids, vectors)
+            if index.needs_compaction():
+                index.compact().save(index_dir(), opened[1])
+            else:
+                index.save_delta()
+    bump_generation()
+
+
+def _leave_pending(reason: str, changed_ids: Sequence[int], removed_ids: Sequence[int]) -> None:
+    cache.set(PENDING_KEY, 1, None)
+    logger.warning("IVF index not updated, %s; %s chunk changes left pending", reason, len(changed_ids) + len(removed_ids))
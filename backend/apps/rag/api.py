@@ -1,9 +1,36 @@
-from apps.content.models import Page
-from rest_framework import status
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Hashable
+
+from apps.content.models import Page, PageRevision
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .services import generate_draft, publish_draft
+from .drafts import cache_metadata, draft_cache, draft_key
+from .providers import DraftProvider, DraftRequest, get_provider
+from .serializers import SectionUpdateSerializer
+from .services import (
+    PublishConflict,
+    PublishResult,
+    RagDraft,
+    gather_context,
+    generate_draft,
+    publish_draft,
+    rollback_page,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class RagPreviewView(APIView):
@@ -25,14 +52,191 @@ class RagPreviewView(APIView):
         )
 
 
+def _version(value: Any) -> Any:
+    if value in (None, ""):
+        return None
+    return int(value)
+
+
+def _publish_response(result: PublishResult) -> Response:
+    return Response(
+        {
+            "page": result.page.slug,
+            "version": result.version,
+            "changes": {
+                "created": result.created,
+                "updated": result.updated,
+                "deleted": result.deleted,
+                "unchanged": result.unchanged,
+            },
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def _conflict_response(conflict: PublishConflict) -> Response:
+    return Response(
+        {"error": "Page changed since this draft was generated", "version": conflict.version},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
 class RagPublishView(APIView):
     def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
         page_slug = request.data.get("page_slug")
         if not page_slug:
             return Response({"error": "page_slug is required"}, status=status.HTTP_400_BAD_REQUEST)
-        updates = request.data.get("sections", [])
+        sections = SectionUpdateSerializer(data=request.data.get("sections", []), many=True)
+        if not sections.is_valid():
+            return Response(
+                {"error": "sections must be a list of {order, heading, body}", "sections": sections.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            expected_version = _version(request.data.get("version"))
+        except (TypeError, ValueError):
+            return Response({"error": "version must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = publish_draft(page_slug, sections.validated_data, expected_version=expected_version, author=request.user)
+        except Page.DoesNotExist:
+            return Response({"error": "Page not found"}, status=status.HTTP_404_NOT_FOUND)
+        except PublishConflict as conflict:
+            return _conflict_response(conflict)
+        return _publish_response(result)
+
+
+class RagRevisionsView(APIView):
+    def get(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+        page_slug = request.query_params.get("page_slug")
+        if not page_slug:
+            return Response({"error": "page_slug is required"}, status=status.HTTP_400_BAD_REQUEST)
+        revisions = PageRevision.objects.filter(page__slug=page_slug).values(
+            "version", "changes", "restored_version", "author__username", "created_at"
+        )
+        return Response({"page": page_slug, "revisions": list(revisions[:50])})
+
+
+class RagRollbackView(APIView):
+    def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+        page_slug = request.data.get("page_slug")
+        if not page_slug:
+            return Response({"error": "page_slug is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            version = _version(request.data.get("version"))
+            expected_version = _version(request.data.get("expected_version"))
+        except (TypeError, ValueError):
+            return Response({"error": "version must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if version is None:
+            return Response({"error": "version is required"}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            page = publish_draft(page_slug, updates)
+            result = rollback_page(page_slug, version, expected_version=expected_version, author=request.user)
         except Page.DoesNotExist:
             return Response({"error": "Page not found"}, status=status.HTTP_404_NOT_FOUND)
-        return Response({"page": page.slug}, status=status.HTTP_202_ACCEPTED)
+        except PageRevision.DoesNotExist:
+            return Response({"error": "Revision not found"}, status=status.HTTP_404_NOT_FOUND)
+        except PublishConflict as conflict:
+            return _conflict_response(conflict)
+        return _publish_response(result)
+
+
+def _event(name: str, data: Dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class RagPreviewStreamView(View):
+    """Server-sent events variant of ``RagPreviewView`` for ASGI deployments.
+
+    Emits ``context`` (page and retrieved sources), one ``section`` per existing
+    section, then the generated draft as ``token`` events and a final ``done``.
+    When the client disconnects Django cancels the stream, which closes the
+    provider's generator.
+    """
+
+    async def post(self, request, *args, **kwargs):  # noqa: ANN001, ANN002
+        if not await sync_to_async(self._has_permission)(request):
+            return JsonResponse({"error": "Authentication credentials were not provided."}, status=403)
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            data = {}
+        page_slug = data.get("page_slug")
+        if not page_slug:
+            return JsonResponse({"error": "page_slug is required"}, status=400)
+        prompt = data.get("prompt", "")
+        provider = get_provider()
+        key = await sync_to_async(draft_key)(page_slug, prompt, f"{provider.name}:{provider.model}")
+        cached = draft_cache.get(key)
+        if cached is not None:
+            events = self._replay(cached)
+        else:
+            try:
+                draft = await sync_to_async(gather_context)(page_slug, prompt)
+            except Page.DoesNotExist:
+                return JsonResponse({"error": "Page not found"}, status=404)
+            events = self._events(draft, prompt, provider, key)
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stops nginx-style proxies from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _has_permission(self, request) -> bool:  # noqa: ANN001
+        # Same authentication and permission policy as the DRF endpoints.
+        drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+        try:
+            return all(
+                permission().has_permission(drf_request, self)
+                for permission in api_settings.DEFAULT_PERMISSION_CLASSES
+            )
+        except exceptions.APIException:
+            return False
+
+    async def _replay(self, draft: RagDraft) -> AsyncIterator[str]:
+        draft.metadata["cache"] = cache_metadata(hit=True)
+        yield _event("context", {"page": draft.page.slug, "metadata": draft.metadata})
+        for index, section in enumerate(draft.sections):
+            yield _event("section", {"index": index, **section})
+        yield _event("done", {**draft.metadata.get("generation", {}), "cached": True})
+
+    async def _events(self, draft: RagDraft, prompt: str, provider: DraftProvider, key: Hashable) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        draft.metadata["cache"] = cache_metadata(hit=False)
+        yield _event("context", {"page": draft.page.slug, "metadata": draft.metadata})
+        for index, section in enumerate(draft.sections):
+            yield _event("section", {"index": index, **section})
+        index = len(draft.sections)
+        yield _event("section", {"index": index, "heading": "AI Draft", "body": ""})
+        tokens = provider.stream(
+            DraftRequest(
+                page_slug=draft.page.slug,
+                prompt=prompt,
+                sections=draft.sections,
+                sources=draft.metadata.get("sources", []),
+            )
+        )
+        body = []
+        try:
+            async for token in tokens:
+                body.append(token)
+                yield _event("token", {"index": index, "text": token})
+        except asyncio.CancelledError:
+            logger.info("Draft stream for %s cancelled after %s tokens", draft.page.slug, len(body))
+            raise
+        except Exception:
+            logger.exception("Draft provider %s failed for %s", provider.name, draft.page.slug)
+            yield _event("error", {"error": "Draft generation failed"})
+            return
+        finally:
+            await tokens.aclose()
+        generation = {
+            "generator": provider.name,
+            "generator_model": provider.model,
+            "tokens": len(body),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        # Only complete drafts are memoized; cancelled or failed ones return above.
+        draft.sections.append({"heading": "AI Draft", "body": "".join(body)})
+        draft.metadata["generation"] = generation
+        draft_cache.set(key, draft)
+        yield _event("done", generation)
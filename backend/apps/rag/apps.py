@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class RagConfig(AppConfig):
     name = "apps.rag"
     verbose_name = "RAG Publishing"
+
+    def ready(self) -> None:
+        from . import signals
+
+        signals.connect()
@@ -0,0 +1,109 @@
+"""Site copy that RAG retrieval searches over, split into overlapping chunks."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils.html import strip_tags
+
+from apps.content.models import BlogPost, Ebook, PageSection, Service
+
+from .models import ContentChunk
+
+
+@dataclass(frozen=True)
+class Document:
+    source: str
+    object_id: int
+    title: str
+    slug: str
+    text: str
+
+
+def chunk_text(text: str, max_words: int = 0, overlap: int = -1) -> List[str]:
+    """Split ``text`` into windows of ``max_words`` words sharing ``overlap`` words."""
+    max_words = max_words or settings.RAG_CHUNK_WORDS
+    overlap = settings.RAG_CHUNK_OVERLAP if overlap < 0 else overlap
+    words = strip_tags(text).split()
+    if not words:
+        return []
+    step = max(max_words - overlap, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return chunks
+
+
+def _section_documents(queryset) -> Iterator[Document]:  # noqa: ANN001
+    sections = queryset.select_related("page").only("heading", "body", "page__slug")
+    for section in sections.iterator():
+        yield Document(
+            ContentChunk.PAGE_SECTION,
+            section.pk,
+            f"{section.page.get_slug_display()}: {section.heading}",
+            section.page.slug,
+            f"{section.heading}\n\n{section.body}",
+        )
+
+
+def _row_documents(source: str, queryset, *fields: str) -> Iterator[Document]:  # noqa: ANN001
+    for pk, title, slug, text in queryset.values_list("pk", *fields).iterator():
+        yield Document(source, pk, title, slug, text)
+
+
+SOURCES: Dict[str, Tuple[Callable[[], QuerySet], Callable[[QuerySet], Iterator[Document]]]] = {
+    ContentChunk.PAGE_SECTION: (PageSection.objects.all, _section_documents),
+    ContentChunk.BLOG_POST: (
+        lambda: BlogPost.objects.filter(is_published=True),
+        lambda queryset: _row_documents(ContentChunk.BLOG_POST, queryset, "title", "slug", "content"),
+    ),
+    ContentChunk.SERVICE: (
+        Service.objects.all,
+        lambda queryset: _row_documents(ContentChunk.SERVICE, queryset, "name", "slug", "long_description"),
+    ),
+    ContentChunk.EBOOK: (
+        Ebook.objects.all,
+        lambda queryset: _row_documents(ContentChunk.EBOOK, queryset, "title", "slug", "summary"),
+    ),
+}
+
+
+def iter_documents(source: Optional[str] = None, object_ids: Optional[Iterable[int]] = None) -> Iterator[Document]:
+    """Yield indexable documents, optionally only ``object_ids`` of one ``source``.
+
+    Objects that are gone or no longer indexable (e.g. unpublished posts) are
+    simply not yielded.
+    """
+    for name, (queryset, build) in SOURCES.items():
+        if source is not None and name != source:
+            continue
+        rows = queryset()
+        if object_ids is not None:
+            rows = rows.filter(pk__in=list(object_ids))
+        yield from build(rows)
+
+
+def mock_documents() -> Iterator[Document]:
+    from apps.content import mocks
+
+    position = 0
+    for page_slug, page in mocks.MOCK_PAGES.items():
+        for section in page.get("sections", []):
+            position += 1
+            yield Document(
+                ContentChunk.PAGE_SECTION,
+                position,
+                f"{page_slug.title()}: {section['heading']}",
+                page_slug,
+                f"{section['heading']}\n\n{section['body']}",
+            )
+    for position, post in enumerate(mocks.MOCK_BLOG_POSTS, start=1):
+        yield Document(ContentChunk.BLOG_POST, position, post["title"], post["slug"], post["content"])
+    for position, service in enumerate(mocks.MOCK_SERVICES, start=1):
+        yield Document(ContentChunk.SERVICE, position, service["name"], service["slug"], service["long_description"])
+    for position, ebook in enumerate(mocks.MOCK_EBOOKS, start=1):
+        yield Document(ContentChunk.EBOOK, position, ebook["title"], ebook["slug"], ebook["summary"])
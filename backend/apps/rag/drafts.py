@@ -0,0 +1,94 @@
+"""Per-process memo of generated drafts.
+
+Entries are keyed by page, normalized prompt, model and the content version:
+the RAG index generation (bumped whenever any indexed chunk changes) plus the
+page's publish version. Editing any source therefore makes older entries
+unreachable, and they age out through the LRU bound or TTL.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+from apps.content.models import Page
+
+from .index import get_generation
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", prompt or "").split())
+
+
+def content_version(page_slug: str) -> Tuple[Any, ...]:
+    if settings.ENABLE_MOCKS:
+        return ("mock",)
+    # Not the snapshot version: that row appears on the page's first read, which is no content change.
+    version = Page.objects.filter(slug=page_slug).values_list("version", flat=True).first()
+    return (get_generation(), version or 0)
+
+
+def draft_key(page_slug: str, prompt: str, model: str) -> Tuple[Hashable, ...]:
+    return (page_slug, normalize_prompt(prompt), model, content_version(page_slug))
+
+
+class DraftCache:
+    """Thread-safe LRU with a TTL and hit/miss counters."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # Callers append to and annotate drafts, so hand out copies.
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+draft_cache = DraftCache(max_entries=settings.RAG_DRAFT_CACHE_SIZE, ttl=settings.RAG_DRAFT_CACHE_TTL)
+
+
+def cache_metadata(hit: bool) -> Dict[str, Any]:
+    return {"hit": hit, **draft_cache.stats()}
@@ -0,0 +1,104 @@
+"""Embedding providers for RAG retrieval.
+
+Providers turn a batch of texts into an ``(n, dimensions)`` float32 matrix of
+L2-normalized rows, so cosine similarity is a plain dot product. The provider is
+picked with ``RAG_EMBEDDER``: a registered name or a dotted path to an
+``Embedder`` subclass.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(strip_tags(text).lower())
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class Embedder(ABC):
+    name = "base"
+    # Most texts a single ``embed`` call may receive; callers batch up to it.
+    max_batch_size = 256
+
+    def __init__(self, dimensions: int) -> None:
+        self.dimensions = dimensions
+
+    @property
+    def signature(self) -> str:
+        """Identifies vectors this embedder can be compared with."""
+        return f"{self.name}:{self.dimensions}"
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """An ``(len(texts), dimensions)`` float32 matrix of L2-normalized rows."""
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic offline embedder using signed feature hashing.
+
+    Unigrams and bigrams are hashed into ``dimensions`` buckets with a sign bit
+    to cancel collisions on average. No model download or network access is
+    needed and the same text always gets the same vector in every process.
+    """
+
+    name = "hashing"
+    max_batch_size = 2048
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        rows: List[int] = []
+        columns: List[int] = []
+        signs: List[float] = []
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+            for feature in features:
+                column, sign = self._bucket(feature)
+                rows.append(row)
+                columns.append(column)
+                signs.append(sign)
+        if rows:
+            np.add.at(matrix, (np.asarray(rows), np.asarray(columns)), np.asarray(signs, dtype=np.float32))
+        return normalize(matrix)
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        return _hash_feature(feature, self.dimensions)
+
+
+@lru_cache(maxsize=65536)
+def _hash_feature(feature: str, dimensions: int) -> Tuple[int, float]:
+    # Python's hash() is salted per process; blake2b keeps vectors stable.
+    value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dimensions, 1.0 if value >> 63 else -1.0
+
+
+EMBEDDERS: Dict[str, type] = {
+    HashingEmbedder.name: HashingEmbedder,
+}
+
+
+@lru_cache(maxsize=None)
+def get_embedder() -> Embedder:
+    path = settings.RAG_EMBEDDER
+    embedder_class = EMBEDDERS.get(path) or import_string(path)
+    return embedder_class(dimensions=settings.RAG_EMBEDDING_DIMENSIONS)
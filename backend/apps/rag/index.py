@@ -0,0 +1,160 @@
+"""Vector search over ``ContentChunk`` embeddings.
+
+``RAG_INDEX_BACKEND`` picks the search structure: ``exact`` keeps every chunk
+vector in one contiguous float32 matrix and answers top-k cosine queries with a
+single matrix-vector product; ``ivf`` uses the memory-mapped approximate index
+in ``ann``. Both return chunk ids, which ``retrieve`` resolves to their text.
+Each process reloads its index when the generation in the shared cache moves
+on, which ``indexing`` bumps after committing chunk changes.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from . import ann
+from .documents import chunk_text, mock_documents
+from .embeddings import Embedder, get_embedder
+from .models import ContentChunk
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "rag:index:generation"
+
+
+class VectorIndex:
+    """Exact top-k search over an in-memory matrix."""
+
+    def __init__(self, matrix: np.ndarray, ids: np.ndarray) -> None:
+        if len(matrix) != len(ids):
+            raise ValueError("Every vector needs exactly one id")
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.ids = np.asarray(ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, embedder: Embedder) -> "VectorIndex":
+        rows = list(
+            ContentChunk.objects.filter(embedder=embedder.signature)
+            .order_by("pk")
+            .values_list("pk", "embedding")
+            .iterator()
+        )
+        matrix = np.empty((len(rows), embedder.dimensions), dtype=np.float32)
+        for row, (_, embedding) in enumerate(rows):
+            matrix[row] = np.frombuffer(embedding, dtype=np.float32)
+        return cls(matrix, np.array([pk for pk, _ in rows], dtype=np.int64))
+
+    def search(self, query: np.ndarray, k: int, exclude: Sequence[int] = ()) -> List[Tuple[int, float]]:
+        """Return ``(id, cosine)`` pairs for the ``k`` vectors closest to ``query``, skipping ``exclude``."""
+        if not len(self):
+            return []
+        scores = self.matrix @ query.astype(np.float32, copy=False)
+        if len(exclude):
+            scores[np.isin(self.ids, np.asarray(exclude, dtype=np.int64))] = -np.inf
+        return ann.top_k(scores, self.ids, k)
+
+
+def get_generation() -> int:
+    cache.add(GENERATION_KEY, 1, None)
+    return cache.get(GENERATION_KEY) or 1
+
+
+def bump_generation() -> None:
+    cache.add(GENERATION_KEY, 1, None)
+    cache.incr(GENERATION_KEY)
+
+
+def mark_changed() -> None:
+    """Make every process reload the index once the current transaction commits."""
+    transaction.on_commit(bump_generation)
+
+
+_loaded: Optional[Tuple[int, Any]] = None
+_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _mock_corpus() -> Tuple[VectorIndex, List[Dict[str, Any]]]:
+    entries = []
+    for document in mock_documents():
+        for text in chunk_text(document.text):
+            entries.append({"source": document.source, "slug": document.slug, "title": document.title, "text": text})
+    embedder = get_embedder()
+    matrix = embedder.embed([entry["text"] for entry in entries])
+    return VectorIndex(matrix, np.arange(len(entries))), entries
+
+
+def _load(embedder: Embedder) -> Any:
+    if settings.RAG_INDEX_BACKEND == "ivf":
+        index = ann.load(embedder)
+        if index is not None:
+            return index
+    return VectorIndex.load(embedder)
+
+
+def get_index() -> Any:
+    """Return this process's index for the current generation."""
+    global _loaded
+    generation = get_generation()
+    loaded = _loaded
+    if loaded is not None and loaded[0] == generation:
+        return loaded[1]
+    with _load_lock:
+        if _loaded is None or _loaded[0] != generation:
+            index = _load(get_embedder())
+            logger.info(
+                "Loaded RAG index generation %s (%s) with %s chunks",
+                generation,
+                type(index).__name__,
+                len(index),
+            )
+            _loaded = (generation, index)
+        return _loaded[1]
+
+
+def _describe(ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    rows = ContentChunk.objects.filter(pk__in=list(ids)).values("pk", "source", "slug", "title", "text")
+    return {row.pop("pk"): row for row in rows}
+
+
+def retrieve(query: str, k: Optional[int] = None, exclude: Sequence[Tuple[str, str]] = ()) -> List[Dict[str, Any]]:
+    """Return the ``k`` chunks most similar to ``query``, best first.
+
+    ``exclude`` holds ``(source, slug)`` pairs to leave out, e.g. the page being drafted.
+    """
+    k = settings.RAG_TOP_K if k is None else k
+    vector = get_embedder().embed_one(query)
+    if not vector.any():
+        return []
+    if settings.ENABLE_MOCKS:
+        index, entries = _mock_corpus()
+        excluded = [row for row, entry in enumerate(entries) if (entry["source"], entry["slug"]) in exclude]
+        hits = index.search(vector, k, excluded)
+        described = {row: entries[row] for row, _ in hits}
+    else:
+        index = get_index()
+        excluded = []
+        if exclude:
+            condition = Q()
+            for source, slug in exclude:
+                condition |= Q(source=source, slug=slug)
+            excluded = list(ContentChunk.objects.filter(condition).values_list("pk", flat=True))
+        hits = index.search(vector, k, excluded)
+        described = _describe([chunk_id for chunk_id, _ in hits])
+    # Chunks deleted since the index was loaded are dropped here.
+    return [
+        {**described[chunk_id], "score": round(score, 4)}
+        for chunk_id, score in hits
+        if score > 0 and chunk_id in described
+    ]
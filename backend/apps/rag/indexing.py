@@ -0,0 +1,171 @@
+"""Keeps ``ContentChunk`` rows in step with site content.
+
+Documents are re-chunked and every chunk is hashed; only chunks whose text or
+embedder changed are sent to the embedder, in batches of up to the provider's
+``max_batch_size``. Chunks left over from shortened or removed documents are
+deleted. Content signals and ``publish_draft`` queue the objects they touched
+with ``schedule``, which reindexes them once the transaction commits.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import ann
+from .documents import Document, chunk_text, iter_documents
+from .embeddings import get_embedder
+from .index import mark_changed
+from .models import ContentChunk
+
+logger = logging.getLogger(__name__)
+
+_EMBEDDED_FIELDS = ["title", "slug", "text", "content_hash", "embedder", "embedding", "updated_at"]
+
+
+@dataclass
+class IndexResult:
+    documents: int = 0
+    chunks: int = 0
+    embedded: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    # Chunk ids whose vectors were written or removed, for the ANN index.
+    changed_ids: List[int] = field(default_factory=list, repr=False)
+    removed_ids: List[int] = field(default_factory=list, repr=False)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _sync(
+    documents: Iterable[Document],
+    existing_rows: QuerySet,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    in_request: bool = False,
+) -> IndexResult:
+    embedder = get_embedder()
+    limit = min(batch_size or embedder.max_batch_size, embedder.max_batch_size)
+    existing = {
+        (source, object_id, position): (pk, digest, signature, title, slug)
+        for pk, source, object_id, position, digest, signature, title, slug in existing_rows.values_list(
+            "pk", "source", "object_id", "position", "content_hash", "embedder", "title", "slug"
+        ).iterator()
+    }
+    result = IndexResult()
+    pending: List[ContentChunk] = []
+    retitled: List[ContentChunk] = []
+
+    def flush() -> None:
+        vectors = embedder.embed([chunk.text for chunk in pending])
+        now = timezone.now()
+        for chunk, vector in zip(pending, vectors):
+            chunk.embedding = vector.tobytes()
+            chunk.updated_at = now
+        ContentChunk.objects.bulk_create([chunk for chunk in pending if chunk.pk is None])
+        ContentChunk.objects.bulk_update([chunk for chunk in pending if chunk.pk is not None], _EMBEDDED_FIELDS)
+        result.embedded += len(pending)
+        result.changed_ids.extend(chunk.pk for chunk in pending)
+        pending.clear()
+
+    for document in documents:
+        result.documents += 1
+        title = document.title[:255]
+        for position, text in enumerate(chunk_text(document.text)):
+            result.chunks += 1
+            digest = content_hash(text)
+            current = existing.pop((document.source, document.object_id, position), None)
+            chunk = ContentChunk(
+                pk=current[0] if current else None,
+                source=document.source,
+                object_id=document.object_id,
+                position=position,
+                title=title,
+                slug=document.slug,
+                text=text,
+                content_hash=digest,
+                embedder=embedder.signature,
+            )
+            if not force and current and current[1:3] == (digest, embedder.signature):
+                result.skipped += 1
+                if current[3:] != (title, document.slug):
+                    retitled.append(chunk)
+                continue
+            pending.append(chunk)
+            if len(pending) >= limit:
+                flush()
+    if pending:
+        flush()
+    if retitled:
+        ContentChunk.objects.bulk_update(retitled, ["title", "slug"])
+    # Anything not matched above belongs to a removed document or to positions
+    # past the end of a document that got shorter.
+    stale = [row[0] for row in existing.values()]
+    for start in range(0, len(stale), 1000):
+        ContentChunk.objects.filter(pk__in=stale[start:start + 1000]).delete()
+    result.deleted = len(stale)
+    result.removed_ids = stale
+    if result.embedded or result.deleted or retitled:
+        mark_changed()
+    if settings.RAG_INDEX_BACKEND == "ivf" and (
+        force or result.embedded or result.deleted or (not in_request and ann.pending())
+    ):
+        transaction.on_commit(
+            partial(ann.apply_changes, result.changed_ids, result.removed_ids, full=force, in_request=in_request)
+        )
+    return result
+
+
+def reindex(force: bool = False, batch_size: Optional[int] = None) -> IndexResult:
+    """Bring every chunk up to date; ``force`` re-embeds unchanged chunks too."""
+    with transaction.atomic():
+        result = _sync(iter_documents(), ContentChunk.objects.all(), force=force, batch_size=batch_size)
+    logger.info("Reindexed RAG content: %s", result)
+    return result
+
+
+def reindex_objects(source: str, object_ids: Iterable[int]) -> IndexResult:
+    object_ids = set(object_ids)
+    with transaction.atomic():
+        return _sync(
+            iter_documents(source, object_ids),
+            ContentChunk.objects.filter(source=source, object_id__in=object_ids),
+            # Runs from the edit's commit hook, so index writes must not stall the request.
+            in_request=True,
+        )
+
+
+_pending = threading.local()
+
+
+def schedule(source: str, object_ids: Iterable[int]) -> None:
+    """Reindex ``object_ids`` of ``source`` after the current transaction commits.
+
+    Objects queued within one transaction are reindexed together by the first
+    commit callback; the later ones find nothing left to do.
+    """
+    if not settings.RAG_AUTO_REINDEX:
+        return
+    queued: Dict[str, Set[int]] = _pending.__dict__.setdefault("queued", {})
+    queued.setdefault(source, set()).update(object_ids)
+    transaction.on_commit(_flush_scheduled)
+
+
+def _flush_scheduled() -> None:
+    queued: Dict[str, Set[int]] = _pending.__dict__.pop("queued", {})
+    for source, object_ids in queued.items():
+        try:
+            reindex_objects(source, object_ids)
+        except Exception:
+            # The edit itself is committed; the next ``reindex_content`` run catches up.
+            logger.exception("Failed to reindex %s %s", source, sorted(object_ids))
@@ -0,0 +1,94 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.rag.ann import IVFIndex, default_nlist
+from apps.rag.embeddings import normalize
+from apps.rag.index import VectorIndex
+
+_BLOCK = 65536
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the IVF index with exact search on synthetic clustered vectors, reporting "
+        "recall@k and p50/p99 query latency per corpus size and nprobe."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated corpus sizes.")
+        parser.add_argument("--dimensions", type=int, default=settings.RAG_EMBEDDING_DIMENSIONS)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("-k", type=int, default=10)
+        parser.add_argument("--nlist", type=int, default=0, help="Lists per index (default ~4 * sqrt(size)).")
+        parser.add_argument("--nprobe", default="1,4,8,16,32", help="Comma-separated nprobe values.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        probes = [int(probe) for probe in options["nprobe"].split(",")]
+        k = options["k"]
+        with tempfile.TemporaryDirectory(prefix="rag-ann-bench-") as workdir:
+            for size in sizes:
+                self._run(Path(workdir), size, probes, k, options)
+
+    def _run(self, workdir: Path, size: int, probes, k: int, options) -> None:  # noqa: ANN001
+        rng = np.random.default_rng(options["seed"])
+        dimensions = options["dimensions"]
+        vectors, queries = self._dataset(workdir / f"vectors-{size}.npy", size, dimensions, options["queries"], rng)
+        ids = np.arange(size, dtype=np.int64)
+
+        exact = VectorIndex(vectors, ids)
+        truth, exact_latency = [], []
+        for query in queries:
+            started = time.perf_counter()
+            hits = exact.search(query, k)
+            exact_latency.append(time.perf_counter() - started)
+            truth.append({chunk_id for chunk_id, _ in hits})
+
+        started = time.perf_counter()
+        nlist = options["nlist"] or default_nlist(size)
+        built = IVFIndex.build(vectors, ids, nlist=nlist, seed=options["seed"])
+        built.save(workdir / f"ivf-{size}", {})
+        build_seconds = time.perf_counter() - started
+        del built
+        index, _ = IVFIndex.open(workdir / f"ivf-{size}")
+
+        self.stdout.write(
+            f"\n{size:,} vectors x {dimensions} dims, {len(queries)} queries, k={k}, "
+            f"nlist={index.nlist}, build {build_seconds:.1f}s"
+        )
+        self.stdout.write(f"  {'exact':<12} recall 1.000  {self._latency(exact_latency)}")
+        for nprobe in probes:
+            latency, recall = [], []
+            for query, expected in zip(queries, truth):
+                started = time.perf_counter()
+                hits = index.search(query, k, nprobe=nprobe)
+                latency.append(time.perf_counter() - started)
+                recall.append(len(expected & {chunk_id for chunk_id, _ in hits}) / k)
+            self.stdout.write(
+                f"  {'nprobe=' + str(nprobe):<12} recall {np.mean(recall):.3f}  {self._latency(latency)}"
+            )
+
+    def _latency(self, samples) -> str:  # noqa: ANN001
+        p50, p99 = np.percentile(np.asarray(samples) * 1000, [50, 99])
+        return f"p50 {p50:8.3f} ms  p99 {p99:8.3f} ms"
+
+    def _dataset(self, path: Path, size: int, dimensions: int, queries: int, rng):  # noqa: ANN001, ANN202
+        """Gaussian clusters on the unit sphere, written to a memmap so 1M rows fit comfortably."""
+        centers = normalize(rng.standard_normal((max(size // 1000, 16), dimensions)).astype(np.float32))
+
+        def draw(count: int) -> np.ndarray:
+            labels = rng.integers(len(centers), size=count)
+            noise = rng.standard_normal((count, dimensions)).astype(np.float32) * (1.0 / np.sqrt(dimensions))
+            return normalize(centers[labels] + noise)
+
+        vectors = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(size, dimensions))
+        for start in range(0, size, _BLOCK):
+            vectors[start:start + _BLOCK] = draw(min(_BLOCK, size - start))
+        vectors.flush()
+        return np.load(path, mmap_mode="r"), draw(queries)
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.rag.embeddings import get_embedder
+from apps.rag.indexing import IndexResult, reindex
+
+
+class Command(BaseCommand):
+    help = (
+        "Chunk and embed page sections, blog posts, services and ebooks for RAG retrieval. "
+        "Only new or changed chunks are embedded unless --full is given."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--full", action="store_true", help="Re-embed every chunk, changed or not.")
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Run a full reindex followed by an incremental one and report both.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Chunks per embedding call (capped at the embedder's limit).",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        self.stdout.write(f"Embedder: {get_embedder().signature}")
+        modes = [True, False] if options["compare"] else [options["full"]]
+        for full in modes:
+            started = time.perf_counter()
+            result = reindex(force=full, batch_size=options["batch_size"])
+            self._report("full" if full else "incremental", result, time.perf_counter() - started)
+
+    def _report(self, mode: str, result: IndexResult, elapsed: float) -> None:
+        self.stdout.write(
+            f"{mode:<11} {elapsed:7.2f}s  documents {result.documents}  chunks {result.chunks}  "
+            f"embedded {result.embedded}  skipped {result.skipped}  deleted {result.deleted}"
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('page-section', 'Page section'), ('blog-post', 'Blog post'), ('service', 'Service'), ('ebook', 'Ebook')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('title', models.CharField(max_length=255)),
+                ('slug', models.CharField(max_length=100)),
+                ('text', models.TextField()),
+                ('embedder', models.CharField(max_length=100)),
+                ('embedding', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['source', 'object_id', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('source', 'object_id', 'position'), name='rag_chunk_source_uniq')],
+            },
+        ),
+    ]
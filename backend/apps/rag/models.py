@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.db import models
+
+
+class ContentChunk(models.Model):
+    """A slice of site copy with its embedding, the unit of RAG retrieval."""
+
+    PAGE_SECTION = "page-section"
+    BLOG_POST = "blog-post"
+    SERVICE = "service"
+    EBOOK = "ebook"
+
+    SOURCE_CHOICES = [
+        (PAGE_SECTION, "Page section"),
+        (BLOG_POST, "Blog post"),
+        (SERVICE, "Service"),
+        (EBOOK, "Ebook"),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    position = models.PositiveIntegerField(default=0)
+    title = models.CharField(max_length=255)
+    # Slug of the page, post, service or ebook the chunk links back to.
+    slug = models.CharField(max_length=100)
+    text = models.TextField()
+    # sha256 of ``text``; unchanged chunks keep their embedding on reindex.
+    content_hash = models.CharField(max_length=64, blank=True)
+    # Name and width of the embedder that produced ``embedding``; rows from a
+    # different embedder are ignored until the content is reindexed.
+    embedder = models.CharField(max_length=100)
+    # float32 vector, L2-normalized.
+    embedding = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["source", "object_id", "position"]
+        constraints = [
+            models.UniqueConstraint(fields=["source", "object_id", "position"], name="rag_chunk_source_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.source}:{self.object_id}#{self.position}"
@@ -0,0 +1,76 @@
+"""Async draft generators for streaming previews.
+
+A provider turns the editor's prompt and the retrieved sources into draft text,
+yielded piece by piece as it is produced. The provider is picked with
+``RAG_GENERATOR``: a registered name or a dotted path to a ``DraftProvider``
+subclass. Consumers stop iterating (and ``aclose`` the stream) when the client
+goes away, so providers should release upstream requests in ``finally``.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class DraftRequest:
+    page_slug: str
+    prompt: str
+    sections: List[Dict[str, Any]]
+    sources: List[Dict[str, Any]]
+
+
+class DraftProvider(ABC):
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    def stream(self, request: DraftRequest) -> AsyncIterator[str]:
+        """Yield the draft text piece by piece; implement as an ``async def`` generator."""
+
+
+class FakeDraftProvider(DraftProvider):
+    """Offline provider that emits a templated draft one word at a time.
+
+    ``RAG_FAKE_TOKEN_DELAY`` seconds pass between words, which is enough to
+    exercise streaming, back-pressure and cancellation without a model.
+    """
+
+    name = "fake"
+    model = "fake-draft"
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def compose(self, request: DraftRequest) -> str:
+        lead = request.prompt.strip() or f"Suggested update for the {request.page_slug} page."
+        if not request.sources:
+            return lead
+        titles = ", ".join(dict.fromkeys(source["title"] for source in request.sources))
+        return f"{lead}\n\nGrounded in: {titles}."
+
+    async def stream(self, request: DraftRequest) -> AsyncIterator[str]:
+        for token in re.findall(r"\S+\s*", self.compose(request)):
+            await asyncio.sleep(self.delay)
+            yield token
+
+
+PROVIDERS: Dict[str, type] = {
+    FakeDraftProvider.name: FakeDraftProvider,
+}
+
+
+@lru_cache(maxsize=None)
+def get_provider() -> DraftProvider:
+    path = settings.RAG_GENERATOR
+    provider_class = PROVIDERS.get(path) or import_string(path)
+    if provider_class is FakeDraftProvider:
+        return FakeDraftProvider(delay=settings.RAG_FAKE_TOKEN_DELAY)
+    return provider_class()
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from apps.content.models import PageSection
+
+
+class SectionUpdateSerializer(serializers.Serializer):
+    """One entry of a publish's ``sections``; omitted fields keep their current value."""
+
+    order = serializers.IntegerField(min_value=0, default=0)
+    heading = serializers.CharField(
+        max_length=PageSection._meta.get_field("heading").max_length, required=False, trim_whitespace=False
+    )
+    body = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
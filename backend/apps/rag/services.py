@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from types import SimpleNamespace
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
-from apps.content.models import Page
+from apps.content import revalidation
+from apps.content.models import Page, PageRevision, PageSection
+from apps.content.snapshots import refresh_snapshot
+from apps.core.metrics import timed
+
+from . import indexing
+from .drafts import cache_metadata, draft_cache, draft_key
+from .index import retrieve
+from .models import ContentChunk
 
 if settings.ENABLE_MOCKS:
     from apps.content.mocks import get_mock_page, get_mock_sections  # type: ignore F401
@@ -25,19 +35,28 @@ class RagDraft:
     metadata: Dict[str, Any]
 
 
-def generate_draft(page_slug: str, prompt: str) -> RagDraft:
+def _retrieve_sources(page_slug: str, prompt: str, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # The page's own sections are already in the draft, so search the rest of
+    # the site; without a prompt the page copy itself is the query.
+    query = prompt or " ".join(str(section.get("body", "")) for section in sections)
+    return retrieve(query, exclude=[(ContentChunk.PAGE_SECTION, page_slug)])
+
+
+@timed("rag")
+def gather_context(page_slug: str, prompt: str) -> RagDraft:
+    """Load the page's current sections and retrieve grounding sources, without drafting."""
     if settings.ENABLE_MOCKS:
         page = get_mock_page(page_slug)
         if not page:
             raise Page.DoesNotExist
         sections = get_mock_sections(page_slug)
-        sections.append({"heading": "AI Draft", "body": prompt or "Mocked RAG suggestion"})
         metadata = {
             "model": settings.RAG_MODEL_NAME,
             "provider": settings.RAG_PROVIDER,
+            "sources": _retrieve_sources(page_slug, prompt, sections),
+            "version": 1,
             "mock": True,
         }
-        logger.info("Generated mock draft for page %s", page_slug)
         return RagDraft(page=SimpleNamespace(slug=page_slug), sections=sections, metadata=metadata)
 
     page = Page.objects.get(slug=page_slug)
@@ -45,35 +64,238 @@ def generate_draft(page_slug: str, prompt: str) -> RagDraft:
         {"heading": section.heading, "body": section.body}
         for section in page.sections.all()
     ]
-    sections.append({"heading": "AI Draft", "body": prompt})
     metadata = {
         "model": settings.RAG_MODEL_NAME,
         "provider": settings.RAG_PROVIDER,
+        "sources": _retrieve_sources(page.slug, prompt, sections),
+        # Publishing with this version fails if the page changes in the meantime.
+        "version": page.version,
     }
-    logger.info("Generated draft for page %s", page.slug)
     return RagDraft(page=page, sections=sections, metadata=metadata)
 
 
-@transaction.atomic
-def publish_draft(page_slug: str, updates: Iterable[Dict[str, Any]]) -> Page:
-    if settings.ENABLE_MOCKS:
-        logger.info("Mock mode: publishing draft for %s skipped", page_slug)
-        return SimpleNamespace(slug=page_slug)
+@timed("rag")
+def generate_draft(page_slug: str, prompt: str) -> RagDraft:
+    key = draft_key(page_slug, prompt, settings.RAG_MODEL_NAME)
+    draft = draft_cache.get(key)
+    hit = draft is not None
+    if hit:
+        logger.info("Served cached draft for page %s", page_slug)
+    else:
+        draft = gather_context(page_slug, prompt)
+        if settings.ENABLE_MOCKS:
+            draft.sections.append({"heading": "AI Draft", "body": prompt or "Mocked RAG suggestion"})
+            logger.info("Generated mock draft for page %s", page_slug)
+        else:
+            draft.sections.append({"heading": "AI Draft", "body": prompt})
+            logger.info("Generated draft for page %s", draft.page.slug)
+        draft_cache.set(key, draft)
+    draft.metadata["cache"] = cache_metadata(hit)
+    return draft
+
+
+class PublishConflict(Exception):
+    """The page was published by someone else since the caller read it."""
+
+    def __init__(self, page_slug: str, version: Optional[int]) -> None:
+        super().__init__(f"Page {page_slug} is at version {version}")
+        self.page_slug = page_slug
+        self.version = version
+
+
+@dataclass
+class PublishResult:
+    page: Any
+    version: int
+    created: List[int] = field(default_factory=list)
+    updated: List[int] = field(default_factory=list)
+    deleted: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+SECTION_FIELDS = ("heading", "body")
+
+
+@dataclass
+class SectionPlan:
+    """Section writes for one publish plus the revision entries describing them."""
+
+    create: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[PageSection] = field(default_factory=list)
+    delete: List[PageSection] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+    changes: List[Dict[str, Any]] = field(default_factory=list)
 
-    page = Page.objects.select_for_update().get(slug=page_slug)
-    existing_sections = {section.order: section for section in page.sections.all()}
+    def set(self, existing: Dict[int, PageSection], order: int, values: Optional[Dict[str, Any]]) -> None:
+        """Plan the section at ``order`` to hold ``values``, or to be gone when None."""
+        section = existing.get(order)
+        if section is None:
+            if values is not None:
+                self.create.append({**values, "order": order})
+                self.changes.append({"order": order, "op": "create", "before": None, "after": values})
+            return
+        if values is None:
+            self.delete.append(section)
+            before = {name: getattr(section, name) for name in SECTION_FIELDS}
+            self.changes.append({"order": order, "op": "delete", "before": before, "after": None})
+            return
+        changed = [name for name in SECTION_FIELDS if name in values and values[name] != getattr(section, name)]
+        if not changed:
+            self.unchanged.append(order)
+            return
+        before = {name: getattr(section, name) for name in changed}
+        for name in changed:
+            setattr(section, name, values[name])
+        self.update.append(section)
+        self.changes.append(
+            {"order": order, "op": "update", "before": before, "after": {name: values[name] for name in changed}}
+        )
+
+
+def diff_sections(existing: Dict[int, PageSection], updates: Iterable[Dict[str, Any]]) -> SectionPlan:
+    """Plan the writes that turn ``existing`` into ``updates``, skipping unchanged sections.
+
+    Updates are keyed by ``order``; when an order repeats, the last update wins.
+    """
+    planned: Dict[int, Dict[str, Any]] = {}
     for update in updates:
         order = update.get("order", 0)
-        section = existing_sections.get(order)
-        if section:
-            section.heading = update.get("heading", section.heading)
-            section.body = update.get("body", section.body)
-            section.save(update_fields=["heading", "body"])
-        else:
-            page.sections.create(
-                heading=update.get("heading", "New Section"),
-                body=update.get("body", ""),
-                order=order,
-            )
-    logger.info("Published updates for page %s", page.slug)
-    return page
+        planned.setdefault(order, {}).update(update)
+    plan = SectionPlan()
+    for order, update in planned.items():
+        values = {name: update[name] for name in SECTION_FIELDS if name in update}
+        if order not in existing:
+            values = {"heading": values.get("heading", "New Section"), "body": values.get("body", "")}
+        plan.set(existing, order, values)
+    return plan
+
+
+def _read_page(page_slug: str, expected_version: Optional[int]) -> Tuple[Page, Dict[int, PageSection]]:
+    # The version is read before the sections, so a publish landing in between
+    # makes the later compare-and-swap fail rather than go unnoticed.
+    page = Page.objects.get(slug=page_slug)
+    if expected_version is not None and page.version != expected_version:
+        raise PublishConflict(page.slug, page.version)
+    return page, {section.order: section for section in page.sections.all()}
+
+
+def _commit(page: Page, plan: SectionPlan, author: Any = None, restored_version: Optional[int] = None) -> PublishResult:
+    """Write ``plan`` if the page is still at the version it was planned against.
+
+    The version bump is a compare-and-swap, so nothing is locked while the plan
+    is built; a publish that finds the page moved on raises ``PublishConflict``.
+    """
+    result = PublishResult(
+        page=page,
+        version=page.version,
+        created=sorted(values["order"] for values in plan.create),
+        updated=sorted(section.order for section in plan.update),
+        deleted=sorted(section.order for section in plan.delete),
+        unchanged=sorted(plan.unchanged),
+    )
+    if not result.changed:
+        return result
+    now = timezone.now()
+    with transaction.atomic():
+        swapped = Page.objects.filter(pk=page.pk, version=page.version).update(version=F("version") + 1, updated_at=now)
+        if not swapped:
+            current = Page.objects.filter(pk=page.pk).values_list("version", flat=True).first()
+            raise PublishConflict(page.slug, current)
+        page.version += 1
+        for section in plan.update:
+            section.updated_at = now
+        PageSection.objects.bulk_update(plan.update, [*SECTION_FIELDS, "updated_at"])
+        created = PageSection.objects.bulk_create(
+            PageSection(page=page, created_at=now, updated_at=now, **values) for values in plan.create
+        )
+        removed = [section.pk for section in plan.delete]
+        if removed:
+            PageSection.objects.filter(pk__in=removed).delete()
+        PageRevision.objects.create(
+            page=page,
+            version=page.version,
+            changes=plan.changes,
+            restored_version=restored_version,
+            author=author if getattr(author, "is_authenticated", False) else None,
+        )
+        # Bulk writes skip model signals, so refresh what they would have.
+        refresh_snapshot(page.pk)
+        revalidation.schedule(revalidation.page_paths(page.slug))
+        # Re-embeds only the chunks whose text changed, after the publish commits.
+        indexing.schedule(
+            ContentChunk.PAGE_SECTION, [section.pk for section in (*plan.update, *created)] + removed
+        )
+    result.version = page.version
+    return result
+
+
+@timed("rag")
+def publish_draft(
+    page_slug: str,
+    updates: Iterable[Dict[str, Any]],
+    expected_version: Optional[int] = None,
+    author: Any = None,
+) -> PublishResult:
+    """Apply ``updates`` to the page's sections as a new revision.
+
+    Raises ``PublishConflict`` when the page is no longer at ``expected_version``
+    (or changed while the publish was being planned) instead of waiting on it.
+    """
+    if settings.ENABLE_MOCKS:
+        logger.info("Mock mode: publishing draft for %s skipped", page_slug)
+        return PublishResult(page=SimpleNamespace(slug=page_slug), version=expected_version or 1)
+
+    page, existing = _read_page(page_slug, expected_version)
+    result = _commit(page, diff_sections(existing, updates), author=author)
+    logger.info(
+        "Published page %s v%s: %s created, %s updated, %s unchanged",
+        page.slug,
+        result.version,
+        len(result.created),
+        len(result.updated),
+        len(result.unchanged),
+    )
+    return result
+
+
+@timed("rag")
+def rollback_page(
+    page_slug: str,
+    version: int,
+    expected_version: Optional[int] = None,
+    author: Any = None,
+) -> PublishResult:
+    """Restore the page's sections to how they were at ``version``.
+
+    Undoes the newer revisions' changes in reverse and records the result as a
+    new revision, so a rollback can itself be rolled back.
+    """
+    if settings.ENABLE_MOCKS:
+        logger.info("Mock mode: rollback for %s skipped", page_slug)
+        return PublishResult(page=SimpleNamespace(slug=page_slug), version=expected_version or 1)
+
+    page, existing = _read_page(page_slug, expected_version)
+    if not 1 <= version <= page.version:
+        raise PageRevision.DoesNotExist(f"Page {page_slug} has no version {version}")
+    revisions = PageRevision.objects.filter(page=page, version__gt=version, version__lte=page.version)
+    target: Dict[int, Optional[Dict[str, Any]]] = {}
+    for revision in revisions.order_by("-version").only("changes"):
+        for change in revision.changes:
+            order = change["order"]
+            if change["op"] == "create":
+                target[order] = None
+            else:
+                # Walking backwards, the oldest ``before`` seen is the value at ``version``.
+                target[order] = {**(target.get(order) or {}), **change["before"]}
+    plan = SectionPlan()
+    for order, values in target.items():
+        if values is not None and order not in existing:
+            values = {"heading": values.get("heading", "New Section"), "body": values.get("body", ""), **values}
+        plan.set(existing, order, values)
+    result = _commit(page, plan, author=author, restored_version=version)
+    logger.info("Rolled page %s back to v%s as v%s", page.slug, version, result.version)
+    return result
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+
+from apps.content.models import BlogPost, Ebook, PageSection, Service
+
+from . import indexing
+from .models import ContentChunk
+
+INDEXED_MODELS = {
+    PageSection: ContentChunk.PAGE_SECTION,
+    BlogPost: ContentChunk.BLOG_POST,
+    Service: ContentChunk.SERVICE,
+    Ebook: ContentChunk.EBOOK,
+}
+
+
+def reindex_instance(sender, instance, **kwargs):  # noqa: ANN001, ANN003
+    indexing.schedule(INDEXED_MODELS[sender], [instance.pk])
+
+
+def connect() -> None:
+    for model in INDEXED_MODELS:
+        post_save.connect(reindex_instance, sender=model, dispatch_uid=f"rag-reindex-save-{model.__name__}")
+        post_delete.connect(reindex_instance, sender=model, dispatch_uid=f"rag-reindex-delete-{model.__name__}")
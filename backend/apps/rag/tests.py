@@ -0,0 +1,319 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.content.models import Page, PageSection, PageSnapshot
+from apps.content.snapshots import get_page_payload
+
+from . import ann
+from .api import RagPreviewStreamView
+from .drafts import draft_cache, draft_key
+from .embeddings import normalize
+from .index import VectorIndex
+from .providers import DraftProvider, DraftRequest
+from .services import PublishConflict, _commit, _read_page, diff_sections, gather_context, publish_draft
+
+
+def _statement(sql: str) -> str:
+    for marker in (" = CASE", " VALUES ", " WHERE "):
+        sql = sql.split(marker)[0]
+    return sql
+
+
+def _operations(queries) -> int:  # noqa: ANN001
+    """Count queries, folding consecutive batches of one bulk statement into one."""
+    heads = [_statement(query["sql"]) for query in queries]
+    return sum(1 for index, head in enumerate(heads) if index == 0 or head != heads[index - 1])
+
+
+class PublishQueryTests(TestCase):
+    """Publishing costs the same number of queries whatever the page size."""
+
+    def publish_queries(self, size: int) -> list:
+        page = Page.objects.create(slug=Page.BLOG, seo_title="Query budget")
+        PageSection.objects.bulk_create(
+            PageSection(page=page, heading=f"Section {order}", body="Original", order=order) for order in range(size)
+        )
+        # Half the sections change, a quarter are resubmitted as-is and as many again are new.
+        updates = [{"order": order, "body": "Edited"} for order in range(0, size // 2)]
+        updates += [{"order": order, "body": "Original"} for order in range(size // 2, size * 3 // 4)]
+        updates += [{"order": order, "heading": "Added", "body": "New"} for order in range(size, size + size // 4)]
+        with CaptureQueriesContext(connection) as queries:
+            result = publish_draft(Page.BLOG, updates)
+        self.assertEqual((len(result.updated), len(result.created)), (size // 2, size // 4))
+        return queries.captured_queries
+
+    def test_query_count_is_constant(self) -> None:
+        measured = {}
+        for size in (10, 100, 1000):
+            with self.subTest(size=size):
+                sid = connection.savepoint()
+                queries = self.publish_queries(size)
+                connection.savepoint_rollback(sid)
+                # SQLite caps bound parameters per statement, so Django splits bulk writes
+                # into batches there; other backends send each bulk write as one query.
+                measured[size] = _operations(queries) if connection.vendor == "sqlite" else len(queries)
+        self.assertEqual(len(set(measured.values())), 1, f"Publish cost grows with section count: {measured}")
+
+
+class PublishConflictTests(TestCase):
+    def setUp(self) -> None:
+        page = Page.objects.create(slug=Page.BLOG)
+        PageSection.objects.create(page=page, heading="Intro", body="Original", order=0)
+
+    def test_publish_after_the_page_moved_on_conflicts(self) -> None:
+        page, existing = _read_page(Page.BLOG, None)
+        publish_draft(Page.BLOG, [{"order": 0, "body": "Theirs"}])
+        with self.assertRaises(PublishConflict) as raised:
+            _commit(page, diff_sections(existing, [{"order": 0, "body": "Ours"}]))
+        self.assertEqual(raised.exception.version, 2)
+
+    def test_concurrent_publishes_conflict_on_version(self) -> None:
+        ours, theirs = _read_page(Page.BLOG, None), _read_page(Page.BLOG, None)
+        _commit(theirs[0], diff_sections(theirs[1], [{"order": 0, "body": "Theirs"}]))
+        with self.assertRaises(PublishConflict) as raised:
+            _commit(ours[0], diff_sections(ours[1], [{"order": 0, "body": "Ours"}]))
+        self.assertEqual(raised.exception.version, 2)
+        page = Page.objects.get(slug=Page.BLOG)
+        self.assertEqual((page.version, page.revisions.count()), (2, 1))
+        self.assertEqual(list(page.sections.values_list("body", flat=True)), ["Theirs"])
+
+
+class PublishApiTests(TestCase):
+    def setUp(self) -> None:
+        page = Page.objects.create(slug=Page.BLOG)
+        PageSection.objects.create(page=page, heading="Intro", body="Original", order=1)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("publisher"))
+
+    def publish(self, sections):  # noqa: ANN001, ANN201
+        return self.client.post("/api/rag/publish/", {"page_slug": Page.BLOG, "sections": sections}, format="json", secure=True)
+
+    def test_malformed_sections_are_rejected(self) -> None:
+        for sections in (
+            {"order": 1, "body": "Edited"},
+            "sections",
+            ["Edited"],
+            [{"order": "one", "body": "Edited"}],
+            [{"order": 1.5, "body": "Edited"}],
+            [{"order": -1, "body": "Edited"}],
+            [{"order": 1, "heading": "x" * 201}],
+        ):
+            with self.subTest(sections=sections):
+                self.assertEqual(self.publish(sections).status_code, 400)
+        self.assertEqual(Page.objects.get(slug=Page.BLOG).version, 1)
+
+    def test_numeric_orders_match_the_existing_section(self) -> None:
+        for version, order in ((2, "1"), (3, 1.0)):
+            with self.subTest(order=order):
+                response = self.publish([{"order": order, "body": f"Edited {version}"}])
+                self.assertEqual(response.status_code, 202)
+                self.assertEqual((response.data["version"], response.data["changes"]["updated"]), (version, [1]))
+        self.assertEqual(list(PageSection.objects.values_list("order", "body")), [(1, "Edited 3")])
+
+
+class IVFRecallTests(SimpleTestCase):
+    """The IVF index against exact search on clustered unit vectors."""
+
+    k = 10
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        centers = normalize(rng.standard_normal((16, 64)).astype(np.float32))
+
+        def draw(count: int) -> np.ndarray:
+            noise = rng.standard_normal((count, 64)).astype(np.float32) / 8
+            return normalize(centers[rng.integers(len(centers), size=count)] + noise)
+
+        self.vectors, self.queries = draw(4000), draw(50)
+        self.ids = np.arange(4000, dtype=np.int64) * 3
+        self.index = ann.IVFIndex.build(self.vectors, self.ids, seed=0)
+
+    def recall(self, index: ann.IVFIndex, exact: VectorIndex, nprobe: int) -> float:
+        found = []
+        for query in self.queries:
+            expected = {chunk_id for chunk_id, _ in exact.search(query, self.k)}
+            found.append(len(expected & {chunk_id for chunk_id, _ in index.search(query, self.k, nprobe=nprobe)}) / self.k)
+        return float(np.mean(found))
+
+    def test_recall_at_default_nprobe(self) -> None:
+        exact = VectorIndex(self.vectors, self.ids)
+        self.assertGreaterEqual(self.recall(self.index, exact, nprobe=16), 0.9)
+        self.assertEqual(self.recall(self.index, exact, nprobe=self.index.nlist), 1.0)
+
+    def test_delta_and_tombstones_match_exact_search(self) -> None:
+        removed, replaced = self.ids[:200], self.ids[200:400]
+        added = np.arange(4000, 4100, dtype=np.int64) * 3
+        fresh = normalize(np.random.default_rng(1).standard_normal((300, 64)).astype(np.float32))
+        self.index.remove(removed)
+        self.index.add(np.concatenate([replaced, added]), fresh)
+        live = ~np.isin(self.ids, np.concatenate([removed, replaced]))
+        exact = VectorIndex(np.concatenate([self.vectors[live], fresh]), np.concatenate([self.ids[live], replaced, added]))
+        with tempfile.TemporaryDirectory() as root:
+            self.index.save(Path(root), {})
+            reopened, _ = ann.IVFIndex.open(Path(root))
+            self.assertEqual(len(reopened), len(exact))
+            self.assertEqual(self.recall(reopened, exact, nprobe=reopened.nlist), 1.0)
+            self.assertEqual(self.recall(reopened.compact(), exact, nprobe=reopened.nlist), 1.0)
+
+
+@override_settings(RAG_INDEX_BACKEND="ivf")
+class IVFWriteLockTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings = override_settings(RAG_INDEX_DIR=root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.rebuild = mock.patch.object(ann, "rebuild").start()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.object(ann, "REQUEST_LOCK_WAIT", 0).start()
+
+    def test_busy_lock_leaves_changes_pending(self) -> None:
+        cache.add(ann.WRITE_LOCK_KEY, "elsewhere", 60)
+        with self.assertLogs(ann.logger, "WARNING"):
+            ann.apply_changes([1], [], in_request=True)
+        self.rebuild.assert_not_called()
+        self.assertTrue(ann.pending())
+
+    def test_request_never_rebuilds(self) -> None:
+        with self.assertLogs(ann.logger, "WARNING"):
+            ann.apply_changes([1], [], in_request=True)
+        self.rebuild.assert_not_called()
+        self.assertTrue(ann.pending())
+
+    def test_background_run_rebuilds_pending_changes(self) -> None:
+        cache.set(ann.PENDING_KEY, 1, None)
+        ann.apply_changes([], [])
+        self.rebuild.assert_called_once()
+        self.assertFalse(ann.pending())
+
+
+class DraftKeyTests(TestCase):
+    def test_key_moves_with_publishes_not_first_reads(self) -> None:
+        page = Page.objects.create(slug=Page.BLOG)
+        PageSection.objects.create(page=page, heading="Intro", body="Original", order=0)
+        PageSnapshot.objects.filter(page=page).delete()
+        key = draft_key(Page.BLOG, "prompt", "model")
+        get_page_payload(Page.BLOG)
+        self.assertEqual(draft_key(Page.BLOG, "prompt", "model"), key)
+        publish_draft(Page.BLOG, [{"order": 0, "body": "Edited"}])
+        self.assertNotEqual(draft_key(Page.BLOG, "prompt", "model"), key)
+
+
+class _SlowProvider(DraftProvider):
+    """Yields a word, then waits until the stream is abandoned."""
+
+    name = "slow"
+    model = "slow-draft"
+
+    def __init__(self) -> None:
+        self.yielded = asyncio.Event()
+        self.closed = False
+
+    async def stream(self, request: DraftRequest):  # noqa: ANN201
+        try:
+            yield "First "
+            self.yielded.set()
+            await asyncio.sleep(60)
+            yield "never"
+        finally:
+            self.closed = True
+
+
+def _events(body: bytes) -> list:
+    events = []
+    for frame in body.decode().split("\n\n")[:-1]:
+        name, data = frame.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@override_settings(RAG_FAKE_TOKEN_DELAY=0, RAG_GENERATOR="fake")
+class PreviewStreamTests(TestCase):
+    path = "/api/rag/preview/stream/"
+
+    @classmethod
+    def setUpTestData(cls):  # noqa: ANN206
+        page = Page.objects.create(slug=Page.BLOG)
+        PageSection.objects.create(page=page, heading="Intro", body="Original", order=0)
+        cls.token = Token.objects.create(user=get_user_model().objects.create_user("streamer")).key
+
+    def setUp(self) -> None:
+        draft_cache.clear()
+        self.addCleanup(draft_cache.clear)
+
+    async def stream(self, **headers: str):  # noqa: ANN201
+        response = await self.async_client.post(
+            self.path,
+            {"page_slug": Page.BLOG, "prompt": "Sharper intro"},
+            content_type="application/json",
+            secure=True,
+            headers=headers,
+        )
+        if not response.streaming:
+            return response, None
+        return response, _events(b"".join([chunk async for chunk in response.streaming_content]))
+
+    async def test_unauthenticated_caller_is_rejected(self) -> None:
+        response, events = await self.stream()
+        self.assertEqual(response.status_code, 403)
+        self.assertIsNone(events)
+        response, events = await self.stream(authorization="Token wrong")
+        self.assertEqual(response.status_code, 403)
+
+    async def test_events_are_framed_in_order(self) -> None:
+        response, events = await self.stream(authorization=f"Token {self.token}")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        names = [name for name, _ in events]
+        self.assertEqual(names[:3], ["context", "section", "section"])
+        self.assertEqual(set(names[3:-1]), {"token"})
+        self.assertEqual(names[-1], "done")
+        self.assertEqual(events[0][1]["page"], Page.BLOG)
+        self.assertFalse(events[0][1]["metadata"]["cache"]["hit"])
+        self.assertEqual(events[1][1], {"index": 0, "heading": "Intro", "body": "Original"})
+        self.assertEqual("".join(data["text"] for name, data in events if name == "token"), "Sharper intro")
+        self.assertEqual(events[-1][1]["tokens"], len(names) - 4)
+
+    async def test_second_request_replays_the_cached_draft(self) -> None:
+        _, first = await self.stream(authorization=f"Token {self.token}")
+        _, replay = await self.stream(authorization=f"Token {self.token}")
+        self.assertTrue(replay[0][1]["metadata"]["cache"]["hit"])
+        self.assertEqual([name for name, _ in replay], ["context", "section", "section", "done"])
+        self.assertEqual(replay[2][1], {"index": 1, "heading": "AI Draft", "body": "Sharper intro"})
+        self.assertTrue(replay[-1][1]["cached"])
+        self.assertEqual(replay[-1][1]["tokens"], first[-1][1]["tokens"])
+
+    async def test_disconnect_closes_the_provider_stream(self) -> None:
+        provider = _SlowProvider()
+        draft = await sync_to_async(gather_context)(Page.BLOG, "")
+        events = RagPreviewStreamView()._events(draft, "", provider, "disconnect-key")
+        received = []
+
+        async def consume() -> None:
+            async for event in events:
+                received.append(event)
+
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(provider.yielded.wait(), timeout=5)
+        # What Django does to the response task when the client goes away.
+        task.cancel()
+        with self.assertLogs("apps.rag.api", "INFO"), self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(provider.closed)
+        self.assertTrue(received[-1].startswith("event: token"))
+        self.assertIsNone(draft_cache.get("disconnect-key"))
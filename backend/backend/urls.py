@@ -3,9 +3,15 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from apps.content.api import BlogPostViewSet, EbookViewSet, PageViewSet, ServiceViewSet
-from apps.core.api import HealthView
+from apps.core.api import HealthView, MetricsView, ZohoHealthView
 from apps.core.views import ContactFormView, EbookFormView
-from apps.rag.api import RagPreviewView, RagPublishView
+from apps.rag.api import (
+    RagPreviewStreamView,
+    RagPreviewView,
+    RagPublishView,
+    RagRevisionsView,
+    RagRollbackView,
+)
 
 router = DefaultRouter()
 router.register("pages", PageViewSet, basename="page")
@@ -17,8 +23,13 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(router.urls)),
     path("api/health/", HealthView.as_view(), name="health"),
+    path("api/health/zoho/", ZohoHealthView.as_view(), name="zoho-health"),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
     path("api/forms/contact/", ContactFormView.as_view(), name="contact-form"),
     path("api/forms/ebook/", EbookFormView.as_view(), name="ebook-form"),
     path("api/rag/preview/", RagPreviewView.as_view(), name="rag-preview"),
+    path("api/rag/preview/stream/", RagPreviewStreamView.as_view(), name="rag-preview-stream"),
     path("api/rag/publish/", RagPublishView.as_view(), name="rag-publish"),
+    path("api/rag/revisions/", RagRevisionsView.as_view(), name="rag-revisions"),
+    path("api/rag/rollback/", RagRollbackView.as_view(), name="rag-rollback"),
 ]
@@ -0,0 +1,19 @@
+"""Gunicorn settings for the container; gunicorn loads this file from the working directory.
+
+Uvicorn workers serve ``backend.asgi`` so async views wait on Zoho and draft
+providers without holding a worker, while sync views run on per-request threads.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+# One event loop per core is enough; concurrency comes from the loop, not from workers.
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count(), 4))))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Longer than typical load balancer idle timeouts so they close idle connections first.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
@@ -1,4 +1,5 @@
 import { Metadata } from 'next';
+import Link from 'next/link';
 
 import { BlogList } from '../components/blog-list';
 import { getBlogPosts } from '@/lib/cms';
@@ -8,8 +9,13 @@ export const metadata: Metadata = {
   description: 'Stay ahead with go-to-market strategies and RAG-enabled marketing workflows.'
 };
 
-export default async function BlogPage() {
-  const posts = await getBlogPosts();
+type Props = {
+  searchParams: { cursor?: string | string[] };
+};
+
+export default async function BlogPage({ searchParams }: Props) {
+  const cursor = typeof searchParams.cursor === 'string' ? searchParams.cursor : undefined;
+  const { posts, nextCursor } = await getBlogPosts(cursor);
   return (
     <main className="bg-white pb-20">
       <section className="mx-auto max-w-6xl px-6 py-20">
@@ -20,6 +26,12 @@ export default async function BlogPage() {
         <div className="mt-12">
           <BlogList posts={posts} />
         </div>
+        {(cursor || nextCursor) && (
+          <nav className="mt-12 flex justify-between text-sm font-semibold text-primary-600" aria-label="Blog pagination">
+            {cursor ? <Link href="/blog">← Latest posts</Link> : <span />}
+            {nextCursor && <Link href={`/blog?cursor=${encodeURIComponent(nextCursor)}`}>Older posts →</Link>}
+          </nav>
+        )}
       </section>
     </main>
   );
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 
 type DraftSection = {
   heading: string;
@@ -14,31 +14,100 @@ type DraftResponse = {
   metadata: Record<string, unknown>;
 };
 
+type StreamEvent = { event: string; data: Record<string, unknown> };
+
+function parseEvents(buffer: string): { events: StreamEvent[]; rest: string } {
+  const blocks = buffer.split('\n\n');
+  const rest = blocks.pop() ?? '';
+  const events = blocks.flatMap((block) => {
+    let event = 'message';
+    let data = '';
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event: ')) event = line.slice(7);
+      else if (line.startsWith('data: ')) data += line.slice(6);
+    }
+    return data ? [{ event, data: JSON.parse(data) as Record<string, unknown> }] : [];
+  });
+  return { events, rest };
+}
+
 export function RagPublisher() {
   const [pageSlug, setPageSlug] = useState('home');
   const [prompt, setPrompt] = useState('');
   const [draft, setDraft] = useState<DraftResponse | null>(null);
-  const [status, setStatus] = useState<'idle' | 'loading' | 'error' | 'ready'>('idle');
+  const [status, setStatus] = useState<'idle' | 'loading' | 'streaming' | 'error' | 'ready'>('idle');
   const [message, setMessage] = useState('');
+  const abortRef = useRef<AbortController | null>(null);
+
+  useEffect(() => () => abortRef.current?.abort(), []);
+
+  function applyEvent({ event, data }: StreamEvent) {
+    setDraft((current) => {
+      if (event === 'context') {
+        return { page: String(data.page), sections: [], metadata: (data.metadata as Record<string, unknown>) ?? {} };
+      }
+      if (!current) return current;
+      if (event === 'section') {
+        const sections = [...current.sections];
+        sections[Number(data.index)] = { heading: String(data.heading), body: String(data.body ?? '') };
+        return { ...current, sections };
+      }
+      if (event === 'token') {
+        const index = Number(data.index);
+        const sections = [...current.sections];
+        sections[index] = { ...sections[index], body: sections[index].body + String(data.text) };
+        return { ...current, sections };
+      }
+      if (event === 'done') {
+        return { ...current, metadata: { ...current.metadata, generation: data } };
+      }
+      return current;
+    });
+    if (event === 'error') {
+      throw new Error(String(data.error ?? 'Draft generation failed'));
+    }
+  }
 
   async function createDraft() {
-    setStatus('loading');
+    if (status === 'streaming') {
+      abortRef.current?.abort();
+      return;
+    }
+    const controller = new AbortController();
+    abortRef.current = controller;
+    setStatus('streaming');
     setMessage('');
+    setDraft(null);
     try {
-      const response = await fetch('/api/rag/preview/', {
+      const response = await fetch('/api/rag/preview/stream/', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ page_slug: pageSlug, prompt })
+        body: JSON.stringify({ page_slug: pageSlug, prompt }),
+        signal: controller.signal
       });
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Failed to generate draft');
       }
-      const data = (await response.json()) as DraftResponse;
-      setDraft(data);
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        const parsed = parseEvents(buffer + value);
+        buffer = parsed.rest;
+        parsed.events.forEach(applyEvent);
+      }
       setStatus('ready');
     } catch (error) {
+      if (controller.signal.aborted) {
+        setStatus('ready');
+        setMessage('Generation stopped.');
+        return;
+      }
       setStatus('error');
       setMessage(error instanceof Error ? error.message : 'Unexpected error');
+    } finally {
+      abortRef.current = null;
     }
   }
 
@@ -50,13 +119,22 @@ export function RagPublisher() {
       const response = await fetch('/api/rag/publish/', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ page_slug: draft.page, sections: draft.sections })
+        body: JSON.stringify({ page_slug: draft.page, sections: draft.sections, version: draft.metadata.version })
       });
+      if (response.status === 409) {
+        throw new Error('This page was published since the draft was generated. Generate a new draft and try again.');
+      }
       if (!response.ok) {
         throw new Error('Failed to publish draft');
       }
+      const result = (await response.json()) as { changes?: { created: number[]; updated: number[] } };
+      const changed = result.changes ? result.changes.created.length + result.changes.updated.length : null;
       setStatus('idle');
-      setMessage('Changes queued for publish. Trigger on-demand revalidation to update the site.');
+      setMessage(
+        changed === 0
+          ? 'No sections changed; nothing to publish.'
+          : 'Changes published. The live page revalidates within a few seconds.'
+      );
     } catch (error) {
       setStatus('error');
       setMessage(error instanceof Error ? error.message : 'Unexpected error');
@@ -95,7 +173,7 @@ export function RagPublisher() {
               className="rounded-full bg-primary-600 px-5 py-2 text-sm font-semibold text-white shadow-sm hover:bg-primary-500"
               disabled={status === 'loading'}
             >
-              Generate draft
+              {status === 'streaming' ? 'Stop' : 'Generate draft'}
             </button>
             <button
               type="button"
@@ -0,0 +1,71 @@
+import { NextResponse } from 'next/server';
+
+import { getBackendBaseUrl, isMockMode } from '@/lib/runtime-config';
+
+export const dynamic = 'force-dynamic';
+
+const STREAM_HEADERS = {
+  'Content-Type': 'text/event-stream',
+  'Cache-Control': 'no-cache, no-transform',
+  Connection: 'keep-alive'
+};
+
+function encodeEvent(event: string, data: unknown): Uint8Array {
+  return new TextEncoder().encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+}
+
+function mockStream(pageSlug: string, prompt: string, signal: AbortSignal): ReadableStream<Uint8Array> {
+  const tokens = (prompt || 'Mocked RAG suggestion').match(/\S+\s*/g) ?? [];
+  return new ReadableStream({
+    async start(controller) {
+      controller.enqueue(
+        encodeEvent('context', { page: pageSlug, metadata: { provider: 'mock', model: 'mock-rag', mock: true, sources: [] } })
+      );
+      controller.enqueue(encodeEvent('section', { index: 0, heading: 'Existing content', body: `Mocked section for ${pageSlug}` }));
+      controller.enqueue(encodeEvent('section', { index: 1, heading: 'AI Draft', body: '' }));
+      for (const token of tokens) {
+        if (signal.aborted) return;
+        await new Promise((resolve) => setTimeout(resolve, 50));
+        controller.enqueue(encodeEvent('token', { index: 1, text: token }));
+      }
+      controller.enqueue(encodeEvent('done', { generator: 'mock', tokens: tokens.length }));
+      controller.close();
+    }
+  });
+}
+
+export async function POST(request: Request) {
+  const body = (await request.json().catch(() => ({}))) as Record<string, unknown>;
+
+  if (isMockMode()) {
+    const pageSlug = typeof body.page_slug === 'string' ? body.page_slug : 'home';
+    const prompt = typeof body.prompt === 'string' ? body.prompt : '';
+    return new Response(mockStream(pageSlug, prompt, request.signal), { headers: STREAM_HEADERS });
+  }
+
+  const backendUrl = getBackendBaseUrl();
+  if (!backendUrl) {
+    return NextResponse.json({ error: 'Backend URL not configured' }, { status: 500 });
+  }
+
+  const headers: Record<string, string> = { 'Content-Type': 'application/json', Accept: 'text/event-stream' };
+  const authorization = request.headers.get('authorization');
+  if (authorization) {
+    headers.Authorization = authorization;
+  }
+
+  // Passing the request's signal aborts the upstream stream when the editor navigates away.
+  const response = await fetch(`${backendUrl}/api/rag/preview/stream/`, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify(body),
+    cache: 'no-store',
+    signal: request.signal
+  });
+
+  if (!response.ok || !response.body) {
+    return NextResponse.json({ error: 'Draft failed' }, { status: response.status || 502 });
+  }
+
+  return new Response(response.body, { headers: STREAM_HEADERS });
+}
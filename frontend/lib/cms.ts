@@ -36,15 +36,41 @@ type BlogPost = {
   published_at: string;
 };
 
+type BlogPostSummary = Omit<BlogPost, 'content'>;
+
+type Paginated<T> = {
+  next: string | null;
+  results: T[];
+};
+
 type HomePayload = {
   page: MarketingPage;
   services: Service[];
   ebooks: Ebook[];
-  posts: BlogPost[];
+  posts: BlogPostSummary[];
 };
 
 type FetchOptions = RequestInit & { next?: { revalidate?: number } };
 
+const FALLBACK_POSTS: BlogPost[] = [
+  {
+    title: 'How we ship ISR landing pages in under an hour',
+    slug: 'ship-isr-landing-pages',
+    excerpt: 'A repeatable workflow for drafting content with RAG, reviewing in Django admin, and pushing live via Vercel revalidation.',
+    content:
+      '<p>By combining Retrieval Augmented Generation with editor workflows we reduced launch time for new experiments by 78%.</p>',
+    published_at: '2024-03-18T09:00:00+00:00'
+  },
+  {
+    title: 'Connecting Zoho CRM EU to a modern data stack',
+    slug: 'zoho-crm-eu-modern-data-stack',
+    excerpt: 'Map consents, UTMs, and lifecycle events from your marketing site directly into Zoho CRM EU securely.',
+    content:
+      '<p>We cover OAuth setup, refresh token hygiene, and how to pass granular consent flags for compliant marketing automation.</p>',
+    published_at: '2024-02-05T09:00:00+00:00'
+  }
+];
+
 export const FALLBACK_HOME: HomePayload = {
   page: {
     hero: {
@@ -96,29 +122,12 @@ export const FALLBACK_HOME: HomePayload = {
       file: 'https://example.com/ebooks/eu-revops-compliance.pdf'
     }
   ],
-  posts: [
-    {
-      title: 'How we ship ISR landing pages in under an hour',
-      slug: 'ship-isr-landing-pages',
-      excerpt: 'A repeatable workflow for drafting content with RAG, reviewing in Django admin, and pushing live via Vercel revalidation.',
-      content:
-        '<p>By combining Retrieval Augmented Generation with editor workflows we reduced launch time for new experiments by 78%.</p>',
-      published_at: '2024-03-18T09:00:00+00:00'
-    },
-    {
-      title: 'Connecting Zoho CRM EU to a modern data stack',
-      slug: 'zoho-crm-eu-modern-data-stack',
-      excerpt: 'Map consents, UTMs, and lifecycle events from your marketing site directly into Zoho CRM EU securely.',
-      content:
-        '<p>We cover OAuth setup, refresh token hygiene, and how to pass granular consent flags for compliant marketing automation.</p>',
-      published_at: '2024-02-05T09:00:00+00:00'
-    }
-  ]
+  posts: FALLBACK_POSTS
 };
 
 const FALLBACK_SERVICE_MAP = new Map(FALLBACK_HOME.services.map((service) => [service.slug, service]));
 const FALLBACK_EBOOK_MAP = new Map(FALLBACK_HOME.ebooks.map((ebook) => [ebook.slug, ebook]));
-const FALLBACK_POST_MAP = new Map(FALLBACK_HOME.posts.map((post) => [post.slug, post]));
+const FALLBACK_POST_MAP = new Map(FALLBACK_POSTS.map((post) => [post.slug, post]));
 
 async function fetchFromBackend<T>(path: string, options?: FetchOptions): Promise<T | null> {
   const baseUrl = getBackendBaseUrl();
@@ -142,14 +151,14 @@ export async function getHomeContent(): Promise<HomePayload> {
     fetchFromBackend<MarketingPage>('/api/pages/home/', { next: { revalidate: 300 } }),
     fetchFromBackend<Service[]>('/api/services/', { next: { revalidate: 300 } }),
     fetchFromBackend<Ebook[]>('/api/ebooks/', { next: { revalidate: 300 } }),
-    fetchFromBackend<BlogPost[]>('/api/blog-posts/', { next: { revalidate: 300 } })
+    fetchFromBackend<Paginated<BlogPostSummary>>('/api/blog-posts/?page_size=3', { next: { revalidate: 300 } })
   ]);
 
   return {
     page: page ?? FALLBACK_HOME.page,
     services: services && services.length > 0 ? services : FALLBACK_HOME.services,
     ebooks: ebooks && ebooks.length > 0 ? ebooks : FALLBACK_HOME.ebooks,
-    posts: posts && posts.length > 0 ? posts : FALLBACK_HOME.posts
+    posts: posts && posts.results.length > 0 ? posts.results : FALLBACK_HOME.posts
   };
 }
 
@@ -179,9 +188,30 @@ export async function getEbookDetail(slug: string): Promise<Ebook | null> {
   return FALLBACK_EBOOK_MAP.get(slug) ?? null;
 }
 
-export async function getBlogPosts(): Promise<BlogPost[]> {
-  const posts = await fetchFromBackend<BlogPost[]>('/api/blog-posts/', { next: { revalidate: 300 } });
-  return posts && posts.length > 0 ? posts : FALLBACK_HOME.posts;
+export type BlogPostsPage = {
+  posts: BlogPostSummary[];
+  nextCursor: string | null;
+};
+
+function cursorFromLink(link: string | null): string | null {
+  if (!link) {
+    return null;
+  }
+  try {
+    return new URL(link).searchParams.get('cursor');
+  } catch {
+    return null;
+  }
+}
+
+export async function getBlogPosts(cursor?: string): Promise<BlogPostsPage> {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const page = await fetchFromBackend<Paginated<BlogPostSummary>>(`/api/blog-posts/${query}`, { next: { revalidate: 300 } });
+  if (page && (page.results.length > 0 || cursor)) {
+    return { posts: page.results, nextCursor: cursorFromLink(page.next) };
+  }
+  // Fallback content only stands in for the first page.
+  return { posts: cursor ? [] : FALLBACK_HOME.posts, nextCursor: null };
 }
 
 export async function getBlogPost(slug: string): Promise<BlogPost | null> {